@@ -483,10 +483,10 @@ Restituisci SOLO il JSON.
             from pathlib import Path
 
             # Add database module to path
-            sys.path.insert(0, str(Path(__file__).parent.parent.parent / "database" / "python"))
+            sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-            from database import get_db_context
-            from models import AgentConversation, AgentTask
+            from database.python.database import get_db_context
+            from database.python.models import AgentConversation, AgentTask
             import uuid
 
             with get_db_context() as db:
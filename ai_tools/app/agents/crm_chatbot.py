@@ -14,7 +14,13 @@ from app.config import settings
 from app.utils import retry_with_exponential_backoff
 from app.database import SessionLocal
 from app.models import Property, Contact, Request, Match, Activity
-from app.services import PropertyScorer
+from app.services import (
+    PropertyScorer,
+    load_property_vectors,
+    property_load_options,
+    get_portfolio_snapshot,
+    count_active_requests,
+)
 
 # Import existing tools
 from app.tools import (
@@ -132,11 +138,12 @@ def calculate_property_scores_tool(request_id: str, min_score: int = 60, limit:
         if not request:
             return json.dumps({"success": False, "error": f"Request {request_id} not found"})
 
-        # Get available properties with same contract type
-        properties = db.query(Property).filter(
+        # Get available properties with same contract type (scoring fields only)
+        properties = load_property_vectors(
+            db,
             Property.status == "available",
             Property.contractType == request.contractType
-        ).all()
+        )
 
         if not properties:
             return json.dumps({
@@ -150,16 +157,25 @@ def calculate_property_scores_tool(request_id: str, min_score: int = 60, limit:
         matches = scorer.get_sorted_matches(
             request=request,
             properties=properties,
-            min_score=min_score
+            min_score=min_score,
+            limit=limit
         )
 
-        # Limit results
-        matches = matches[:limit]
+        # Load full rows only for the returned matches
+        top_ids = [match["property"].id for match in matches]
+        properties_by_id = {
+            prop.id: prop
+            for prop in db.query(Property).options(*property_load_options("scoring")).filter(
+                Property.id.in_(top_ids)
+            ).all()
+        } if top_ids else {}
 
         # Format for AI consumption
         formatted_matches = []
         for match in matches:
-            prop = match["property"]
+            prop = properties_by_id.get(match["property"].id)
+            if prop is None:
+                continue
             score_data = match["score_data"]
 
             formatted_matches.append({
@@ -198,51 +214,33 @@ def analyze_portfolio_tool(status: str = "available", limit: int = 50) -> str:
 
     Args:
         status: Property status to filter (available, sold, rented, etc.)
-        limit: Maximum properties to analyze
+        limit: Kept for compatibility; statistics cover every property with the status
 
     Returns:
         JSON with portfolio statistics and insights
     """
     db = SessionLocal()
     try:
-        properties = db.query(Property).filter(Property.status == status).limit(limit).all()
+        snapshot = get_portfolio_snapshot(db)
+        groups = snapshot.select(status=status)
+        summary = snapshot.summarize(groups)
 
-        if not properties:
+        if not summary["count"]:
             return json.dumps({"success": True, "message": f"No properties with status '{status}'"})
 
-        # Calculate statistics
-        total = len(properties)
-        by_city = {}
-        by_type = {}
-        price_sum = 0
-        price_count = 0
-
-        for prop in properties:
-            # By city
-            city = prop.city
-            by_city[city] = by_city.get(city, 0) + 1
-
-            # By type
-            ptype = prop.propertyType
-            by_type[ptype] = by_type.get(ptype, 0) + 1
-
-            # Avg price
-            price = prop.priceSale if prop.contractType == "sale" else prop.priceRentMonthly
-            if price:
-                price_sum += price
-                price_count += 1
-
-        avg_price = price_sum / price_count if price_count > 0 else 0
+        total = summary["count"]
+        avg_price = summary["avg_price"]
 
         # Top cities
-        top_cities = sorted(by_city.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_types = sorted(by_type.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_cities = snapshot.counts_by(groups, "city")
+        top_types = snapshot.counts_by(groups, "propertyType")
 
         return json.dumps({
             "success": True,
             "total_properties": total,
             "status": status,
             "average_price": round(avg_price, 2),
+            "price_percentiles": summary["percentiles"],
             "by_city": dict(top_cities),
             "by_type": dict(top_types),
             "insights": [
@@ -346,51 +344,44 @@ def get_market_insights_tool(city: str, property_type: str = None) -> str:
     """
     db = SessionLocal()
     try:
-        # Get properties in city
-        query = db.query(Property).filter(
-            Property.city.ilike(f"%{city}%"),
-            Property.status == "available"
-        )
-
-        if property_type:
-            query = query.filter(Property.propertyType == property_type)
+        # Available properties in city
+        snapshot = get_portfolio_snapshot(db)
+        groups = snapshot.select(status="available", city=city, property_type=property_type)
+        total = snapshot.summarize(groups)["count"]
 
-        properties = query.all()
-
-        if not properties:
+        if not total:
             return json.dumps({
                 "success": True,
                 "message": f"No properties found in {city}" + (f" for type {property_type}" if property_type else "")
             })
 
         # Calculate market stats
-        prices_sale = [p.priceSale for p in properties if p.contractType == "sale" and p.priceSale]
-        prices_rent = [p.priceRentMonthly for p in properties if p.contractType == "rent" and p.priceRentMonthly]
+        sale = snapshot.summarize([g for g in groups if g["contractType"] == "sale"])
+        rent = snapshot.summarize([g for g in groups if g["contractType"] == "rent"])
 
-        avg_price_sale = sum(prices_sale) / len(prices_sale) if prices_sale else 0
-        avg_price_rent = sum(prices_rent) / len(prices_rent) if prices_rent else 0
+        avg_price_sale = sale["avg_price"]
+        avg_price_rent = rent["avg_price"]
 
         # Get demand (requests for this city)
-        requests = db.query(Request).filter(
-            Request.status == "active",
-            Request.searchCities.like(f'%{city}%')
-        ).count()
+        requests = count_active_requests(db, city)
 
-        supply_demand_ratio = len(properties) / requests if requests > 0 else 0
+        supply_demand_ratio = total / requests if requests > 0 else 0
 
         return json.dumps({
             "success": True,
             "city": city,
             "property_type": property_type,
-            "total_properties": len(properties),
-            "properties_for_sale": len(prices_sale),
-            "properties_for_rent": len(prices_rent),
+            "total_properties": total,
+            "properties_for_sale": sale["priced"],
+            "properties_for_rent": rent["priced"],
             "avg_price_sale": round(avg_price_sale, 2),
             "avg_price_rent": round(avg_price_rent, 2),
+            "price_percentiles_sale": sale["percentiles"],
+            "price_percentiles_rent": rent["percentiles"],
             "active_requests": requests,
             "supply_demand_ratio": round(supply_demand_ratio, 2),
             "insights": [
-                f"{len(properties)} immobili disponibili a {city}",
+                f"{total} immobili disponibili a {city}",
                 f"Prezzo medio vendita: €{int(avg_price_sale):,}" if avg_price_sale > 0 else "Nessun immobile in vendita",
                 f"Prezzo medio affitto: €{int(avg_price_rent):,}/mese" if avg_price_rent > 0 else "Nessun immobile in affitto",
                 f"Domanda attiva: {requests} richieste",
@@ -13,13 +13,21 @@ from typing import Generator
 from sqlalchemy.orm import Session
 from app.config import settings
 
-# Add database/python to path for importing shared models
+# Add the project root to path (database/python is the database.python package)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "database" / "python"))
+sys.path.insert(0, str(project_root))
 
 # Import shared database components from database/python
-from database import engine as shared_engine, SessionLocal as SharedSessionLocal, get_db as shared_get_db
-from models import Base  # Import Base from shared models
+from database.python.database import engine as shared_engine, SessionLocal as SharedSessionLocal, get_db as shared_get_db
+from database.python.database import get_pool_metrics as shared_get_pool_metrics
+from database.python.database import (
+    AsyncSessionLocal,
+    dispose_async_engine,
+    get_async_db,
+    get_async_db_context,
+    get_async_engine,
+)
+from database.python.models import Base  # Import Base from shared models
 
 # Use shared engine and session factory to ensure consistency
 engine = shared_engine
@@ -42,6 +50,11 @@ def get_db() -> Generator[Session, None, None]:
     yield from shared_get_db()
 
 
+def get_pool_metrics() -> dict:
+    """Connection pool state and counters of the shared engine"""
+    return shared_get_pool_metrics(engine)
+
+
 # Database initialization (if needed)
 def init_db():
     """
@@ -50,7 +63,7 @@ def init_db():
     This function now imports shared models to ensure consistency.
     """
     # Import all shared models to ensure they're registered with Base
-    import models  # This imports from database/python/models.py
+    import database.python.models  # noqa: F401 (registers the models with Base)
 
     # Optionally verify connection
     try:
@@ -62,4 +75,16 @@ def init_db():
 
 
 # Export for compatibility
-__all__ = ["engine", "SessionLocal", "Base", "get_db", "init_db"]
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "Base",
+    "get_db",
+    "AsyncSessionLocal",
+    "get_async_engine",
+    "get_async_db",
+    "get_async_db_context",
+    "dispose_async_engine",
+    "get_pool_metrics",
+    "init_db",
+]
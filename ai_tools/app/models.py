@@ -15,22 +15,22 @@ This file exists only for backwards compatibility with existing imports like:
 import sys
 from pathlib import Path
 
-# Add database/python to path
+# Add the project root to path (database/python is the database.python package)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "database" / "python"))
+sys.path.insert(0, str(project_root))
 
 # Import all models from shared location
-from models import (
+from database.python.models import (
     # Core models used by AI tools
     Contact,
     Property,
     Building,
     Request,
+    RequestCity,
     Match,
     Activity,
 
     # Additional models for completeness
-    User,
     UserProfile,
     Tag,
     EntityTag,
@@ -55,11 +55,11 @@ __all__ = [
     "Property",
     "Building",
     "Request",
+    "RequestCity",
     "Match",
     "Activity",
 
     # Additional models
-    "User",
     "UserProfile",
     "Tag",
     "EntityTag",
@@ -45,9 +45,11 @@ class ChatResponse(BaseModel):
 class ConversationHistoryResponse(BaseModel):
     """Response model for conversation history"""
     conversations: List[Dict[str, Any]]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
 
 
 # Initialize orchestrator (singleton)
@@ -238,45 +240,50 @@ async def _process_with_updates(
 async def get_conversation_history(
     page: int = 1,
     page_size: int = 20,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    total: Optional[str] = None
 ):
     """
     Get conversation history
 
     Args:
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, ignored with a cursor)
         page_size: Number of conversations per page
         status: Filter by status (pending, running, completed, failed)
+        cursor: next_cursor of the previous page (keyset pagination)
+        total: exact, cached, approximate or none (default: exact with page, cached with cursor)
 
     Returns:
         List of conversations with pagination
     """
 
     try:
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../database/python'))
-        from database import get_db_context
-        from models import AgentConversation
-        from sqlalchemy import desc
+        from sqlalchemy import select
 
-        with get_db_context() as db:
-            query = db.query(AgentConversation)
+        from app.database import get_async_db_context
+        from app.models import AgentConversation
+        from app.utils.pagination import paginate
+
+        async with get_async_db_context() as db:
+            query = select(AgentConversation)
 
             # Filter by status
             if status:
-                query = query.filter(AgentConversation.status == status)
-
-            # Count total
-            total = query.count()
+                query = query.where(AgentConversation.status == status)
 
-            # Paginate
-            offset = (page - 1) * page_size
-            conversations = query.order_by(
-                desc(AgentConversation.createdAt)
-            ).offset(offset).limit(page_size).all()
+            # Paginate, newest first
+            result = await paginate(
+                db, query, AgentConversation, page_size,
+                page=page,
+                cursor=cursor,
+                total=total,
+                cache_key=("conversations", status)
+            )
 
             # Convert to dicts
             conversations_list = []
-            for conv in conversations:
+            for conv in result.rows:
                 conversations_list.append({
                     'id': conv.id,
                     'user_prompt': conv.userPrompt,
@@ -290,11 +297,15 @@ async def get_conversation_history(
 
             return ConversationHistoryResponse(
                 conversations=conversations_list,
-                total=total,
+                total=result.total,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                next_cursor=result.next_cursor,
+                total_exact=result.total_exact
             )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching conversation history: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,18 +4,65 @@ Endpoints for property-request match scoring
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Tuple
 import logging
 
-from app.services import PropertyScorer, ScoringWeights
-from app.database import SessionLocal
+from app.services import (
+    BatchPropertyScorer,
+    CandidateIndex,
+    PropertyColumns,
+    PropertyGeoIndex,
+    ReverseMatcher,
+    ScoringWeights,
+    property_load_options,
+)
+from app.database import SessionLocal, AsyncSessionLocal
 from app.models import Property, Request
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Candidate index per contract type, with the (count, max updatedAt) it was built at
+_candidate_indexes: Dict[Optional[str], Tuple[Tuple, CandidateIndex]] = {}
+
+# Coordinates of available properties, refreshed incrementally on each /nearby call
+_geo_index = PropertyGeoIndex()
+
+
+async def _get_candidate_index(db: AsyncSession, contract_type: Optional[str]) -> CandidateIndex:
+    """
+    Return the candidate index of available properties for a contract type
+
+    The index is rebuilt only when the count or the latest updatedAt of
+    those properties changes; the build runs in the threadpool, off the
+    event loop.
+    """
+    filters = (
+        Property.status == "available",
+        Property.contractType == contract_type,
+    )
+    result = await db.execute(
+        select(func.count(), func.max(Property.updatedAt)).where(*filters)
+    )
+    signature = tuple(result.one())
+
+    cached = _candidate_indexes.get(contract_type)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    # Load only the scoring columns
+    result = await db.execute(select(*PropertyColumns.query_columns()).where(*filters))
+    rows = result.all()
+    index = await run_in_threadpool(lambda: CandidateIndex(PropertyColumns(rows)))
+    _candidate_indexes[contract_type] = (signature, index)
+
+    return index
+
 
 class ScoringRequest(BaseModel):
     """Request for calculating matches"""
@@ -51,6 +98,54 @@ class ScoringResponse(BaseModel):
     scoring_info: Dict[str, Any]
 
 
+class ReverseScoringRequest(BaseModel):
+    """Request for finding the requests a property matches"""
+    property_id: str = Field(..., description="Property ID to find matching requests for")
+    min_score: float = Field(default=60, ge=0, le=100, description="Minimum score threshold (0-100)")
+    limit: int = Field(default=10, ge=1, le=50, description="Maximum number of requests to return")
+    weights: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Optional custom weights for scoring components"
+    )
+
+
+class RequestScore(BaseModel):
+    """Request with score data"""
+    request_id: str
+    request_code: str
+    contact_id: str
+    urgency: Optional[str]
+    total_score: float
+    components: Dict[str, float]
+    match_reasons: List[str]
+    mismatch_reasons: List[str]
+
+
+class ReverseScoringResponse(BaseModel):
+    """Response with requests matched by a property"""
+    success: bool
+    property_id: str
+    matches_count: int
+    matches: List[RequestScore]
+    scoring_info: Dict[str, Any]
+
+
+class NearbyProperty(BaseModel):
+    """Property within the search radius"""
+    property_id: str
+    distance_km: float
+
+
+class NearbyResponse(BaseModel):
+    """Response with properties around a point"""
+    success: bool
+    latitude: float
+    longitude: float
+    radius_km: float
+    properties_count: int
+    properties: List[NearbyProperty]
+
+
 @router.post("/calculate", response_model=ScoringResponse)
 async def calculate_matches(request: ScoringRequest):
     """
@@ -67,24 +162,20 @@ async def calculate_matches(request: ScoringRequest):
     }
     ```
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
 
     try:
         # Get request from database
-        db_request = db.query(Request).filter(Request.id == request.request_id).first()
+        db_request = await db.get(Request, request.request_id)
 
         if not db_request:
             raise HTTPException(status_code=404, detail=f"Request {request.request_id} not found")
 
-        # Get all available properties with same contract type
-        properties_query = db.query(Property).filter(
-            Property.status == "available",
-            Property.contractType == db_request.contractType
-        )
+        # Index of available properties with same contract type
+        index = await _get_candidate_index(db, db_request.contractType)
+        columns = index.columns
 
-        properties = properties_query.all()
-
-        if not properties:
+        if not columns:
             return ScoringResponse(
                 success=True,
                 request_id=request.request_id,
@@ -99,7 +190,7 @@ async def calculate_matches(request: ScoringRequest):
         # Initialize scorer with custom weights if provided
         if request.weights:
             try:
-                scorer = PropertyScorer(
+                scorer = BatchPropertyScorer(
                     weights=ScoringWeights(**request.weights)
                 )
             except Exception as e:
@@ -108,17 +199,33 @@ async def calculate_matches(request: ScoringRequest):
                     detail=f"Invalid weights configuration: {str(e)}"
                 )
         else:
-            scorer = PropertyScorer()
-
-        # Calculate scores
-        matches = scorer.get_sorted_matches(
-            request=db_request,
-            properties=properties,
-            min_score=request.min_score
+            scorer = BatchPropertyScorer()
+
+        # Score the candidates that can reach min_score, keep the top matches
+        ranked, candidates_scored = index.rank(
+            scorer,
+            db_request,
+            min_score=request.min_score,
+            limit=request.limit
         )
 
-        # Limit results
-        matches = matches[:request.limit]
+        # Load full rows and build reasons only for the returned matches
+        top_ids = [columns.ids[index] for index, _ in ranked]
+        properties_by_id = {
+            prop.id: prop
+            for prop in (await db.scalars(
+                select(Property).options(*property_load_options("scoring")).where(Property.id.in_(top_ids))
+            )).all()
+        } if top_ids else {}
+
+        matches = [
+            {
+                "property": properties_by_id[property_id],
+                "score_data": scorer.calculate_match_score(properties_by_id[property_id], db_request)
+            }
+            for property_id in top_ids
+            if property_id in properties_by_id
+        ]
 
         # Format response
         formatted_matches = []
@@ -159,7 +266,8 @@ async def calculate_matches(request: ScoringRequest):
             matches_count=len(formatted_matches),
             matches=formatted_matches,
             scoring_info={
-                "total_properties_evaluated": len(properties),
+                "total_properties_evaluated": len(columns),
+                "candidates_scored": candidates_scored,
                 "matches_above_threshold": len(matches),
                 "min_score_threshold": request.min_score,
                 "weights_used": scorer.weights.__dict__
@@ -172,7 +280,7 @@ async def calculate_matches(request: ScoringRequest):
         logger.error(f"Error calculating matches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        db.close()
+        await db.close()
 
 
 @router.get("/calculate", response_model=ScoringResponse)
@@ -195,6 +303,191 @@ async def calculate_matches_get(
     )
 
 
+@router.post("/reverse", response_model=ReverseScoringResponse)
+async def calculate_reverse_matches(request: ReverseScoringRequest):
+    """
+    Find the active requests a property matches best
+
+    Requests are pre-filtered by status, contract type, city and price band,
+    then scored with the same algorithm as /calculate.
+
+    **Example:**
+    ```json
+    {
+      "property_id": "prop_123",
+      "min_score": 70,
+      "limit": 10
+    }
+    ```
+    """
+    return await run_in_threadpool(_reverse_matches, request)
+
+
+def _reverse_matches(request: ReverseScoringRequest) -> ReverseScoringResponse:
+    """Body of /reverse: blocking session work, run in the threadpool"""
+    db = SessionLocal()
+
+    try:
+        db_property = db.query(Property).filter(Property.id == request.property_id).first()
+
+        if not db_property:
+            raise HTTPException(status_code=404, detail=f"Property {request.property_id} not found")
+
+        # Initialize scorer with custom weights if provided
+        if request.weights:
+            try:
+                scorer = BatchPropertyScorer(
+                    weights=ScoringWeights(**request.weights)
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid weights configuration: {str(e)}"
+                )
+        else:
+            scorer = BatchPropertyScorer()
+
+        result = ReverseMatcher(scorer=scorer).find_matching_requests(
+            db,
+            db_property,
+            min_score=request.min_score,
+            limit=request.limit
+        )
+
+        formatted_matches = []
+        for match in result["matches"]:
+            req = match["request"]
+            score_data = match["score_data"]
+
+            formatted_matches.append(
+                RequestScore(
+                    request_id=req.id,
+                    request_code=req.code,
+                    contact_id=req.contactId,
+                    urgency=req.urgency,
+                    total_score=score_data["total_score"],
+                    components=score_data["components"],
+                    match_reasons=score_data["match_reasons"],
+                    mismatch_reasons=score_data["mismatch_reasons"]
+                )
+            )
+
+        logger.info(
+            f"Calculated reverse matches for property {request.property_id}: "
+            f"{len(formatted_matches)} requests (min_score: {request.min_score})"
+        )
+
+        return ReverseScoringResponse(
+            success=True,
+            property_id=request.property_id,
+            matches_count=len(formatted_matches),
+            matches=formatted_matches,
+            scoring_info={
+                "total_requests_evaluated": result["candidates_evaluated"],
+                "min_score_threshold": request.min_score,
+                "weights_used": scorer.weights.__dict__
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating reverse matches: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
+
+
+@router.get("/reverse", response_model=ReverseScoringResponse)
+async def calculate_reverse_matches_get(
+    property_id: str = Query(..., description="Property ID"),
+    min_score: float = Query(default=60, ge=0, le=100, description="Minimum score"),
+    limit: int = Query(default=10, ge=1, le=50, description="Max results")
+):
+    """
+    GET version of reverse endpoint for easier testing
+
+    Example: GET /api/scoring/reverse?property_id=prop_123&min_score=70&limit=5
+    """
+    return await calculate_reverse_matches(
+        ReverseScoringRequest(
+            property_id=property_id,
+            min_score=min_score,
+            limit=limit
+        )
+    )
+
+
+@router.get("/nearby", response_model=NearbyResponse)
+async def get_nearby_properties(
+    request_id: Optional[str] = Query(default=None, description="Use the request's search center and radius"),
+    latitude: Optional[float] = Query(default=None, ge=-90, le=90, description="Center latitude"),
+    longitude: Optional[float] = Query(default=None, ge=-180, le=180, description="Center longitude"),
+    radius_km: Optional[float] = Query(default=None, gt=0, le=500, description="Search radius in km"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Max results")
+):
+    """
+    Available properties within a radius, nearest first
+
+    Example: GET /api/scoring/nearby?request_id=req_123
+    Example: GET /api/scoring/nearby?latitude=45.46&longitude=9.19&radius_km=3
+    """
+    return await run_in_threadpool(
+        _nearby_properties, request_id, latitude, longitude, radius_km, limit
+    )
+
+
+def _nearby_properties(
+    request_id: Optional[str],
+    latitude: Optional[float],
+    longitude: Optional[float],
+    radius_km: Optional[float],
+    limit: int
+) -> NearbyResponse:
+    """Body of /nearby: blocking session work, run in the threadpool"""
+    db = SessionLocal()
+
+    try:
+        if request_id:
+            db_request = db.query(Request).filter(Request.id == request_id).first()
+
+            if not db_request:
+                raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
+
+            latitude = latitude if latitude is not None else db_request.centerLatitude
+            longitude = longitude if longitude is not None else db_request.centerLongitude
+            radius_km = radius_km or db_request.searchRadiusKm
+
+        if latitude is None or longitude is None or not radius_km:
+            raise HTTPException(
+                status_code=400,
+                detail="A search center and radius are required (request_id or latitude/longitude/radius_km)"
+            )
+
+        _geo_index.refresh(db)
+        nearby = _geo_index.within(float(latitude), float(longitude), float(radius_km))
+
+        return NearbyResponse(
+            success=True,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            properties_count=len(nearby),
+            properties=[
+                NearbyProperty(property_id=property_id, distance_km=round(distance, 3))
+                for property_id, distance in nearby[:limit]
+            ]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding nearby properties: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
+
+
 @router.get("/weights")
 async def get_default_weights():
     """Get default scoring weights"""
@@ -202,7 +495,7 @@ async def get_default_weights():
         "success": True,
         "weights": ScoringWeights().__dict__,
         "description": {
-            "location_match": "Weight for city/zone matching",
+            "location_match": "Weight for city/zone matching (or distance for radius searches)",
             "price_range": "Weight for price within budget",
             "property_type": "Weight for property type match",
             "size_match": "Weight for square meters match",
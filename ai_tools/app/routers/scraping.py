@@ -141,6 +141,7 @@ async def _run_scraper_async(
         "location": job_data.location,
         "listings_count": len(listings),
         "saved_count": counts["saved"],
+        "updated_count": counts["updated"],
         "skipped_count": counts["skipped"],
         "error_count": counts["errors"],
         "listings": listings,
@@ -305,36 +306,47 @@ async def list_scraped_properties(
     city: Optional[str] = None,
     page: int = 1,
     page_size: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[str] = None,
 ):
     """
-    List scraped properties from database
+    List scraped properties from database, newest first
 
-    Filter by source portal or city.
+    Filter by source portal or city. Pass the next_cursor of a response as
+    cursor to read the following page with keyset pagination (page is then
+    ignored). total is one of exact, cached, approximate or none (default:
+    exact with page, cached with cursor).
     """
     try:
-        from database.python.database import get_db_context
-        from database.python.models import Property
+        from sqlalchemy import select
 
-        with get_db_context() as db:
-            query = db.query(Property)
+        from app.database import get_async_db_context
+        from app.models import Property
+        from app.services import property_load_options
+        from app.utils.pagination import paginate
+
+        async with get_async_db_context() as db:
+            query = select(Property).options(*property_load_options("card"))
 
             # Filter
             if source:
-                query = query.filter(Property.source == source)
+                query = query.where(Property.source == source)
 
             if city:
-                query = query.filter(Property.city.ilike(f"%{city}%"))
-
-            # Count total
-            total_count = query.count()
+                query = query.where(Property.city.ilike(f"%{city}%"))
 
             # Paginate
-            offset = (page - 1) * page_size
-            properties = query.offset(offset).limit(page_size).all()
+            result = await paginate(
+                db, query, Property, page_size,
+                page=page,
+                cursor=cursor,
+                total=total,
+                cache_key=("scraped_properties", source, city)
+            )
 
             # Convert to dicts
             properties_list = []
-            for prop in properties:
+            for prop in result.rows:
                 properties_list.append({
                     "id": prop.id,
                     "code": prop.code,
@@ -353,7 +365,8 @@ async def list_scraped_properties(
                     "created_at": prop.createdAt.isoformat() if prop.createdAt else None,
                 })
 
-            total_pages = (total_count + page_size - 1) // page_size
+            total_count = result.total
+            total_pages = (total_count + page_size - 1) // page_size if total_count is not None else None
 
             return PropertyListResponse(
                 count=total_count,
@@ -361,8 +374,12 @@ async def list_scraped_properties(
                 page=page,
                 page_size=page_size,
                 total_pages=total_pages,
+                next_cursor=result.next_cursor,
+                count_exact=result.total_exact,
             )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing properties: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -58,6 +58,7 @@ class ScrapingJobResult(BaseModel):
     location: str
     listings_count: int
     saved_count: int
+    updated_count: int = 0  # Re-scraped listings with changed fields
     skipped_count: int
     error_count: int
     listings: List[Dict[str, Any]]
@@ -78,8 +79,10 @@ class ScrapingStatsResponse(BaseModel):
 class PropertyListResponse(BaseModel):
     """Response for property list"""
 
-    count: int
+    count: Optional[int]  # None with total=none
     properties: List[Dict[str, Any]]
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None  # Pass as cursor for the next page
+    count_exact: bool = True  # False for cached or estimated counts
@@ -4,11 +4,42 @@ Business logic and utility services
 """
 
 from .property_scorer import PropertyScorer, ScoringWeights
+from .request_profile import RequestProfile
+from .property_vector import PropertyVector, load_property_vectors
+from .batch_scorer import BatchPropertyScorer, PropertyColumns, RequestColumns
+from .candidate_index import CandidateIndex
+from .geo_index import GeoGridIndex, PropertyGeoIndex
+from .reverse_matching import ReverseMatcher
+from .match_materializer import MatchMaterializer
 from .suggested_queries import SuggestedQueriesGenerator, generate_suggested_queries
+from .load_profiles import PROPERTY_PROFILES, property_load_options
+from .market_stats import (
+    PortfolioSnapshot,
+    get_portfolio_snapshot,
+    count_active_requests,
+    rebuild_request_cities,
+)
 
 __all__ = [
     "PropertyScorer",
     "ScoringWeights",
+    "RequestProfile",
+    "PropertyVector",
+    "load_property_vectors",
+    "BatchPropertyScorer",
+    "PropertyColumns",
+    "RequestColumns",
+    "CandidateIndex",
+    "GeoGridIndex",
+    "PropertyGeoIndex",
+    "ReverseMatcher",
+    "MatchMaterializer",
     "SuggestedQueriesGenerator",
     "generate_suggested_queries",
+    "PROPERTY_PROFILES",
+    "property_load_options",
+    "PortfolioSnapshot",
+    "get_portfolio_snapshot",
+    "count_active_requests",
+    "rebuild_request_cities",
 ]
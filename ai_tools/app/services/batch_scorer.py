@@ -0,0 +1,721 @@
+"""
+Batch Property Scoring
+Columnar (NumPy) version of PropertyScorer for scoring large candidate sets
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from app.models import Property, Request
+from .geo_index import has_coordinates, haversine_km_array
+from .property_scorer import PropertyScorer, CONDITION_SCORES
+from .request_profile import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+
+# Property columns read by the scoring components (in query order)
+SCORING_COLUMNS = (
+    "id",
+    "contractType",
+    "city",
+    "zone",
+    "propertyType",
+    "priceSale",
+    "priceRentMonthly",
+    "sqmCommercial",
+    "rooms",
+    "hasElevator",
+    "hasParking",
+    "hasGarage",
+    "hasGarden",
+    "hasTerrace",
+    "condition",
+    "latitude",
+    "longitude",
+)
+
+
+def _factorize(values: Sequence) -> Tuple[np.ndarray, List]:
+    """Encode values as integer codes plus the list of distinct values"""
+    index: Dict = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def _to_float(value) -> float:
+    """Convert a nullable numeric column value to float (None -> NaN)"""
+    return np.nan if value is None else float(value)
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    """Vectorized truthiness of a float column (NaN and 0 are falsy)"""
+    return ~np.isnan(values) & (values != 0)
+
+
+class PropertyColumns:
+    """
+    Columnar snapshot of the scoring-relevant Property fields
+
+    Strings are dictionary-encoded (codes + distinct values) so that
+    membership checks run once per distinct value instead of once per row.
+    Numeric columns are float64 with NaN for NULL.
+    """
+
+    def __init__(self, rows: Sequence[Sequence]):
+        """
+        Build columns from rows ordered as SCORING_COLUMNS
+
+        Args:
+            rows: Tuples from a column-only query or from_properties()
+        """
+        columns = list(zip(*rows)) if rows else [()] * len(SCORING_COLUMNS)
+        data = dict(zip(SCORING_COLUMNS, columns))
+
+        self.ids: List[str] = list(data["id"])
+
+        self.contract_codes, self.contract_values = _factorize(data["contractType"])
+        self.city_codes, self.city_values = _factorize(data["city"])
+        self.zone_codes, self.zone_values = _factorize(data["zone"])
+        self.type_codes, self.type_values = _factorize(data["propertyType"])
+        self.condition_codes, self.condition_values = _factorize(data["condition"])
+
+        n = len(self.ids)
+        for name, attr in (
+            ("priceSale", "price_sale"),
+            ("priceRentMonthly", "price_rent"),
+            ("sqmCommercial", "sqm"),
+            ("rooms", "rooms"),
+            ("latitude", "latitude"),
+            ("longitude", "longitude"),
+        ):
+            setattr(self, attr, np.fromiter(
+                (_to_float(v) for v in data[name]), dtype=np.float64, count=n
+            ))
+
+        for name, attr in (
+            ("hasElevator", "has_elevator"),
+            ("hasParking", "has_parking"),
+            ("hasGarage", "has_garage"),
+            ("hasGarden", "has_garden"),
+            ("hasTerrace", "has_terrace"),
+        ):
+            setattr(self, attr, np.fromiter(
+                (bool(v) for v in data[name]), dtype=bool, count=n
+            ))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def subset(self, indices: np.ndarray) -> "PropertyColumns":
+        """Columns restricted to the given row indices (distinct values are shared)"""
+        subset = object.__new__(PropertyColumns)
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                value = value[indices]
+            elif name == "ids":
+                value = [value[i] for i in indices]
+            setattr(subset, name, value)
+        return subset
+
+    @classmethod
+    def from_properties(cls, properties: Sequence[Property]) -> "PropertyColumns":
+        """Build columns from already loaded ORM objects"""
+        return cls([
+            tuple(getattr(prop, name) for name in SCORING_COLUMNS)
+            for prop in properties
+        ])
+
+    @staticmethod
+    def query_columns() -> List:
+        """Property column attributes for a column-only db.query(...)"""
+        return [getattr(Property, name) for name in SCORING_COLUMNS]
+
+
+class RequestColumns:
+    """
+    Columnar view of compiled requests, for scoring one property against many
+
+    Bounds are float64 with NaN where the profile has None (unset or zero);
+    city, zone and type sets stay on the profiles, since a single property
+    needs one set lookup per request.
+    """
+
+    def __init__(self, profiles: Sequence[RequestProfile]):
+        """
+        Args:
+            profiles: Compiled requests (RequestProfile.of() of each row)
+        """
+        self.profiles = list(profiles)
+
+        n = len(self.profiles)
+        for name in (
+            "price_min",
+            "price_max",
+            "sqm_min",
+            "sqm_max",
+            "rooms_min",
+            "rooms_max",
+            "search_radius_km",
+            "center_latitude",
+            "center_longitude",
+        ):
+            setattr(self, name, np.fromiter(
+                (_to_float(getattr(p, name)) for p in self.profiles), dtype=np.float64, count=n
+            ))
+
+        for name in ("requires_elevator", "requires_parking", "requires_garden", "requires_terrace"):
+            setattr(self, name, np.fromiter(
+                (getattr(p, name) for p in self.profiles), dtype=bool, count=n
+            ))
+
+        self.sale = np.fromiter(
+            (p.contract_type == "sale" for p in self.profiles), dtype=bool, count=n
+        )
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    @classmethod
+    def from_requests(cls, requests: Sequence[Union[Request, RequestProfile]]) -> "RequestColumns":
+        """Build columns from Request rows (or their profiles)"""
+        return cls([RequestProfile.of(request) for request in requests])
+
+    def each(self, predicate) -> np.ndarray:
+        """Evaluate predicate(profile) -> float for every request"""
+        return np.fromiter((predicate(p) for p in self.profiles), dtype=np.float64, count=len(self))
+
+
+def _rank_totals(
+    totals: np.ndarray,
+    eligible: np.ndarray,
+    min_score: float,
+    limit: Optional[int]
+) -> List[Tuple[int, float]]:
+    """(index, rounded total) of the eligible rows above min_score, best first (stable)"""
+    # round(x, 2) moves a value by at most 0.005: pre-filter on the raw
+    # total, then round the remaining candidates exactly like Python does
+    candidates = np.flatnonzero(eligible & (totals >= min_score - 0.01))
+    rounded = np.array(
+        [round(x, 2) for x in totals[candidates].tolist()], dtype=np.float64
+    )
+    keep = rounded >= min_score
+    candidates, rounded = candidates[keep], rounded[keep]
+
+    order = np.argsort(-rounded, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    return [(int(candidates[i]), float(rounded[i])) for i in order]
+
+
+def _lookup(codes: np.ndarray, values: List, predicate) -> np.ndarray:
+    """Evaluate predicate once per distinct value and broadcast to rows"""
+    table = np.fromiter((predicate(v) for v in values), dtype=np.float64, count=len(values))
+    return table[codes] if len(codes) else np.zeros(0)
+
+
+class BatchPropertyScorer(PropertyScorer):
+    """
+    PropertyScorer with a vectorized scoring pass
+
+    Component scores replicate the per-object methods of PropertyScorer
+    operation by operation (same float arithmetic and rounding), so totals
+    are identical to calculate_match_score(). Reasons are built only for
+    the returned matches, by delegating to calculate_match_score().
+
+    Numeric values (Decimal columns included) are scored as floats.
+    """
+
+    def score_columns(
+        self,
+        request: Union[Request, RequestProfile],
+        columns: PropertyColumns
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute all component scores and the weighted total for every row
+
+        Args:
+            request: Request to match against (or its RequestProfile)
+            columns: Property columns to score
+
+        Returns:
+            Dict of arrays: location, price, property_type, size, rooms,
+            features, condition and total (unrounded)
+        """
+        request = RequestProfile.of(request)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            components = {
+                "location": self._location_scores(columns, request),
+                "price": self._price_scores(columns, request),
+                "property_type": self._type_scores(columns, request),
+                "size": self._size_scores(columns, request),
+                "rooms": self._rooms_scores(columns, request),
+                "features": self._features_scores(columns, request),
+                "condition": self._condition_scores(columns),
+            }
+
+        components["total"] = (
+            components["location"] * self.weights.location_match +
+            components["price"] * self.weights.price_range +
+            components["property_type"] * self.weights.property_type +
+            components["size"] * self.weights.size_match +
+            components["rooms"] * self.weights.rooms_match +
+            components["features"] * self.weights.features_match +
+            components["condition"] * self.weights.condition_match
+        )
+        return components
+
+    def rank(
+        self,
+        request: Union[Request, RequestProfile],
+        columns: PropertyColumns,
+        min_score: float = 0,
+        limit: Optional[int] = None,
+        scores: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank rows by rounded total score
+
+        Applies the same contract type filter, threshold and (stable)
+        descending order as get_sorted_matches().
+
+        Args:
+            scores: Output of score_columns() if already computed
+
+        Returns:
+            List of (row index, total_score), best first, at most `limit` long
+        """
+        request = RequestProfile.of(request)
+        if scores is None:
+            scores = self.score_columns(request, columns)
+        totals = scores["total"]
+
+        eligible = np.ones(len(columns), dtype=bool)
+        if request.contract_type:
+            eligible = _lookup(
+                columns.contract_codes,
+                columns.contract_values,
+                lambda v: v == request.contract_type
+            ).astype(bool)
+
+        return _rank_totals(totals, eligible, min_score, limit)
+
+    def get_sorted_matches_batch(
+        self,
+        request: Request,
+        properties: List[Property],
+        min_score: float = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Vectorized equivalent of get_sorted_matches()[:limit]
+
+        Args:
+            request: Request to match against
+            properties: List of properties to score
+            min_score: Minimum score threshold (0-100)
+            limit: Maximum number of matches to return (None = all)
+
+        Returns:
+            List of dicts with property and score_data, sorted by score (descending)
+        """
+        request = RequestProfile.of(request)
+        columns = PropertyColumns.from_properties(properties)
+        ranked = self.rank(request, columns, min_score=min_score, limit=limit)
+
+        logger.info(
+            f"Batch scored {len(properties)} properties for request {request.id}: "
+            f"{len(ranked)} matches above threshold {min_score}"
+        )
+
+        return [
+            {
+                "property": properties[index],
+                "score_data": self.calculate_match_score(properties[index], request)
+            }
+            for index, _ in ranked
+        ]
+
+    def score_requests(self, property: Property, requests: RequestColumns) -> Dict[str, np.ndarray]:
+        """
+        Compute all component scores and the weighted total of one property
+        against every request (reverse of score_columns())
+
+        Returns:
+            Dict of arrays aligned with requests: location, price,
+            property_type, size, rooms, features, condition and total (unrounded)
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            components = {
+                "location": self._request_location_scores(property, requests),
+                "price": self._request_price_scores(property, requests),
+                "property_type": self._request_type_scores(property, requests),
+                "size": self._request_size_scores(property, requests),
+                "rooms": self._request_rooms_scores(property, requests),
+                "features": self._request_features_scores(property, requests),
+                "condition": np.full(len(requests), float(
+                    CONDITION_SCORES.get(property.condition.lower(), 50) if property.condition else 50
+                )),
+            }
+
+        components["total"] = (
+            components["location"] * self.weights.location_match +
+            components["price"] * self.weights.price_range +
+            components["property_type"] * self.weights.property_type +
+            components["size"] * self.weights.size_match +
+            components["rooms"] * self.weights.rooms_match +
+            components["features"] * self.weights.features_match +
+            components["condition"] * self.weights.condition_match
+        )
+        return components
+
+    def rank_requests(
+        self,
+        property: Property,
+        requests: RequestColumns,
+        min_score: float = 0,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank requests by rounded total score for one property
+
+        Same contract type rule, threshold and (stable) order as
+        get_sorted_requests().
+
+        Returns:
+            List of (request index, total_score), best first, at most `limit` long
+        """
+        totals = self.score_requests(property, requests)["total"]
+        eligible = np.fromiter(
+            (not p.contract_type or p.contract_type == property.contractType for p in requests.profiles),
+            dtype=bool,
+            count=len(requests),
+        )
+        return _rank_totals(totals, eligible, min_score, limit)
+
+    def get_sorted_requests_batch(
+        self,
+        property: Property,
+        requests: List[Request],
+        min_score: float = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Vectorized equivalent of get_sorted_requests()[:limit]
+
+        Args:
+            property: Property to match
+            requests: List of requests to score against
+            min_score: Minimum score threshold (0-100)
+            limit: Maximum number of requests to return (None = all)
+
+        Returns:
+            List of dicts with request and score_data, sorted by score (descending)
+        """
+        columns = RequestColumns.from_requests(requests)
+        ranked = self.rank_requests(property, columns, min_score=min_score, limit=limit)
+
+        logger.info(
+            f"Batch scored property {property.id} against {len(requests)} requests: "
+            f"{len(ranked)} matches above threshold {min_score}"
+        )
+
+        return [
+            {
+                "request": requests[index],
+                "score_data": self.calculate_match_score(property, columns.profiles[index])
+            }
+            for index, _ in ranked
+        ]
+
+    # ------------------------------------------------------------------
+    # Vectorized components (mirror PropertyScorer._calculate_*_score)
+    # ------------------------------------------------------------------
+
+    def _location_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        search_cities = request.search_cities
+        search_zones = request.search_zones
+
+        score = _lookup(
+            cols.city_codes, cols.city_values,
+            lambda v: 60.0 if v and v.lower() in search_cities else 0.0
+        )
+
+        if search_zones:
+            score = score + _lookup(
+                cols.zone_codes, cols.zone_values,
+                lambda v: 40.0 if v and v.lower() in search_zones else 0.0
+            )
+        else:
+            score = score + _lookup(cols.zone_codes, cols.zone_values, lambda v: 20.0 if v else 0.0)
+
+        distances = self._distances_from_center(cols, request)
+        if distances is not None:
+            radius = request.search_radius_km
+            geo = np.where(
+                distances <= radius,
+                100 - 40 * (distances / radius),
+                np.maximum(0, 60 - 60 * ((distances - radius) / radius))
+            )
+            score = np.where(np.isnan(distances), score, np.maximum(score, geo))
+
+        return np.minimum(score, 100)
+
+    @staticmethod
+    def _distances_from_center(cols: PropertyColumns, request: RequestProfile) -> Optional[np.ndarray]:
+        """Distances in km from the search center, NaN without coordinates (None if not a radius search)"""
+        if request.search_radius_km is None:
+            return None
+
+        located = ~np.isnan(cols.latitude) & ~np.isnan(cols.longitude) & (
+            (cols.latitude != 0) | (cols.longitude != 0)
+        )
+        distances = haversine_km_array(
+            request.center_latitude, request.center_longitude,
+            cols.latitude, cols.longitude
+        )
+        return np.where(located, distances, np.nan)
+
+    def _price_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        prices = cols.price_sale if request.contract_type == "sale" else cols.price_rent
+
+        if request.price_max:
+            price_max = request.price_max
+            within = prices <= price_max
+
+            percentage = (prices / price_max) * 100
+            in_budget = np.minimum(100, 70 + (percentage / 100 * 30))
+            if request.price_min:
+                in_budget = np.where(prices >= request.price_min, 100.0, in_budget)
+
+            over_percentage = ((prices - price_max) / price_max) * 100
+            over_budget = np.where(
+                over_percentage <= 10,
+                50.0,
+                np.maximum(0, 50 - (over_percentage * 2))
+            )
+            score = np.where(within, in_budget, over_budget)
+        else:
+            score = np.full(len(cols), 50.0)
+
+        return np.where(_truthy(prices), np.minimum(score, 100), 0.0)
+
+    def _type_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        requested_types = request.property_types
+
+        if not requested_types:
+            return np.full(len(cols), 50.0)
+
+        return _lookup(
+            cols.type_codes, cols.type_values,
+            lambda v: 100.0 if v in requested_types else 20.0
+        )
+
+    def _size_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        sqm = cols.sqm
+
+        if request.sqm_min:
+            sqm_min = request.sqm_min
+            diff_percentage = ((sqm_min - sqm) / sqm_min) * 100
+            undersized = np.maximum(0, 100 - diff_percentage * 2)
+
+        if request.sqm_min and request.sqm_max:
+            sqm_max = request.sqm_max
+            over_percentage = ((sqm - sqm_max) / sqm_max) * 100
+            oversized = np.where(
+                over_percentage <= 15,
+                80.0,
+                np.maximum(0, 80 - over_percentage)
+            )
+            score = np.where(
+                (sqm_min <= sqm) & (sqm <= sqm_max),
+                100.0,
+                np.where(sqm < sqm_min, undersized, oversized)
+            )
+        elif request.sqm_min:
+            score = np.where(sqm >= sqm_min, 100.0, undersized)
+        else:
+            score = np.full(len(cols), 50.0)
+
+        return np.where(_truthy(sqm), np.minimum(score, 100), 50.0)
+
+    def _rooms_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        rooms = cols.rooms
+
+        if not request.rooms_min:
+            return np.full(len(cols), 50.0)
+
+        rooms_min = float(request.rooms_min)
+        if request.rooms_max:
+            enough = np.where(rooms <= float(request.rooms_max), 100.0, 80.0)
+        else:
+            enough = np.full(len(cols), 80.0)
+
+        score = np.where(
+            rooms >= rooms_min,
+            enough,
+            np.maximum(0, (rooms / rooms_min) * 100)
+        )
+
+        return np.minimum(np.where(_truthy(rooms), score, 50.0), 100)
+
+    def _features_scores(self, cols: PropertyColumns, request: RequestProfile) -> np.ndarray:
+        required = [
+            (request.requires_elevator, cols.has_elevator),
+            (request.requires_parking, cols.has_parking | cols.has_garage),
+            (request.requires_garden, cols.has_garden),
+            (request.requires_terrace, cols.has_terrace),
+        ]
+
+        if not any(flag for flag, _ in required):
+            return np.full(len(cols), 70.0)
+
+        score = np.full(len(cols), 100.0)
+        for flag, present in required:
+            if flag:
+                score = score - np.where(present, 0.0, 25.0)
+
+        return np.maximum(0, np.minimum(score, 100))
+
+    def _condition_scores(self, cols: PropertyColumns) -> np.ndarray:
+        return _lookup(
+            cols.condition_codes, cols.condition_values,
+            lambda v: CONDITION_SCORES.get(v.lower(), 50) if v else 50.0
+        )
+
+    # ------------------------------------------------------------------
+    # One property, many requests (mirror PropertyScorer._calculate_*_score)
+    # ------------------------------------------------------------------
+
+    def _request_location_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        city = property.city.lower() if property.city else None
+        zone = property.zone.lower() if property.zone else None
+
+        def city_zone_score(profile: RequestProfile) -> float:
+            score = 60.0 if city and city in profile.search_cities else 0.0
+            if zone and profile.search_zones:
+                score += 40.0 if zone in profile.search_zones else 0.0
+            elif zone:
+                score += 20.0
+            return score
+
+        score = reqs.each(city_zone_score)
+
+        if has_coordinates(property.latitude, property.longitude):
+            radius = reqs.search_radius_km
+            # haversine is symmetric: distance from the property to each center
+            distances = haversine_km_array(
+                float(property.latitude), float(property.longitude),
+                reqs.center_latitude, reqs.center_longitude
+            )
+            geo = np.where(
+                distances <= radius,
+                100 - 40 * (distances / radius),
+                np.maximum(0, 60 - 60 * ((distances - radius) / radius))
+            )
+            score = np.where(np.isnan(radius), score, np.maximum(score, geo))
+
+        return np.minimum(score, 100)
+
+    def _request_price_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        price_sale = _to_float(property.priceSale)
+        price_rent = _to_float(property.priceRentMonthly)
+        prices = np.where(reqs.sale, price_sale, price_rent)
+        price_max = reqs.price_max
+
+        percentage = (prices / price_max) * 100
+        in_budget = np.minimum(100, 70 + (percentage / 100 * 30))
+        in_budget = np.where(prices >= reqs.price_min, 100.0, in_budget)
+
+        over_percentage = ((prices - price_max) / price_max) * 100
+        over_budget = np.where(
+            over_percentage <= 10,
+            50.0,
+            np.maximum(0, 50 - (over_percentage * 2))
+        )
+        score = np.where(
+            np.isnan(price_max),
+            50.0,
+            np.where(prices <= price_max, in_budget, over_budget)
+        )
+
+        return np.where(_truthy(prices), np.minimum(score, 100), 0.0)
+
+    def _request_type_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        def type_score(profile: RequestProfile) -> float:
+            if not profile.property_types:
+                return 50.0
+            return 100.0 if property.propertyType in profile.property_types else 20.0
+
+        return reqs.each(type_score)
+
+    def _request_size_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        if not property.sqmCommercial:
+            return np.full(len(reqs), 50.0)
+
+        sqm = float(property.sqmCommercial)
+        sqm_min, sqm_max = reqs.sqm_min, reqs.sqm_max
+
+        diff_percentage = ((sqm_min - sqm) / sqm_min) * 100
+        undersized = np.maximum(0, 100 - diff_percentage * 2)
+
+        over_percentage = ((sqm - sqm_max) / sqm_max) * 100
+        oversized = np.where(
+            over_percentage <= 15,
+            80.0,
+            np.maximum(0, 80 - over_percentage)
+        )
+        in_range = np.where(
+            (sqm_min <= sqm) & (sqm <= sqm_max),
+            100.0,
+            np.where(sqm < sqm_min, undersized, oversized)
+        )
+        min_only = np.where(sqm >= sqm_min, 100.0, undersized)
+
+        has_min = ~np.isnan(sqm_min)
+        score = np.where(
+            has_min & ~np.isnan(sqm_max),
+            in_range,
+            np.where(has_min, min_only, 50.0)
+        )
+        return np.minimum(score, 100)
+
+    def _request_rooms_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        if not property.rooms:
+            return np.full(len(reqs), 50.0)
+
+        rooms = float(property.rooms)
+        rooms_min, rooms_max = reqs.rooms_min, reqs.rooms_max
+
+        enough = np.where(~np.isnan(rooms_max) & (rooms <= rooms_max), 100.0, 80.0)
+        score = np.where(
+            rooms >= rooms_min,
+            enough,
+            np.maximum(0, (rooms / rooms_min) * 100)
+        )
+        return np.minimum(np.where(np.isnan(rooms_min), 50.0, score), 100)
+
+    def _request_features_scores(self, property: Property, reqs: RequestColumns) -> np.ndarray:
+        required = [
+            (reqs.requires_elevator, bool(property.hasElevator)),
+            (reqs.requires_parking, bool(property.hasParking or property.hasGarage)),
+            (reqs.requires_garden, bool(property.hasGarden)),
+            (reqs.requires_terrace, bool(property.hasTerrace)),
+        ]
+
+        score = np.full(len(reqs), 100.0)
+        any_required = np.zeros(len(reqs), dtype=bool)
+        for flags, present in required:
+            any_required |= flags
+            if not present:
+                score = score - np.where(flags, 25.0, 0.0)
+
+        return np.where(any_required, np.maximum(0, np.minimum(score, 100)), 70.0)
@@ -0,0 +1,283 @@
+"""
+Candidate Index
+In-memory index that prunes properties which cannot reach a score threshold
+"""
+
+from typing import List, Optional, Tuple, Union
+import logging
+import math
+
+import numpy as np
+
+from app.models import Request
+from .batch_scorer import BatchPropertyScorer, PropertyColumns, _lookup, _truthy
+from .geo_index import GeoGridIndex
+from .property_scorer import ScoringWeights
+from .request_profile import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+
+# Bucket id for rows whose value is NULL or 0 (scored as "missing")
+MISSING_BUCKET = np.iinfo(np.int64).min
+
+
+def _buckets(values: np.ndarray, ratio: float) -> np.ndarray:
+    """Geometric buckets of a float column; falsy values get MISSING_BUCKET"""
+    present = _truthy(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        buckets = np.floor(np.log(np.abs(values)) / math.log(ratio)) * np.sign(values)
+    return np.where(present, np.nan_to_num(buckets), MISSING_BUCKET).astype(np.int64)
+
+
+class CandidateIndex:
+    """
+    Properties grouped by (city, zone, price bucket, sqm bucket)
+
+    For a request, an upper bound of the total score is computed per group:
+    location is exact for the group's city/zone, price and size are bounded
+    using the group's actual min/max values, and the other components use
+    their maximum for the request. Groups whose bound is below the threshold
+    are skipped; since no pruned row could pass BatchPropertyScorer.rank()'s
+    threshold, ranking the candidates gives the same result as a full scan.
+
+    For radius searches, rows within twice the radius (where the distance
+    score is positive) come from a GeoGridIndex and are bounded with the
+    best location score; the rest keep the city/zone bound.
+    """
+
+    def __init__(
+        self,
+        columns: PropertyColumns,
+        price_ratio: float = 1.25,
+        sqm_ratio: float = 1.15
+    ):
+        """
+        Args:
+            columns: Property columns to index
+            price_ratio: Width of the geometric price buckets
+            sqm_ratio: Width of the geometric sqm buckets
+        """
+        self.columns = columns
+
+        keys = np.stack([
+            columns.city_codes,
+            columns.zone_codes,
+            _buckets(columns.price_sale, price_ratio),
+            _buckets(columns.price_rent, price_ratio),
+            _buckets(columns.sqm, sqm_ratio),
+        ], axis=1) if len(columns) else np.zeros((0, 5), dtype=np.int64)
+
+        group_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        self.row_groups = inverse
+
+        order = np.argsort(inverse, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0]) if len(order) else order
+        self.group_rows: List[np.ndarray] = np.split(order, starts[1:]) if len(order) else []
+
+        self.group_city_codes = group_keys[:, 0]
+        self.group_zone_codes = group_keys[:, 1]
+
+        # Actual value ranges per group (NaN for groups of missing values)
+        self.price_sale_range = self._ranges(columns.price_sale, order, starts)
+        self.price_rent_range = self._ranges(columns.price_rent, order, starts)
+        self.sqm_range = self._ranges(columns.sqm, order, starts)
+
+        # Built on the first radius search
+        self._geo_index: Optional[GeoGridIndex] = None
+
+        logger.info(f"Built candidate index: {len(columns)} properties in {len(self.group_rows)} groups")
+
+    @staticmethod
+    def _ranges(values: np.ndarray, order: np.ndarray, starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(order):
+            return np.zeros(0), np.zeros(0)
+        # Falsy values (NULL or 0) are scored as missing: keep them out of the range
+        sorted_values = np.where(_truthy(values), values, np.nan)[order]
+        with np.errstate(invalid="ignore"):
+            return (
+                np.fmin.reduceat(sorted_values, starts),
+                np.fmax.reduceat(sorted_values, starts),
+            )
+
+    @property
+    def geo_index(self) -> GeoGridIndex:
+        """Grid of the rows with coordinates, keyed by row index"""
+        if self._geo_index is None:
+            self._geo_index = GeoGridIndex.from_points(
+                (row, latitude, longitude)
+                for row, (latitude, longitude) in enumerate(zip(
+                    self.columns.latitude.tolist(), self.columns.longitude.tolist()
+                ))
+                if not (math.isnan(latitude) or math.isnan(longitude))
+            )
+        return self._geo_index
+
+    def upper_bounds(
+        self,
+        request: RequestProfile,
+        weights: ScoringWeights,
+        best_location: bool = False
+    ) -> np.ndarray:
+        """
+        Upper bound of the total score for each group
+
+        Args:
+            best_location: Bound location with 100 instead of the city/zone score
+        """
+        n = len(self.group_rows)
+        search_cities = request.search_cities
+        search_zones = request.search_zones
+
+        location = _lookup(
+            self.group_city_codes, self.columns.city_values,
+            lambda v: 60.0 if v and v.lower() in search_cities else 0.0
+        )
+        if search_zones:
+            location = location + _lookup(
+                self.group_zone_codes, self.columns.zone_values,
+                lambda v: 40.0 if v and v.lower() in search_zones else 0.0
+            )
+        else:
+            location = location + _lookup(
+                self.group_zone_codes, self.columns.zone_values,
+                lambda v: 20.0 if v else 0.0
+            )
+        location = np.full(n, 100.0) if best_location else np.minimum(location, 100)
+
+        price_low, _ = (
+            self.price_sale_range if request.contract_type == "sale" else self.price_rent_range
+        )
+        with np.errstate(invalid="ignore"):
+            price = self._price_bound(price_low, request)
+            size = self._size_bound(*self.sqm_range, request)
+
+        type_bound = 100.0 if request.property_types else 50.0
+        rooms_bound = 100.0 if request.rooms_min else 50.0
+        features_bound = 100.0 if request.requires_features else 70.0
+
+        return (
+            location * weights.location_match +
+            price * weights.price_range +
+            np.full(n, type_bound) * weights.property_type +
+            size * weights.size_match +
+            np.full(n, rooms_bound) * weights.rooms_match +
+            np.full(n, features_bound) * weights.features_match +
+            np.full(n, 100.0) * weights.condition_match
+        )
+
+    @staticmethod
+    def _price_bound(low: np.ndarray, request: RequestProfile) -> np.ndarray:
+        """Best price score in a group, given its lowest price"""
+        missing = np.isnan(low)
+
+        if not request.price_max:
+            return np.where(missing, 0.0, 50.0)
+
+        # Within budget scores at most 100; over budget the score only
+        # decreases with price, so the lowest price gives the best score
+        price_max = request.price_max
+        over_percentage = ((low - price_max) / price_max) * 100
+        over_budget = np.where(
+            over_percentage <= 10,
+            50.0,
+            np.maximum(0, 50 - (over_percentage * 2))
+        )
+        bound = np.where(low <= price_max, 100.0, over_budget)
+        return np.where(missing, 0.0, bound)
+
+    @staticmethod
+    def _size_bound(low: np.ndarray, high: np.ndarray, request: RequestProfile) -> np.ndarray:
+        """Best size score in a group, given its sqm range"""
+        missing = np.isnan(low)
+
+        if not request.sqm_min:
+            return np.full(len(low), 50.0)
+
+        # Undersized scores grow with sqm (best at the group's largest),
+        # oversized scores shrink with sqm (best at the group's smallest)
+        sqm_min = request.sqm_min
+        diff_percentage = ((sqm_min - high) / sqm_min) * 100
+        undersized = np.maximum(0, 100 - diff_percentage * 2)
+
+        if request.sqm_max:
+            sqm_max = request.sqm_max
+            over_percentage = ((low - sqm_max) / sqm_max) * 100
+            oversized = np.where(
+                over_percentage <= 15,
+                80.0,
+                np.maximum(0, 80 - over_percentage)
+            )
+            bound = np.where(
+                (high >= sqm_min) & (low <= sqm_max),
+                100.0,
+                np.where(high < sqm_min, undersized, oversized)
+            )
+        else:
+            bound = np.where(high >= sqm_min, 100.0, undersized)
+
+        return np.where(missing, 50.0, np.minimum(bound, 100))
+
+    def candidates(
+        self,
+        request: Union[Request, RequestProfile],
+        weights: ScoringWeights,
+        min_score: float
+    ) -> np.ndarray:
+        """
+        Row indices (ascending) of properties that may reach min_score
+
+        Pruning is disabled when a weight is negative, since the bounds
+        assume every component adds to the total.
+        """
+        if not self.group_rows:
+            return np.zeros(0, dtype=np.int64)
+
+        request = RequestProfile.of(request)
+        if min(weights.__dict__.values()) < 0:
+            return np.arange(len(self.columns))
+
+        # Same slack as BatchPropertyScorer.rank() uses before rounding
+        threshold = min_score - 0.01
+        keep = self.upper_bounds(request, weights) >= threshold
+        selected = [rows for rows, kept in zip(self.group_rows, keep) if kept]
+
+        if request.search_radius_km is not None:
+            geo_keep = self.upper_bounds(request, weights, best_location=True) >= threshold
+            nearby = np.array([
+                row for row, _ in self.geo_index.within(
+                    request.center_latitude,
+                    request.center_longitude,
+                    2 * request.search_radius_km
+                )
+            ], dtype=np.int64)
+            if len(nearby):
+                groups = self.row_groups[nearby]
+                selected.append(nearby[geo_keep[groups] & ~keep[groups]])
+
+        if not selected:
+            return np.zeros(0, dtype=np.int64)
+
+        # Original row order keeps rank()'s tie-breaking unchanged
+        return np.sort(np.concatenate(selected))
+
+    def rank(
+        self,
+        scorer: BatchPropertyScorer,
+        request: Union[Request, RequestProfile],
+        min_score: float = 0,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Rank the indexed properties, scoring only the candidates
+
+        Returns:
+            (ranked, candidates_scored) where ranked holds (row index into
+            self.columns, total_score) exactly as scorer.rank() on all rows
+        """
+        request = RequestProfile.of(request)
+        rows = self.candidates(request, scorer.weights, min_score)
+        ranked = scorer.rank(request, self.columns.subset(rows), min_score=min_score, limit=limit)
+
+        return [(int(rows[index]), score) for index, score in ranked], len(rows)
@@ -0,0 +1,244 @@
+"""
+Geo Index
+Uniform lat/lon grid for "points within R km" queries
+"""
+
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import logging
+import math
+import threading
+
+import numpy as np
+
+from app.models import AuditLog, Property
+
+logger = logging.getLogger(__name__)
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Length of one degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def has_coordinates(latitude, longitude) -> bool:
+    """True if a lat/lon pair is set (0, 0 is the scrapers' placeholder)"""
+    return latitude is not None and longitude is not None and bool(latitude or longitude)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in km between two points"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_array(
+    lat: float,
+    lon: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray
+) -> np.ndarray:
+    """Vectorized haversine_km from (lat, lon) to every point; NaN stays NaN"""
+    phi1 = math.radians(lat)
+    phi2 = np.radians(latitudes)
+    d_phi = np.radians(latitudes - lat)
+    d_lambda = np.radians(longitudes - lon)
+
+    a = np.sin(d_phi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class GeoGridIndex:
+    """
+    Points bucketed in square lat/lon cells of `cell_km`
+
+    A radius query only visits the cells of the query's bounding box and
+    computes exact distances for the points in them. Points can be added,
+    moved and removed one at a time. Updates and queries hold a reentrant
+    lock, so one index can be shared across threadpool workers.
+    """
+
+    def __init__(self, cell_km: float = 2.0):
+        """
+        Args:
+            cell_km: Cell side in km (along the meridian)
+        """
+        self.cell_degrees = cell_km / KM_PER_DEGREE
+        self.points: Dict[Hashable, Tuple[float, float]] = {}
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_points(
+        cls,
+        points: Iterable[Tuple[Hashable, Optional[float], Optional[float]]],
+        cell_km: float = 2.0
+    ) -> "GeoGridIndex":
+        """Build an index from (key, latitude, longitude) tuples"""
+        index = cls(cell_km=cell_km)
+        for key, latitude, longitude in points:
+            if has_coordinates(latitude, longitude):
+                index.upsert(key, latitude, longitude)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.points
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def upsert(self, key: Hashable, latitude: float, longitude: float):
+        """Add a point or move it to new coordinates"""
+        latitude, longitude = float(latitude), float(longitude)
+        with self._lock:
+            self.remove(key)
+            self.points[key] = (latitude, longitude)
+            self.cells.setdefault(self._cell(latitude, longitude), set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a point (no-op if missing)"""
+        with self._lock:
+            point = self.points.pop(key, None)
+            if point is None:
+                return
+
+            cell = self._cell(*point)
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Points within radius_km of (latitude, longitude)
+
+        Returns:
+            List of (key, distance_km), nearest first
+        """
+        if radius_km < 0:
+            return []
+
+        # Bounding box of the spherical cap
+        angular = radius_km / EARTH_RADIUS_KM
+        d_lat = math.degrees(angular)
+        lat_min, lat_max = latitude - d_lat, latitude + d_lat
+
+        cos_lat = math.cos(math.radians(latitude))
+        if lat_min <= -90 or lat_max >= 90 or math.sin(angular) >= cos_lat:
+            lon_ranges = [(-180.0, 180.0)]
+        else:
+            d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+            lon_ranges = self._wrap(longitude - d_lon, longitude + d_lon)
+
+        row_min = math.floor(max(lat_min, -90.0) / self.cell_degrees)
+        row_max = math.floor(min(lat_max, 90.0) / self.cell_degrees)
+
+        results = []
+        with self._lock:
+            if not self.points:
+                return []
+
+            for lon_min, lon_max in lon_ranges:
+                col_min = math.floor(lon_min / self.cell_degrees)
+                col_max = math.floor(lon_max / self.cell_degrees)
+
+                for row in range(row_min, row_max + 1):
+                    for col in range(col_min, col_max + 1):
+                        for key in self.cells.get((row, col), ()):
+                            point_lat, point_lon = self.points[key]
+                            distance = haversine_km(latitude, longitude, point_lat, point_lon)
+                            if distance <= radius_km:
+                                results.append((key, distance))
+
+        results.sort(key=lambda item: item[1])
+        return results
+
+    @staticmethod
+    def _wrap(lon_min: float, lon_max: float) -> List[Tuple[float, float]]:
+        """Split a longitude interval crossing the antimeridian"""
+        if lon_min < -180:
+            return [(lon_min + 360, 180.0), (-180.0, lon_max)]
+        if lon_max > 180:
+            return [(lon_min, 180.0), (-180.0, lon_max - 360)]
+        return [(lon_min, lon_max)]
+
+
+class PropertyGeoIndex(GeoGridIndex):
+    """
+    GeoGridIndex of available properties keyed by property id
+
+    refresh() applies only the changes since the previous call: properties
+    updated after the watermark are added, moved or dropped, and deletions
+    are read from AuditLog.
+    """
+
+    def __init__(self, cell_km: float = 2.0):
+        super().__init__(cell_km=cell_km)
+        self.watermark: Optional[datetime] = None
+
+    def refresh(self, db) -> Dict[str, int]:
+        """
+        Bring the index up to date with the Property table
+
+        Holds the index lock throughout, so concurrent queries never see a
+        half-applied refresh and concurrent refreshes advance the watermark
+        in order.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Stats dict: upserted, removed, total
+        """
+        with self._lock:
+            now = datetime.utcnow()
+            upserted = removed = 0
+
+            query = db.query(
+                Property.id, Property.latitude, Property.longitude, Property.status
+            )
+            if self.watermark is not None:
+                query = query.filter(Property.updatedAt > self.watermark)
+
+            for property_id, latitude, longitude, status in query.all():
+                if status == "available" and has_coordinates(latitude, longitude):
+                    self.upsert(property_id, latitude, longitude)
+                    upserted += 1
+                elif property_id in self:
+                    self.remove(property_id)
+                    removed += 1
+
+            if self.watermark is not None:
+                deleted = db.query(AuditLog.entityId).filter(
+                    AuditLog.entityType == "Property",
+                    AuditLog.action == "delete",
+                    AuditLog.createdAt > self.watermark
+                ).all()
+                for (property_id,) in deleted:
+                    if property_id in self:
+                        self.remove(property_id)
+                        removed += 1
+
+            self.watermark = now
+
+        if upserted or removed:
+            logger.info(f"Geo index refreshed: {upserted} upserted, {removed} removed, {len(self)} total")
+
+        return {"upserted": upserted, "removed": removed, "total": len(self)}
@@ -0,0 +1,79 @@
+"""
+Load Profiles
+Named Property column sets for lists, scoring and detail views
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import load_only
+
+from app.models import Property
+
+from .property_vector import VECTOR_COLUMNS
+
+
+# Columns loaded by each profile (None = the whole row). The long text
+# columns (description, notes, internalNotes) are left out of the list
+# profiles; callers that show them pass them as extra columns.
+PROPERTY_PROFILES: Dict[str, Optional[Tuple[str, ...]]] = {
+    # List cards and search results
+    "card": (
+        "id",
+        "code",
+        "status",
+        "source",
+        "sourceUrl",
+        "title",
+        "street",
+        "civic",
+        "city",
+        "zone",
+        "contractType",
+        "propertyType",
+        "priceSale",
+        "priceRentMonthly",
+        "sqmCommercial",
+        "rooms",
+        "bedrooms",
+        "bathrooms",
+        "floor",
+        "condition",
+        "energyClass",
+        "hasElevator",
+        "hasParking",
+        "hasGarage",
+        "hasGarden",
+        "hasTerrace",
+        "createdAt",
+    ),
+    # PropertyScorer inputs plus what match lists show
+    "scoring": VECTOR_COLUMNS + ("code", "title"),
+    # Property page
+    "detail": None,
+}
+
+
+def property_load_options(profile: str, *extra_columns: str) -> List:
+    """
+    ORM options loading only the columns of a profile
+
+    Works with both Query.options() and select().options(); columns left
+    out are deferred and loaded on first access (one query per row).
+
+    Args:
+        profile: Name in PROPERTY_PROFILES ("card", "scoring", "detail")
+        extra_columns: Property columns loaded on top of the profile
+
+    Returns:
+        List of loader options (empty for the whole row)
+    """
+    if profile not in PROPERTY_PROFILES:
+        raise ValueError(f"Unknown load profile: {profile}")
+
+    columns = PROPERTY_PROFILES[profile]
+    if columns is None:
+        return []
+
+    # Vector columns the model does not have yet (furnished) are skipped
+    names = [name for name in dict.fromkeys(columns + extra_columns) if hasattr(Property, name)]
+    return [load_only(*(getattr(Property, name) for name in names))]
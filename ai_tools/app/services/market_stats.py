@@ -0,0 +1,250 @@
+"""
+Market Stats
+Portfolio and demand aggregates computed in SQL, cached per portfolio version
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import string
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models import Property, Request, RequestCity
+from .request_profile import parse_json_list
+
+logger = logging.getLogger(__name__)
+
+
+# Asking price of a listing: sale price or monthly rent, by contract type
+LISTING_PRICE = case(
+    (Property.contractType == "sale", Property.priceSale),
+    else_=Property.priceRentMonthly,
+)
+
+# Asking price, NULL when missing or zero (a zero price is "not set")
+POSITIVE_PRICE = case((LISTING_PRICE > 0, LISTING_PRICE))
+
+# Property columns the portfolio is grouped by
+GROUP_COLUMNS = ("status", "city", "propertyType", "contractType")
+
+PERCENTILES = (25, 50, 75)
+
+# Seconds a snapshot is served before checking whether properties changed
+SNAPSHOT_TTL_SECONDS = 60
+
+# SQLite's lower() folds ASCII letters only
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class PortfolioSnapshot:
+    """
+    Property counts and asking prices per (status, city, propertyType, contractType)
+
+    Counts, priced counts and price sums come from one GROUP BY; the prices
+    of each group are kept as a sorted array for percentiles. Listings
+    without a price (NULL or 0) count but are left out of the prices. Lookups scan
+    the groups, whose number grows with cities and types, not with listings.
+    """
+
+    def __init__(self, groups: List[Dict], prices: Dict[Tuple, np.ndarray]):
+        """
+        Args:
+            groups: One dict per group: GROUP_COLUMNS values, count, priced, price_sum
+            prices: Sorted asking prices per group key (GROUP_COLUMNS order)
+        """
+        self.groups = groups
+        self.prices = prices
+
+    def __len__(self) -> int:
+        return sum(group["count"] for group in self.groups)
+
+    @classmethod
+    def load(cls, db: Session) -> "PortfolioSnapshot":
+        """Aggregate the whole portfolio (one GROUP BY plus one price-only query)"""
+        keys = [getattr(Property, name) for name in GROUP_COLUMNS]
+
+        rows = db.query(
+            *keys,
+            func.count(),
+            func.count(POSITIVE_PRICE),
+            func.sum(POSITIVE_PRICE),
+        ).group_by(*keys).all()
+
+        groups = [
+            {
+                **dict(zip(GROUP_COLUMNS, row[:len(GROUP_COLUMNS)])),
+                "count": row[-3],
+                "priced": row[-2],
+                "price_sum": float(row[-1] or 0),
+            }
+            for row in rows
+        ]
+
+        buckets: Dict[Tuple, List[float]] = {}
+        for *key, price in db.query(*keys, LISTING_PRICE).filter(LISTING_PRICE > 0):
+            buckets.setdefault(tuple(key), []).append(float(price))
+        prices = {key: np.sort(np.asarray(values, dtype=np.float64)) for key, values in buckets.items()}
+
+        return cls(groups, prices)
+
+    def select(
+        self,
+        status: Optional[str] = None,
+        city: Optional[str] = None,
+        property_type: Optional[str] = None,
+        contract_type: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Groups matching the filters
+
+        Args:
+            status: Exact status
+            city: Case-insensitive substring of the city (like ILIKE '%city%')
+            property_type: Exact property type
+            contract_type: Exact contract type
+        """
+        city = city.lower() if city else None
+        return [
+            group for group in self.groups
+            if (status is None or group["status"] == status)
+            and (city is None or city in (group["city"] or "").lower())
+            and (property_type is None or group["propertyType"] == property_type)
+            and (contract_type is None or group["contractType"] == contract_type)
+        ]
+
+    def summarize(self, groups: Sequence[Dict]) -> Dict:
+        """
+        Totals and asking price statistics of some groups
+
+        Returns:
+            Dict with count, priced, avg_price and percentiles (p25, p50, p75,
+            None when no listing has a price)
+        """
+        count = sum(group["count"] for group in groups)
+        priced = sum(group["priced"] for group in groups)
+        price_sum = sum(group["price_sum"] for group in groups)
+
+        arrays = [
+            self.prices[key]
+            for key in (tuple(group[name] for name in GROUP_COLUMNS) for group in groups)
+            if key in self.prices
+        ]
+        prices = np.concatenate(arrays) if arrays else np.zeros(0)
+
+        return {
+            "count": count,
+            "priced": priced,
+            "avg_price": price_sum / priced if priced else 0,
+            "percentiles": {
+                f"p{pct}": round(float(np.percentile(prices, pct)), 2) if len(prices) else None
+                for pct in PERCENTILES
+            },
+        }
+
+    @staticmethod
+    def counts_by(groups: Sequence[Dict], column: str, top: int = 5) -> List[Tuple[str, int]]:
+        """(value, count) of a GROUP_COLUMNS column, largest first"""
+        counts: Dict[str, int] = {}
+        for group in groups:
+            counts[group[column]] = counts.get(group[column], 0) + group["count"]
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+# Snapshot with the time it was last validated and the (count, max
+# updatedAt) of the portfolio it was built at
+_snapshot: Optional[Tuple[float, Tuple, PortfolioSnapshot]] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_portfolio_snapshot(db: Session, max_age: float = SNAPSHOT_TTL_SECONDS) -> PortfolioSnapshot:
+    """
+    Portfolio snapshot, at most max_age seconds stale
+
+    A snapshot younger than max_age is returned without querying. An older
+    one is checked against the (count, max updatedAt) of properties and
+    rebuilt only if properties were added, removed or updated since.
+    """
+    global _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None and time.monotonic() - _snapshot[0] < max_age:
+            return _snapshot[2]
+
+        signature = tuple(db.query(func.count(), func.max(Property.updatedAt)).one())
+        if _snapshot is not None and _snapshot[1] == signature:
+            _snapshot = (time.monotonic(), signature, _snapshot[2])
+            return _snapshot[2]
+
+        snapshot = PortfolioSnapshot.load(db)
+        _snapshot = (time.monotonic(), signature, snapshot)
+        logger.info(f"Portfolio snapshot built: {len(snapshot)} properties, {len(snapshot.groups)} groups")
+        return snapshot
+
+
+def normalize_city(city: str) -> str:
+    """
+    City as stored in request_cities
+
+    Same as lower(trim(city)) in the request_cities triggers: spaces
+    trimmed and ASCII letters lowercased ("Forlì" and "FORLÌ" stay apart),
+    so rows written by the triggers and by rebuild_request_cities agree.
+    """
+    return city.strip(" ").translate(_ASCII_LOWER)
+
+
+def count_active_requests(db: Session, city: str) -> int:
+    """
+    Active requests with the city among their searchCities
+
+    Counted on request_cities; databases that predate the table fall back
+    to a LIKE scan of searchCities.
+    """
+    try:
+        return db.query(func.count()).select_from(RequestCity).join(
+            Request, Request.id == RequestCity.requestId
+        ).filter(
+            RequestCity.city == normalize_city(city),
+            Request.status == "active"
+        ).scalar()
+    except Exception as e:
+        logger.warning(f"request_cities unavailable, scanning searchCities: {e}")
+        db.rollback()
+        return db.query(Request).filter(
+            Request.status == "active",
+            Request.searchCities.like(f'%{city}%')
+        ).count()
+
+
+def rebuild_request_cities(db: Session) -> int:
+    """
+    Recompute request_cities from Request.searchCities
+
+    SQLite databases keep the table in sync with triggers (see the
+    request_cities migration); this is for databases without them.
+
+    Returns:
+        Number of (request, city) rows
+    """
+    rows = db.query(Request.id, Request.searchCities).filter(Request.searchCities.isnot(None)).all()
+
+    mappings = []
+    for request_id, search_cities in rows:
+        cities = parse_json_list(search_cities)
+        if isinstance(cities, str):
+            cities = [cities]
+        elif not isinstance(cities, list):
+            continue
+
+        for city in {normalize_city(city) for city in cities if isinstance(city, str)}:
+            if city:
+                mappings.append({"requestId": request_id, "city": city})
+
+    db.query(RequestCity).delete()
+    db.bulk_insert_mappings(RequestCity, mappings)
+    db.commit()
+
+    return len(mappings)
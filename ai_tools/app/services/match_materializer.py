@@ -0,0 +1,507 @@
+"""
+Match Materializer
+Batch job that scores every active request against every available property
+and upserts the results into the Match table
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import logging
+import time
+import uuid
+
+from sqlalchemy import or_
+
+from app.database import SessionLocal
+from app.models import AuditLog, Match, Property, Request
+from .batch_scorer import BatchPropertyScorer, PropertyColumns
+from .property_scorer import ScoringWeights
+from .request_profile import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+
+# Request columns read by the scorer (plus contactId, denormalized on Match)
+REQUEST_SCORING_COLUMNS = (
+    "id",
+    "contactId",
+    "contractType",
+    "searchCities",
+    "searchZones",
+    "propertyTypes",
+    "priceMin",
+    "priceMax",
+    "sqmMin",
+    "sqmMax",
+    "roomsMin",
+    "roomsMax",
+    "bedroomsMin",
+    "requiresElevator",
+    "requiresParking",
+    "requiresGarden",
+    "requiresTerrace",
+    "searchRadiusKm",
+    "centerLatitude",
+    "centerLongitude",
+)
+
+# Match column -> component key in BatchPropertyScorer.score_columns()
+MATCH_SCORE_COLUMNS = {
+    "scoreLocation": "location",
+    "scorePrice": "price",
+    "scoreSize": "size",
+    "scoreFeatures": "features",
+    "scoreCondition": "condition",
+}
+
+# Match statuses the job may delete when a pair falls below min_score;
+# matches already sent/visited/etc. carry agent history and are kept
+REPLACEABLE_MATCH_STATUSES = ("suggested",)
+
+
+# Per-process state, set once by _init_worker so the property columns are
+# pickled once per worker instead of once per chunk
+_worker_state: Dict = {}
+
+
+def _init_worker(columns: PropertyColumns, weights: ScoringWeights, min_score: float):
+    _worker_state["columns"] = columns
+    _worker_state["scorer"] = BatchPropertyScorer(weights=weights)
+    _worker_state["min_score"] = min_score
+
+
+def _score_chunk(requests: List[SimpleNamespace]) -> List[Dict]:
+    """Score a chunk of requests against all properties (runs in a worker)"""
+    columns = _worker_state["columns"]
+    scorer = _worker_state["scorer"]
+    min_score = _worker_state["min_score"]
+
+    rows = []
+    for request in requests:
+        profile = RequestProfile.of(request)
+        scores = scorer.score_columns(profile, columns)
+        for index, total in scorer.rank(profile, columns, min_score=min_score, scores=scores):
+            row = {
+                "requestId": request.id,
+                "propertyId": columns.ids[index],
+                "contactId": request.contactId,
+                "scoreTotal": int(round(total)),
+            }
+            for column, component in MATCH_SCORE_COLUMNS.items():
+                row[column] = int(round(float(scores[component][index])))
+            rows.append(row)
+
+    return rows
+
+
+class MatchMaterializer:
+    """
+    Materialize the requests x available-properties score matrix into Match
+
+    Requests are split into chunks scored in a process pool; each chunk's
+    matches above min_score are upserted in one transaction. Existing Match
+    rows keep their status and feedback, only the scores are refreshed;
+    suggested matches of the chunk's requests that were not scored above
+    min_score this run are deleted in the same transaction.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[ScoringWeights] = None,
+        min_score: float = 60,
+        chunk_size: int = 200,
+        workers: int = 1,
+        session_factory=SessionLocal
+    ):
+        """
+        Args:
+            weights: Scoring weights (default ScoringWeights())
+            min_score: Minimum total score for a pair to be stored
+            chunk_size: Requests per chunk (one task, one transaction)
+            workers: Worker processes (1 = score in the current process)
+            session_factory: Callable returning a database session
+        """
+        self.weights = weights or ScoringWeights()
+        self.min_score = min_score
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.session_factory = session_factory
+
+    def run(self) -> Dict:
+        """
+        Run the full materialization
+
+        Returns:
+            Stats dict with counts, elapsed time and pairs_per_second
+        """
+        start_time = time.time()
+
+        db = self.session_factory()
+        try:
+            columns = PropertyColumns(
+                db.query(*PropertyColumns.query_columns()).filter(
+                    Property.status == "available"
+                ).all()
+            )
+            requests = self.load_requests(db)
+        finally:
+            db.close()
+
+        stats = {
+            "requests": len(requests),
+            "properties": len(columns),
+            "pairs": len(requests) * len(columns),
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+        }
+
+        if requests:
+            # Chunks are scored (and yielded) in order, even with a process pool
+            chunks = zip(self._chunks(requests), self._score_chunks(requests, columns))
+            for chunk, rows in chunks:
+                inserted, updated, deleted = self.upsert_matches(rows, {r.id for r in chunk})
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                stats["deleted"] += deleted
+
+        elapsed = time.time() - start_time
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["pairs_per_second"] = round(stats["pairs"] / elapsed, 1) if elapsed > 0 else 0.0
+
+        logger.info(
+            f"Materialized matches: {stats['pairs']} pairs in {stats['elapsed_seconds']}s "
+            f"({stats['pairs_per_second']} pairs/s), "
+            f"{stats['inserted']} inserted, {stats['updated']} updated, "
+            f"{stats['deleted']} deleted"
+        )
+
+        return stats
+
+    def load_requests(self, db) -> List[SimpleNamespace]:
+        """Load active requests as lightweight, picklable snapshots"""
+        rows = db.query(
+            *[getattr(Request, name) for name in REQUEST_SCORING_COLUMNS]
+        ).filter(Request.status == "active").all()
+
+        return [
+            SimpleNamespace(**dict(zip(REQUEST_SCORING_COLUMNS, row)))
+            for row in rows
+        ]
+
+    def _chunks(self, requests: List[SimpleNamespace]) -> Iterator[List[SimpleNamespace]]:
+        for start in range(0, len(requests), self.chunk_size):
+            yield requests[start:start + self.chunk_size]
+
+    def _score_chunks(
+        self,
+        requests: List[SimpleNamespace],
+        columns: PropertyColumns
+    ) -> Iterator[List[Dict]]:
+        """Yield the match rows of each chunk as soon as it is scored"""
+        initargs = (columns, self.weights, self.min_score)
+
+        if self.workers <= 1:
+            _init_worker(*initargs)
+            for chunk in self._chunks(requests):
+                yield _score_chunk(chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=initargs
+        ) as executor:
+            yield from executor.map(_score_chunk, self._chunks(requests))
+
+    def upsert_matches(
+        self,
+        rows: List[Dict],
+        request_ids: Optional[Set[str]] = None
+    ) -> Tuple[int, int, int]:
+        """
+        Insert, update and delete Match rows in a single transaction
+
+        Existing rows are looked up by (requestId, propertyId).
+
+        Args:
+            rows: Match rows scored above min_score
+            request_ids: Requests that were fully scored (default: those in
+                rows); their suggested matches missing from rows are deleted
+
+        Returns:
+            (inserted, updated, deleted) counts
+        """
+        if request_ids is None:
+            request_ids = {row["requestId"] for row in rows}
+        if not request_ids:
+            return 0, 0, 0
+
+        now = datetime.utcnow()
+        db = self.session_factory()
+
+        try:
+            existing = {
+                (match.requestId, match.propertyId): match
+                for match in db.query(
+                    Match.id, Match.requestId, Match.propertyId, Match.status
+                ).filter(Match.requestId.in_(request_ids)).all()
+            }
+
+            inserts, updates = [], []
+            for row in rows:
+                match = existing.pop((row["requestId"], row["propertyId"]), None)
+                if match:
+                    updates.append({**row, "id": match.id, "updatedAt": now})
+                else:
+                    inserts.append({
+                        **row,
+                        "id": str(uuid.uuid4()),
+                        "status": "suggested",
+                        "createdAt": now,
+                        "updatedAt": now,
+                    })
+
+            # Pairs left over fell below min_score or lost their property
+            stale_ids = [
+                match.id for match in existing.values()
+                if match.status in REPLACEABLE_MATCH_STATUSES
+            ]
+
+            if inserts:
+                db.bulk_insert_mappings(Match, inserts)
+            if updates:
+                db.bulk_update_mappings(Match, updates)
+            if stale_ids:
+                db.query(Match).filter(Match.id.in_(stale_ids)).delete(synchronize_session=False)
+
+            db.commit()
+            return len(inserts), len(updates), len(stale_ids)
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run_incremental(self, since: datetime) -> Dict:
+        """
+        Rescore only the pairs touched by changes after `since`
+
+        Changed requests are rescored against all available properties (rows
+        of the match matrix), changed properties against all active requests
+        (columns). Within that region, Match rows are inserted, updated only
+        when a score changed, and deleted when the pair fell below min_score
+        or its property/request is no longer available/active.
+
+        Args:
+            since: Watermark of the previous run (UTC)
+
+        Returns:
+            Stats dict, including the new `watermark` to pass to the next run
+        """
+        start_time = time.time()
+        watermark = datetime.utcnow()
+
+        db = self.session_factory()
+        try:
+            property_ids, request_ids = self.changed_entity_ids(db, since)
+            requests = self.load_requests(db) if (property_ids or request_ids) else []
+
+            changed_requests = [r for r in requests if r.id in request_ids]
+            other_requests = [r for r in requests if r.id not in request_ids]
+
+            all_columns = self._load_columns(db) if changed_requests else None
+            changed_columns = self._load_columns(db, property_ids) if property_ids else None
+        finally:
+            db.close()
+
+        rows, pairs = [], 0
+        if changed_requests and all_columns:
+            pairs += len(changed_requests) * len(all_columns)
+            for chunk_rows in self._score_chunks(changed_requests, all_columns):
+                rows.extend(chunk_rows)
+        if other_requests and changed_columns:
+            pairs += len(other_requests) * len(changed_columns)
+            for chunk_rows in self._score_chunks(other_requests, changed_columns):
+                rows.extend(chunk_rows)
+
+        stats = {
+            "changed_properties": len(property_ids),
+            "changed_requests": len(request_ids),
+            "pairs": pairs,
+            **self.sync_matches(rows, request_ids, property_ids),
+        }
+
+        elapsed = time.time() - start_time
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["pairs_per_second"] = round(pairs / elapsed, 1) if elapsed > 0 else 0.0
+        stats["watermark"] = watermark.isoformat()
+
+        logger.info(
+            f"Incremental match update since {since.isoformat()}: "
+            f"{len(property_ids)} properties, {len(request_ids)} requests changed, "
+            f"{stats['inserted']} inserted, {stats['updated']} updated, "
+            f"{stats['deleted']} deleted"
+        )
+
+        return stats
+
+    def changed_entity_ids(self, db, since: datetime) -> Tuple[Set[str], Set[str]]:
+        """
+        Collect ids of properties and requests changed after `since`
+
+        Uses the updatedAt watermark plus AuditLog entries, which also
+        cover deleted rows.
+
+        Returns:
+            (property_ids, request_ids)
+        """
+        property_ids = {
+            row.id for row in db.query(Property.id).filter(Property.updatedAt > since)
+        }
+        request_ids = {
+            row.id for row in db.query(Request.id).filter(Request.updatedAt > since)
+        }
+
+        audit_rows = db.query(AuditLog.entityType, AuditLog.entityId).filter(
+            AuditLog.entityType.in_(["Property", "Request"]),
+            AuditLog.createdAt > since
+        ).all()
+
+        for entity_type, entity_id in audit_rows:
+            if entity_type == "Property":
+                property_ids.add(entity_id)
+            else:
+                request_ids.add(entity_id)
+
+        return property_ids, request_ids
+
+    def _load_columns(self, db, property_ids: Optional[Set[str]] = None) -> PropertyColumns:
+        query = db.query(*PropertyColumns.query_columns()).filter(
+            Property.status == "available"
+        )
+        if property_ids is not None:
+            query = query.filter(Property.id.in_(property_ids))
+        return PropertyColumns(query.all())
+
+    def sync_matches(
+        self,
+        rows: List[Dict],
+        request_ids: Set[str],
+        property_ids: Set[str]
+    ) -> Dict[str, int]:
+        """
+        Reconcile Match rows of the changed region with freshly scored rows
+
+        The region is every pair whose request is in request_ids or whose
+        property is in property_ids; `rows` must hold all its pairs above
+        min_score. Runs in a single transaction.
+
+        Returns:
+            Counts of inserted, updated, deleted and unchanged rows
+        """
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        if not request_ids and not property_ids:
+            return counts
+
+        score_columns = ["scoreTotal", *MATCH_SCORE_COLUMNS]
+        now = datetime.utcnow()
+        db = self.session_factory()
+
+        try:
+            existing = {}
+            for match in db.query(
+                Match.id, Match.requestId, Match.propertyId, Match.status,
+                *[getattr(Match, column) for column in score_columns]
+            ).filter(or_(
+                Match.requestId.in_(request_ids),
+                Match.propertyId.in_(property_ids)
+            )).all():
+                existing[(match.requestId, match.propertyId)] = match
+
+            inserts, updates = [], []
+            for row in rows:
+                match = existing.pop((row["requestId"], row["propertyId"]), None)
+                if match is None:
+                    inserts.append({
+                        **row,
+                        "id": str(uuid.uuid4()),
+                        "status": "suggested",
+                        "createdAt": now,
+                        "updatedAt": now,
+                    })
+                elif any(getattr(match, column) != row[column] for column in score_columns):
+                    updates.append({**row, "id": match.id, "updatedAt": now})
+                else:
+                    counts["unchanged"] += 1
+
+            # Pairs left over were not scored above min_score this time
+            stale_ids = [
+                match.id for match in existing.values()
+                if match.status in REPLACEABLE_MATCH_STATUSES
+            ]
+
+            if inserts:
+                db.bulk_insert_mappings(Match, inserts)
+            if updates:
+                db.bulk_update_mappings(Match, updates)
+            if stale_ids:
+                db.query(Match).filter(Match.id.in_(stale_ids)).delete(synchronize_session=False)
+
+            db.commit()
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        counts["inserted"] = len(inserts)
+        counts["updated"] = len(updates)
+        counts["deleted"] = len(stale_ids)
+        return counts
+
+
+# Nightly job entry point: python -m app.services.match_materializer
+if __name__ == "__main__":
+    import argparse
+    import json
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Materialize request/property matches")
+    parser.add_argument("--min-score", type=float, default=60)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--state-file",
+        help="JSON file holding the last watermark; enables incremental runs"
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and rescore everything")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    materializer = MatchMaterializer(
+        min_score=args.min_score,
+        chunk_size=args.chunk_size,
+        workers=args.workers
+    )
+
+    state_file = Path(args.state_file) if args.state_file else None
+    state = json.loads(state_file.read_text()) if state_file and state_file.exists() else {}
+
+    if state.get("watermark") and not args.full:
+        result = materializer.run_incremental(datetime.fromisoformat(state["watermark"]))
+    else:
+        started_at = datetime.utcnow()
+        result = materializer.run()
+        result["watermark"] = started_at.isoformat()
+
+    if state_file:
+        state_file.write_text(json.dumps({"watermark": result["watermark"]}))
+
+    print(json.dumps(result, indent=2))
@@ -3,15 +3,37 @@ Property Scoring Algorithm
 Deterministic algorithm for calculating property-request match scores
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
-import json
+import heapq
 import logging
 
 from app.models import Property, Request
+from .geo_index import has_coordinates, haversine_km
+from .request_profile import RequestProfile, parse_json_list
 
 logger = logging.getLogger(__name__)
 
+# Score assigned to each (lowercase) property condition
+CONDITION_SCORES = {
+    "nuovo": 100,
+    "ottimo": 90,
+    "buono": 70,
+    "abitabile": 50,
+    "da ristrutturare": 30
+}
+
+
+def distance_score(distance_km: float, radius_km: float) -> float:
+    """
+    Location score for a distance from a request's search center
+
+    100 at the center, 60 at the radius edge, then down to 0 at twice the radius.
+    """
+    if distance_km <= radius_km:
+        return 100 - 40 * (distance_km / radius_km)
+    return max(0, 60 - 60 * ((distance_km - radius_km) / radius_km))
+
 
 @dataclass
 class ScoringWeights:
@@ -34,11 +56,15 @@ class PropertyScorer:
     def calculate_match_score(
         self,
         property: Property,
-        request: Request
+        request: Union[Request, RequestProfile]
     ) -> Dict:
         """
         Calculate match score between property and request
 
+        Args:
+            property: Property to score
+            request: Request, or its compiled RequestProfile
+
         Returns:
             {
                 "total_score": 0-100,
@@ -51,6 +77,7 @@ class PropertyScorer:
                 "mismatch_reasons": ["Manca garage", ...]
             }
         """
+        request = RequestProfile.of(request)
         components = {}
         reasons_match = []
         reasons_mismatch = []
@@ -127,26 +154,17 @@ class PropertyScorer:
     def _calculate_location_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate location match score"""
         score = 0.0
         reasons = {"match": [], "mismatch": []}
 
-        # Parse cities from request (JSON array)
-        try:
-            search_cities = json.loads(request.searchCities) if request.searchCities else []
-        except:
-            search_cities = []
+        search_cities = request.search_cities
+        search_zones = request.search_zones
 
-        # Parse zones from request (JSON array)
-        try:
-            search_zones = json.loads(request.searchZones) if request.searchZones else []
-        except:
-            search_zones = []
-
-        # Check city match
-        if property.city in search_cities:
+        # Check city match (case-insensitive)
+        if property.city and property.city.lower() in search_cities:
             score += 60
             reasons["match"].append(f"Città richiesta: {property.city}")
         else:
@@ -154,7 +172,7 @@ class PropertyScorer:
 
         # Check zone match
         if property.zone and search_zones:
-            if property.zone in search_zones:
+            if property.zone.lower() in search_zones:
                 score += 40
                 reasons["match"].append(f"Zona preferita: {property.zone}")
             else:
@@ -163,12 +181,36 @@ class PropertyScorer:
             # Zone not specified = neutral
             score += 20
 
+        # Radius search: distance from the search center, if better than city/zone
+        distance = self._distance_from_center(property, request)
+        if distance is not None:
+            radius = request.search_radius_km
+            if distance <= radius:
+                reasons["match"].append(f"Entro {radius:g} km dal centro ricerca ({distance:.1f} km)")
+            else:
+                reasons["mismatch"].append(
+                    f"A {distance:.1f} km dal centro ricerca (raggio: {radius:g} km)"
+                )
+            score = max(score, distance_score(distance, radius))
+
         return min(score, 100), reasons
 
+    @staticmethod
+    def _distance_from_center(property: Property, request: RequestProfile) -> Optional[float]:
+        """Distance in km from the request's search center (None if not a radius search)"""
+        if request.search_radius_km is None:
+            return None
+        if not has_coordinates(property.latitude, property.longitude):
+            return None
+        return haversine_km(
+            request.center_latitude, request.center_longitude,
+            float(property.latitude), float(property.longitude)
+        )
+
     def _calculate_price_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate price match score"""
         score = 0.0
@@ -177,43 +219,47 @@ class PropertyScorer:
         # Get property price based on contract type
         prop_price = (
             property.priceSale
-            if request.contractType == "sale"
+            if request.contract_type == "sale"
             else property.priceRentMonthly
         )
 
         if not prop_price:
             return 0, {"match": [], "mismatch": ["Prezzo immobile non disponibile"]}
 
+        prop_price = float(prop_price)
+        price_min = request.price_min
+        price_max = request.price_max
+
         # Check if price is within budget
-        if request.priceMax:
-            if prop_price <= request.priceMax:
+        if price_max:
+            if prop_price <= price_max:
                 # Calculate how well it fits the budget
-                if request.priceMin and prop_price >= request.priceMin:
+                if price_min and prop_price >= price_min:
                     # Perfect fit in range
                     score = 100
                     reasons["match"].append(
-                        f"Prezzo ideale: €{int(prop_price):,} (budget: €{int(request.priceMin):,}-€{int(request.priceMax):,})"
+                        f"Prezzo ideale: €{int(prop_price):,} (budget: €{int(price_min):,}-€{int(price_max):,})"
                     )
                 else:
                     # Below min or no min specified
-                    percentage = (prop_price / request.priceMax) * 100
+                    percentage = (prop_price / price_max) * 100
                     score = min(100, 70 + (percentage / 100 * 30))
                     reasons["match"].append(
-                        f"Prezzo nel budget: €{int(prop_price):,} (max: €{int(request.priceMax):,})"
+                        f"Prezzo nel budget: €{int(prop_price):,} (max: €{int(price_max):,})"
                     )
             else:
                 # Over budget
-                over_percentage = ((prop_price - request.priceMax) / request.priceMax) * 100
+                over_percentage = ((prop_price - price_max) / price_max) * 100
                 if over_percentage <= 10:
                     # Slightly over (10%) - still acceptable
                     score = 50
                     reasons["mismatch"].append(
-                        f"Prezzo leggermente alto: €{int(prop_price):,} (max: €{int(request.priceMax):,})"
+                        f"Prezzo leggermente alto: €{int(prop_price):,} (max: €{int(price_max):,})"
                     )
                 else:
                     score = max(0, 50 - (over_percentage * 2))
                     reasons["mismatch"].append(
-                        f"Fuori budget: €{int(prop_price):,} (max: €{int(request.priceMax):,})"
+                        f"Fuori budget: €{int(prop_price):,} (max: €{int(price_max):,})"
                     )
         else:
             # No max price specified
@@ -225,17 +271,13 @@ class PropertyScorer:
     def _calculate_type_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate property type match score"""
         score = 0.0
         reasons = {"match": [], "mismatch": []}
 
-        # Parse property types from request (JSON array)
-        try:
-            requested_types = json.loads(request.propertyTypes) if request.propertyTypes else []
-        except:
-            requested_types = []
+        requested_types = request.property_types
 
         if not requested_types:
             # No preference specified
@@ -255,7 +297,7 @@ class PropertyScorer:
     def _calculate_size_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate size match score"""
         score = 0.0
@@ -267,41 +309,41 @@ class PropertyScorer:
         prop_sqm = property.sqmCommercial
 
         # Check sqm range
-        if request.sqmMin and request.sqmMax:
-            if request.sqmMin <= prop_sqm <= request.sqmMax:
+        if request.sqm_min and request.sqm_max:
+            if request.sqm_min <= prop_sqm <= request.sqm_max:
                 score = 100
                 reasons["match"].append(
-                    f"Superficie ideale: {int(prop_sqm)}mq (richiesti: {int(request.sqmMin)}-{int(request.sqmMax)}mq)"
+                    f"Superficie ideale: {int(prop_sqm)}mq (richiesti: {int(request.sqm_min)}-{int(request.sqm_max)}mq)"
                 )
-            elif prop_sqm < request.sqmMin:
-                diff_percentage = ((request.sqmMin - prop_sqm) / request.sqmMin) * 100
+            elif prop_sqm < request.sqm_min:
+                diff_percentage = ((request.sqm_min - prop_sqm) / request.sqm_min) * 100
                 score = max(0, 100 - diff_percentage * 2)
                 reasons["mismatch"].append(
-                    f"Superficie ridotta: {int(prop_sqm)}mq (min: {int(request.sqmMin)}mq)"
+                    f"Superficie ridotta: {int(prop_sqm)}mq (min: {int(request.sqm_min)}mq)"
                 )
-            else:  # prop_sqm > request.sqmMax
-                diff_percentage = ((prop_sqm - request.sqmMax) / request.sqmMax) * 100
+            else:  # prop_sqm > request.sqm_max
+                diff_percentage = ((prop_sqm - request.sqm_max) / request.sqm_max) * 100
                 if diff_percentage <= 15:
                     score = 80
                     reasons["match"].append(
-                        f"Superficie generosa: {int(prop_sqm)}mq (max: {int(request.sqmMax)}mq)"
+                        f"Superficie generosa: {int(prop_sqm)}mq (max: {int(request.sqm_max)}mq)"
                     )
                 else:
                     score = max(0, 80 - diff_percentage)
                     reasons["mismatch"].append(
-                        f"Superficie eccessiva: {int(prop_sqm)}mq (max: {int(request.sqmMax)}mq)"
+                        f"Superficie eccessiva: {int(prop_sqm)}mq (max: {int(request.sqm_max)}mq)"
                     )
-        elif request.sqmMin:
-            if prop_sqm >= request.sqmMin:
+        elif request.sqm_min:
+            if prop_sqm >= request.sqm_min:
                 score = 100
                 reasons["match"].append(
-                    f"Superficie adeguata: {int(prop_sqm)}mq (min: {int(request.sqmMin)}mq)"
+                    f"Superficie adeguata: {int(prop_sqm)}mq (min: {int(request.sqm_min)}mq)"
                 )
             else:
-                diff_percentage = ((request.sqmMin - prop_sqm) / request.sqmMin) * 100
+                diff_percentage = ((request.sqm_min - prop_sqm) / request.sqm_min) * 100
                 score = max(0, 100 - diff_percentage * 2)
                 reasons["mismatch"].append(
-                    f"Superficie insufficiente: {int(prop_sqm)}mq (min: {int(request.sqmMin)}mq)"
+                    f"Superficie insufficiente: {int(prop_sqm)}mq (min: {int(request.sqm_min)}mq)"
                 )
         else:
             score = 50
@@ -312,16 +354,16 @@ class PropertyScorer:
     def _calculate_rooms_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate rooms match score"""
         score = 0.0
         reasons = {"match": [], "mismatch": []}
 
         # Rooms
-        if request.roomsMin and property.rooms:
-            if property.rooms >= request.roomsMin:
-                if request.roomsMax and property.rooms <= request.roomsMax:
+        if request.rooms_min and property.rooms:
+            if property.rooms >= request.rooms_min:
+                if request.rooms_max and property.rooms <= request.rooms_max:
                     score = 100
                     reasons["match"].append(
                         f"Numero locali perfetto: {property.rooms}"
@@ -329,12 +371,12 @@ class PropertyScorer:
                 else:
                     score = 80
                     reasons["match"].append(
-                        f"Abbastanza locali: {property.rooms} (min: {request.roomsMin})"
+                        f"Abbastanza locali: {property.rooms} (min: {request.rooms_min})"
                     )
             else:
-                score = max(0, (property.rooms / request.roomsMin) * 100)
+                score = max(0, (property.rooms / request.rooms_min) * 100)
                 reasons["mismatch"].append(
-                    f"Pochi locali: {property.rooms} (min: {request.roomsMin})"
+                    f"Pochi locali: {property.rooms} (min: {request.rooms_min})"
                 )
         elif property.rooms:
             score = 50
@@ -344,12 +386,12 @@ class PropertyScorer:
             reasons["match"].append("Numero locali non specificato")
 
         # Bedrooms (bonus)
-        if request.bedroomsMin and property.bedrooms:
-            if property.bedrooms >= request.bedroomsMin:
+        if request.bedrooms_min and property.bedrooms:
+            if property.bedrooms >= request.bedrooms_min:
                 reasons["match"].append(f"Camere sufficienti: {property.bedrooms}")
             else:
                 reasons["mismatch"].append(
-                    f"Poche camere: {property.bedrooms} (min: {request.bedroomsMin})"
+                    f"Poche camere: {property.bedrooms} (min: {request.bedrooms_min})"
                 )
 
         return min(score, 100), reasons
@@ -357,7 +399,7 @@ class PropertyScorer:
     def _calculate_features_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate features match score"""
         score = 100.0  # Start at 100, subtract for missing required features
@@ -366,7 +408,7 @@ class PropertyScorer:
         required_features = []
 
         # Check each required feature
-        if request.requiresElevator:
+        if request.requires_elevator:
             required_features.append("ascensore")
             if property.hasElevator:
                 reasons["match"].append("Ha ascensore (richiesto)")
@@ -374,7 +416,7 @@ class PropertyScorer:
                 score -= 25
                 reasons["mismatch"].append("Manca ascensore (richiesto)")
 
-        if request.requiresParking:
+        if request.requires_parking:
             required_features.append("posto auto")
             if property.hasParking or property.hasGarage:
                 reasons["match"].append("Ha posto auto/garage (richiesto)")
@@ -382,7 +424,7 @@ class PropertyScorer:
                 score -= 25
                 reasons["mismatch"].append("Manca posto auto (richiesto)")
 
-        if request.requiresGarden:
+        if request.requires_garden:
             required_features.append("giardino")
             if property.hasGarden:
                 reasons["match"].append("Ha giardino (richiesto)")
@@ -390,7 +432,7 @@ class PropertyScorer:
                 score -= 25
                 reasons["mismatch"].append("Manca giardino (richiesto)")
 
-        if request.requiresTerrace:
+        if request.requires_terrace:
             required_features.append("terrazzo")
             if property.hasTerrace:
                 reasons["match"].append("Ha terrazzo (richiesto)")
@@ -406,7 +448,7 @@ class PropertyScorer:
             bonus_features.append("cantina")
         if property.hasAlarm:
             bonus_features.append("allarme")
-        if property.furnished:
+        if getattr(property, "furnished", False):
             bonus_features.append("arredato")
 
         if bonus_features:
@@ -423,22 +465,14 @@ class PropertyScorer:
     def _calculate_condition_score(
         self,
         property: Property,
-        request: Request
+        request: RequestProfile
     ) -> Tuple[float, Dict[str, List[str]]]:
         """Calculate condition match score"""
         score = 50.0  # Neutral by default
         reasons = {"match": [], "mismatch": []}
 
         if property.condition:
-            condition_scores = {
-                "nuovo": 100,
-                "ottimo": 90,
-                "buono": 70,
-                "abitabile": 50,
-                "da ristrutturare": 30
-            }
-
-            score = condition_scores.get(property.condition.lower(), 50)
+            score = CONDITION_SCORES.get(property.condition.lower(), 50)
             reasons["match"].append(f"Condizioni: {property.condition}")
 
             # Add energy class info if available
@@ -447,31 +481,92 @@ class PropertyScorer:
 
         return score, reasons
 
+    def _score_upper_bound(self, property: Property, request: RequestProfile) -> float:
+        """
+        Best total score a property can reach for a request
+
+        Location (distance included), type and condition are exact; price,
+        size, rooms and features use the best score allowed by the fields
+        that are set. Cheap enough to run before calculate_match_score().
+        """
+        location = 60 if property.city and property.city.lower() in request.search_cities else 0
+        if property.zone and request.search_zones:
+            location += 40 if property.zone.lower() in request.search_zones else 0
+        elif property.zone:
+            location += 20
+
+        distance = self._distance_from_center(property, request)
+        if distance is not None:
+            location = max(location, distance_score(distance, request.search_radius_km))
+
+        if not request.property_types:
+            type_score = 50
+        else:
+            type_score = 100 if property.propertyType in request.property_types else 20
+
+        prop_price = (
+            property.priceSale
+            if request.contract_type == "sale"
+            else property.priceRentMonthly
+        )
+        if not prop_price:
+            price = 0
+        else:
+            price = 100 if request.price_max else 50
+
+        size = 100 if property.sqmCommercial and request.sqm_min else 50
+        rooms = 100 if request.rooms_min and property.rooms else 50
+        features = 100 if request.requires_features else 70
+
+        condition = (
+            CONDITION_SCORES.get(property.condition.lower(), 50)
+            if property.condition else 50
+        )
+
+        return (
+            min(location, 100) * self.weights.location_match +
+            price * self.weights.price_range +
+            type_score * self.weights.property_type +
+            size * self.weights.size_match +
+            rooms * self.weights.rooms_match +
+            features * self.weights.features_match +
+            condition * self.weights.condition_match
+        )
+
     def get_sorted_matches(
         self,
-        request: Request,
+        request: Union[Request, RequestProfile],
         properties: List[Property],
-        min_score: float = 0
+        min_score: float = 0,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         Return properties sorted by match score
 
         Args:
-            request: Request to match against
+            request: Request to match against (or its RequestProfile)
             properties: List of properties to score
             min_score: Minimum score threshold (0-100)
+            limit: Return only the best N matches (None = all). Keeps a
+                bounded heap and skips properties whose upper bound cannot
+                beat the current N-th score; same result as [:limit].
 
         Returns:
             List of dicts with property and score_data, sorted by score (descending)
         """
+        profile = RequestProfile.of(request)
+
+        if limit is not None:
+            return self._get_top_matches(profile, properties, min_score, limit)
+
         matches = []
 
         for property in properties:
             # Skip if wrong contract type
-            if request.contractType and property.contractType != request.contractType:
+            if profile.contract_type and property.contractType != profile.contract_type:
                 continue
 
-            score_data = self.calculate_match_score(property, request)
+            score_data = self.calculate_match_score(property, profile)
 
             if score_data["total_score"] >= min_score:
                 matches.append({
@@ -483,7 +578,110 @@ class PropertyScorer:
         matches.sort(key=lambda x: x["score_data"]["total_score"], reverse=True)
 
         logger.info(
-            f"Scored {len(properties)} properties for request {request.id}: "
+            f"Scored {len(properties)} properties for request {profile.id}: "
+            f"{len(matches)} matches above threshold {min_score}"
+        )
+
+        return matches
+
+    def _get_top_matches(
+        self,
+        request: RequestProfile,
+        properties: List[Property],
+        min_score: float,
+        limit: int
+    ) -> List[Dict]:
+        """Bounded top-K variant of get_sorted_matches()"""
+        if limit <= 0:
+            return []
+
+        # Bounds assume every component adds to the total
+        can_prune = min(self.weights.__dict__.values()) >= 0
+
+        # Min-heap of (total_score, -position, position, score_data): the root is
+        # the current K-th match; on equal scores the later property loses,
+        # as with the stable sort of get_sorted_matches()
+        heap = []
+        scored = 0
+
+        for position, property in enumerate(properties):
+            # Skip if wrong contract type
+            if request.contract_type and property.contractType != request.contract_type:
+                continue
+
+            if can_prune:
+                # round() is monotonic, so the rounded bound bounds the rounded total
+                bound = round(self._score_upper_bound(property, request), 2)
+                if bound < min_score or (len(heap) == limit and bound <= heap[0][0]):
+                    continue
+
+            score_data = self.calculate_match_score(property, request)
+            scored += 1
+            total = score_data["total_score"]
+
+            if total < min_score:
+                continue
+
+            entry = (total, -position, position, score_data)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+        matches = [
+            {"property": properties[position], "score_data": score_data}
+            for _, _, position, score_data in sorted(heap, key=lambda e: e[:2], reverse=True)
+        ]
+
+        logger.info(
+            f"Scored {scored}/{len(properties)} properties for request {request.id}: "
+            f"top {len(matches)} matches above threshold {min_score}"
+        )
+
+        return matches
+
+    def get_sorted_requests(
+        self,
+        property: Property,
+        requests: List[Request],
+        min_score: float = 0
+    ) -> List[Dict]:
+        """
+        Return requests sorted by how well the property matches them
+
+        Reverse of get_sorted_matches: same component scoring and
+        contract type rule, iterating over requests instead of properties.
+
+        Args:
+            property: Property to match
+            requests: List of requests to score against
+            min_score: Minimum score threshold (0-100)
+
+        Returns:
+            List of dicts with request and score_data, sorted by score (descending)
+        """
+        matches = []
+
+        for request in requests:
+            profile = RequestProfile.of(request)
+
+            # Skip if wrong contract type
+            if profile.contract_type and property.contractType != profile.contract_type:
+                continue
+
+            score_data = self.calculate_match_score(property, profile)
+
+            if score_data["total_score"] >= min_score:
+                matches.append({
+                    "request": request,
+                    "score_data": score_data
+                })
+
+        # Sort by score descending
+        matches.sort(key=lambda x: x["score_data"]["total_score"], reverse=True)
+
+        logger.info(
+            f"Scored property {property.id} against {len(requests)} requests: "
             f"{len(matches)} matches above threshold {min_score}"
         )
 
@@ -0,0 +1,187 @@
+"""
+Property Vector
+Compact snapshot of the Property fields read by PropertyScorer
+"""
+
+from typing import Dict, List, Optional, Sequence
+import logging
+import sys
+
+from sqlalchemy import null
+from sqlalchemy.orm import Session
+
+from app.models import Property
+
+logger = logging.getLogger(__name__)
+
+
+# Boolean Property columns packed into PropertyVector.features (bit i = flag i)
+FEATURE_FLAGS = (
+    "hasElevator",
+    "hasParking",
+    "hasGarage",
+    "hasGarden",
+    "hasTerrace",
+    "hasBalcony",
+    "hasCellar",
+    "hasAlarm",
+    "furnished",
+)
+
+# Property columns loaded for a vector (in query order)
+VECTOR_COLUMNS = (
+    "id",
+    "contractType",
+    "city",
+    "zone",
+    "propertyType",
+    "priceSale",
+    "priceRentMonthly",
+    "sqmCommercial",
+    "rooms",
+    "bedrooms",
+    "condition",
+    "energyClass",
+    "latitude",
+    "longitude",
+) + FEATURE_FLAGS
+
+# Distinct condition values, shared by all vectors (code 0 = no condition)
+_condition_values: List[Optional[str]] = [None]
+_condition_codes: Dict[str, int] = {}
+
+
+def _condition_code(condition: Optional[str]) -> int:
+    if not condition:
+        return 0
+    code = _condition_codes.get(condition)
+    if code is None:
+        code = _condition_codes[condition] = len(_condition_values)
+        _condition_values.append(condition)
+    return code
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share one copy of repeated strings (cities, zones, types)"""
+    return sys.intern(value) if value else value
+
+
+def _to_float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+class PropertyVector:
+    """
+    Slotted, read-only stand-in for a Property in the scoring loops
+
+    Exposes the same attribute names as Property for the fields the scorer
+    reads, so PropertyScorer and PropertyColumns.from_properties() accept
+    it as is. Feature flags are bits of one int, condition is a code into
+    a shared table and repeated strings are interned; numeric values are
+    floats (Decimal prices included).
+    """
+
+    __slots__ = (
+        "id",
+        "contractType",
+        "city",
+        "zone",
+        "propertyType",
+        "priceSale",
+        "priceRentMonthly",
+        "sqmCommercial",
+        "rooms",
+        "bedrooms",
+        "energyClass",
+        "latitude",
+        "longitude",
+        "features",
+        "condition_code",
+    )
+
+    def __init__(self, row: Sequence):
+        """
+        Args:
+            row: Tuple ordered as VECTOR_COLUMNS (see query_columns())
+        """
+        (
+            self.id,
+            contract_type,
+            city,
+            zone,
+            property_type,
+            price_sale,
+            price_rent,
+            sqm,
+            self.rooms,
+            self.bedrooms,
+            condition,
+            energy_class,
+            latitude,
+            longitude,
+        ) = row[:14]
+
+        self.contractType = _intern(contract_type)
+        self.city = _intern(city)
+        self.zone = _intern(zone)
+        self.propertyType = _intern(property_type)
+        self.energyClass = _intern(energy_class)
+        self.priceSale = _to_float(price_sale)
+        self.priceRentMonthly = _to_float(price_rent)
+        self.sqmCommercial = _to_float(sqm)
+        self.latitude = _to_float(latitude)
+        self.longitude = _to_float(longitude)
+        self.condition_code = _condition_code(condition)
+
+        features = 0
+        for bit, value in enumerate(row[14:]):
+            if value:
+                features |= 1 << bit
+        self.features = features
+
+    @property
+    def condition(self) -> Optional[str]:
+        return _condition_values[self.condition_code]
+
+    def __repr__(self) -> str:
+        return f"PropertyVector(id={self.id!r}, city={self.city!r})"
+
+    @classmethod
+    def from_property(cls, property: Property) -> "PropertyVector":
+        """Snapshot an already loaded ORM object"""
+        return cls(tuple(getattr(property, name, None) for name in VECTOR_COLUMNS))
+
+    @staticmethod
+    def query_columns() -> List:
+        """
+        Property column attributes for a column-only db.query(...)
+
+        Columns the model does not have yet (furnished) are selected as NULL.
+        """
+        return [
+            getattr(Property, name) if hasattr(Property, name) else null().label(name)
+            for name in VECTOR_COLUMNS
+        ]
+
+
+def _flag(bit: int) -> property:
+    return property(lambda self: bool(self.features >> bit & 1))
+
+
+for _bit, _name in enumerate(FEATURE_FLAGS):
+    setattr(PropertyVector, _name, _flag(_bit))
+
+
+def load_property_vectors(db: Session, *filters) -> List[PropertyVector]:
+    """
+    Load PropertyVectors with a column-only query (no ORM instances)
+
+    Args:
+        db: Database session
+        *filters: SQLAlchemy filter expressions on Property
+
+    Returns:
+        List of PropertyVector
+    """
+    rows = db.query(*PropertyVector.query_columns()).filter(*filters).all()
+    return [PropertyVector(row) for row in rows]
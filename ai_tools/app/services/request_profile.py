@@ -0,0 +1,179 @@
+"""
+Request Profile
+Pre-parsed, immutable view of the Request fields used by the scorers
+"""
+
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional, Union
+import json
+import logging
+import threading
+
+from app.models import Request
+from .geo_index import has_coordinates
+
+logger = logging.getLogger(__name__)
+
+
+# Compiled profiles kept in memory, keyed by (request.id, updatedAt)
+PROFILE_CACHE_SIZE = 4096
+
+
+def parse_json_list(raw) -> List:
+    """
+    Value of a JSON array column from Request, returning [] if invalid
+
+    ORM rows hold the decoded value (JSON columns); raw JSON text, as
+    read by plain SQL or older callers, is decoded here.
+    """
+    if isinstance(raw, (bytes, str)):
+        try:
+            return json.loads(raw) if raw else []
+        except ValueError:
+            return []
+    return raw if raw is not None else []
+
+
+def _string_set(raw, lowercase: bool = False) -> FrozenSet[str]:
+    """JSON array column -> frozenset of its strings (a bare JSON string counts as one)"""
+    values = parse_json_list(raw)
+    if isinstance(values, str):
+        values = [values]
+    elif not isinstance(values, list):
+        return frozenset()
+
+    return frozenset(
+        value.lower() if lowercase else value
+        for value in values
+        if isinstance(value, str)
+    )
+
+
+def _bound(value) -> Optional[float]:
+    """Numeric bound as float; NULL and 0 (no bound) become None"""
+    return float(value) if value else None
+
+
+class RequestProfile:
+    """
+    Compiled request: JSON arrays parsed once, bounds converted once
+
+    City and zone sets are lowercase (matching is case-insensitive); unset
+    or zero bounds are None, like the falsy checks of the scorers.
+    Profiles are immutable, so one instance can be shared by every
+    scoring call (and worker) for the same request version.
+    """
+
+    __slots__ = (
+        "id",
+        "contract_type",
+        "search_cities",
+        "search_zones",
+        "property_types",
+        "price_min",
+        "price_max",
+        "sqm_min",
+        "sqm_max",
+        "rooms_min",
+        "rooms_max",
+        "bedrooms_min",
+        "requires_elevator",
+        "requires_parking",
+        "requires_garden",
+        "requires_terrace",
+        "search_radius_km",
+        "center_latitude",
+        "center_longitude",
+    )
+
+    _cache: "OrderedDict[tuple, RequestProfile]" = OrderedDict()
+    # Guards _cache: routers score from threadpool threads
+    _cache_lock = threading.Lock()
+
+    def __init__(self, request: Request):
+        """
+        Args:
+            request: Request row (or any object with the same attributes)
+        """
+        radius_search = bool(request.searchRadiusKm) and has_coordinates(
+            request.centerLatitude, request.centerLongitude
+        )
+
+        values = {
+            "id": request.id,
+            "contract_type": request.contractType,
+            "search_cities": _string_set(request.searchCities, lowercase=True),
+            "search_zones": _string_set(request.searchZones, lowercase=True),
+            "property_types": _string_set(request.propertyTypes),
+            "price_min": _bound(request.priceMin),
+            "price_max": _bound(request.priceMax),
+            "sqm_min": _bound(request.sqmMin),
+            "sqm_max": _bound(request.sqmMax),
+            # Room counts stay integers (they appear as such in the reasons)
+            "rooms_min": request.roomsMin or None,
+            "rooms_max": request.roomsMax or None,
+            "bedrooms_min": request.bedroomsMin or None,
+            "requires_elevator": bool(request.requiresElevator),
+            "requires_parking": bool(request.requiresParking),
+            "requires_garden": bool(request.requiresGarden),
+            "requires_terrace": bool(request.requiresTerrace),
+            "search_radius_km": float(request.searchRadiusKm) if radius_search else None,
+            "center_latitude": float(request.centerLatitude) if radius_search else None,
+            "center_longitude": float(request.centerLongitude) if radius_search else None,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RequestProfile is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("RequestProfile is immutable")
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"RequestProfile(id={self.id!r}, contract_type={self.contract_type!r})"
+
+    @property
+    def requires_features(self) -> bool:
+        return (
+            self.requires_elevator or self.requires_parking or
+            self.requires_garden or self.requires_terrace
+        )
+
+    @classmethod
+    def of(cls, request: Union[Request, "RequestProfile"]) -> "RequestProfile":
+        """
+        Return the compiled profile of a request
+
+        Profiles of requests with an updatedAt are cached by
+        (request.id, updatedAt); a profile passed in is returned as is.
+        """
+        if isinstance(request, RequestProfile):
+            return request
+
+        updated_at = getattr(request, "updatedAt", None)
+        if updated_at is None:
+            return cls(request)
+
+        key = (request.id, updated_at)
+        with cls._cache_lock:
+            profile = cls._cache.get(key)
+            if profile is not None:
+                cls._cache.move_to_end(key)
+                return profile
+
+        # Compiled outside the lock: two threads may both build it, either is fine
+        profile = cls(request)
+        with cls._cache_lock:
+            cls._cache[key] = profile
+            if len(cls._cache) > PROFILE_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+        return profile
@@ -0,0 +1,113 @@
+"""
+Reverse Matching
+Find the active requests a single property fits
+"""
+
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import Text, or_, type_coerce
+from sqlalchemy.orm import Session
+
+from app.models import Property, Request, RequestCity
+from .batch_scorer import BatchPropertyScorer
+from .geo_index import has_coordinates
+from .market_stats import normalize_city
+
+logger = logging.getLogger(__name__)
+
+
+class ReverseMatcher:
+    """Score one property against every active request"""
+
+    def __init__(
+        self,
+        scorer: Optional[BatchPropertyScorer] = None,
+        price_tolerance: float = 0.10
+    ):
+        """
+        Args:
+            scorer: Scorer used for the match scores (default BatchPropertyScorer())
+            price_tolerance: Fraction above a request's priceMax still considered
+                (matches the "slightly over budget" band of the price score)
+        """
+        self.scorer = scorer or BatchPropertyScorer()
+        self.price_tolerance = price_tolerance
+
+    def candidate_requests_query(self, db: Session, property: Property):
+        """
+        Build the pre-filter query for requests the property could fit
+
+        Filters on status and contractType (indexed), on the property city
+        appearing in the request's cities (request_cities, indexed by city;
+        or no city preference, or a radius search when the property has
+        coordinates) and on the price band: requests whose priceMax is too
+        low to accept the property.
+        """
+        query = db.query(Request).filter(Request.status == "active")
+
+        if property.contractType:
+            query = query.filter(or_(
+                Request.contractType == property.contractType,
+                Request.contractType.is_(None)
+            ))
+
+        if property.city:
+            city_filters = [
+                # No city preference: SQL NULL, JSON null or an empty array
+                # (compared as stored text, not as a bound JSON value)
+                Request.searchCities.is_(None),
+                type_coerce(Request.searchCities, Text).in_(("null", "[]")),
+                # Cities match case-insensitively (see RequestProfile)
+                Request.id.in_(
+                    db.query(RequestCity.requestId)
+                    .filter(RequestCity.city == normalize_city(property.city))
+                ),
+            ]
+            # Radius searches can match by distance from their center
+            if has_coordinates(property.latitude, property.longitude):
+                city_filters.append(Request.searchRadiusKm > 0)
+            query = query.filter(or_(*city_filters))
+
+        price = (
+            property.priceSale
+            if property.contractType == "sale"
+            else property.priceRentMonthly
+        )
+        if price:
+            query = query.filter(or_(
+                Request.priceMax.is_(None),
+                Request.priceMax == 0,
+                Request.priceMax >= float(price) / (1 + self.price_tolerance)
+            ))
+
+        return query
+
+    def find_matching_requests(
+        self,
+        db: Session,
+        property: Property,
+        min_score: float = 0,
+        limit: Optional[int] = None
+    ) -> Dict:
+        """
+        Return the active requests best matched by a property
+
+        Args:
+            db: Database session
+            property: Property to match
+            min_score: Minimum score threshold (0-100)
+            limit: Maximum number of requests to return (None = all)
+
+        Returns:
+            {"candidates_evaluated": N, "matches": [{"request", "score_data"}, ...]}
+        """
+        requests = self.candidate_requests_query(db, property).all()
+        matches = self.scorer.get_sorted_requests_batch(
+            property, requests, min_score=min_score, limit=limit
+        )
+
+        return {
+            "candidates_evaluated": len(requests),
+            "matches": matches,
+        }
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.models import Property, Contact, Request, Match
+from app.services import property_load_options
 
 
 @tool
@@ -39,7 +40,7 @@ def query_properties_tool(
     """
     db: Session = SessionLocal()
     try:
-        query = db.query(Property)
+        query = db.query(Property).options(*property_load_options("card", "description"))
 
         # Apply filters
         if status:
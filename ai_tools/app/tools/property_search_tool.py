@@ -11,6 +11,7 @@ from sqlalchemy import and_, or_
 
 from app.database import SessionLocal
 from app.models import Property
+from app.services import property_load_options
 
 
 @tool
@@ -36,7 +37,9 @@ def property_search_tool(
         filters = _parse_search_query(search_query.lower())
 
         # Build query
-        query = db.query(Property).filter(Property.status == "available")
+        query = db.query(Property).options(*property_load_options("card", "description")).filter(
+            Property.status == "available"
+        )
 
         # Apply extracted filters
         if filters.get("city"):
@@ -0,0 +1,178 @@
+"""
+Keyset Pagination
+Opaque (createdAt, id) cursors and cached totals for the list endpoints
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import base64
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy import and_, func, or_, select, text, tuple_
+
+logger = logging.getLogger(__name__)
+
+
+# How a page counts its total: exact COUNT(*), COUNT(*) cached for
+# TOTALS_TTL_SECONDS, planner estimate (PostgreSQL, unfiltered lists only,
+# cached otherwise) or no total at all
+TOTAL_MODES = ("exact", "cached", "approximate", "none")
+TOTALS_TTL_SECONDS = 60
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: str) -> str:
+    """Opaque cursor pointing after the row (createdAt, id); createdAt may be None"""
+    stamp = created_at.isoformat() if created_at is not None else None
+    payload = json.dumps([stamp, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """
+    (createdAt, id) of a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if created_at is None:
+            return None, str(row_id)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class TotalsCache:
+    """Thread-safe TTL cache of list totals, keyed by list name and filters"""
+
+    def __init__(self, ttl_seconds: float = TOTALS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._totals: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._totals.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, total: int):
+        with self._lock:
+            self._totals[key] = (time.monotonic(), total)
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+
+
+totals_cache = TotalsCache()
+
+
+@dataclass
+class Page:
+    """One page of rows plus what the client needs to ask for the next"""
+
+    rows: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_exact: bool = False
+
+
+async def count_total(db, query, mode: str, cache_key: Hashable) -> Tuple[Optional[int], bool]:
+    """
+    Total rows of a list query according to a TOTAL_MODES mode
+
+    Returns:
+        (total or None, whether the total is an exact count)
+    """
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"Unknown total mode: {mode}")
+    if mode == "none":
+        return None, False
+
+    if mode == "approximate" and query.whereclause is None and db.bind.dialect.name == "postgresql":
+        table = query.get_final_froms()[0].name
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table}
+        )
+        # reltuples is -1 until the table is first analyzed
+        if estimate is not None and estimate >= 0:
+            return int(estimate), False
+
+    if mode != "exact":
+        cached = totals_cache.get(cache_key)
+        if cached is not None:
+            return cached, False
+
+    total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    totals_cache.set(cache_key, total)
+    return total, True
+
+
+async def paginate(
+    db,
+    query,
+    model,
+    page_size: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    total: Optional[str] = None,
+    cache_key: Hashable = None
+) -> Page:
+    """
+    Newest-first page of a select() on a model with createdAt and id
+
+    Without a cursor the page is read with OFFSET (page numbers keep
+    working); with a cursor it is read with a keyset condition on
+    (createdAt, id), which costs the same on every page. Both return the
+    cursor of the next page. Rows without a createdAt come last, by id.
+
+    Args:
+        db: AsyncSession
+        query: select(model) with the list filters
+        model: Model with createdAt and id columns
+        page_size: Rows per page
+        page: 1-indexed page number (ignored with a cursor)
+        cursor: next_cursor of the previous page
+        total: TOTAL_MODES mode (default: exact for pages, cached for cursors)
+        cache_key: Key of the list and its filters for cached totals
+
+    Raises:
+        ValueError: If the cursor or the total mode is invalid
+    """
+    position = decode_cursor(cursor) if cursor else None
+    total_mode = total or ("cached" if cursor else "exact")
+    count, count_exact = await count_total(db, query, total_mode, cache_key)
+
+    ordered = query.order_by(model.createdAt.desc().nulls_last(), model.id.desc())
+    if position:
+        created_at, row_id = position
+        if created_at is None:
+            ordered = ordered.where(and_(model.createdAt.is_(None), model.id < row_id))
+        else:
+            # A NULL createdAt never compares, the rows after a dated cursor include them
+            ordered = ordered.where(or_(
+                tuple_(model.createdAt, model.id) < tuple_(created_at, row_id),
+                model.createdAt.is_(None)
+            ))
+    else:
+        ordered = ordered.offset((page - 1) * page_size)
+
+    # One extra row tells whether there is a next page
+    rows = (await db.scalars(ordered.limit(page_size + 1))).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.createdAt, last.id)
+
+    return Page(rows=rows, next_cursor=next_cursor, total=count, total_exact=count_exact)
@@ -0,0 +1,4 @@
+"""
+CRM Immobiliare - Benchmarks
+Synthetic portfolios and performance measurements for the scoring path
+"""
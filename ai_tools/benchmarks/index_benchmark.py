@@ -0,0 +1,422 @@
+"""
+Index Benchmark
+Per-query timings of the hot filters as the Prisma migrations add their indexes
+
+Usage (from ai_tools/):
+    python -m benchmarks.index_benchmark --properties 500000 --output indexes.json
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.portfolio import PortfolioGenerator
+from benchmarks.scoring_benchmark import git_commit, percentile
+
+logger = logging.getLogger(__name__)
+
+
+MIGRATIONS_DIR = Path(__file__).parent.parent.parent / "database" / "prisma" / "migrations"
+
+# Phase before any migration index: tables plus their unique constraints,
+# i.e. what init_db() created from the models before they declared indexes
+BASELINE_PHASE = "unique_only"
+
+NOW = datetime(2025, 11, 1)
+SCRAPING_SOURCES = ["immobiliare_it", "casa_it", "idealista_it"]
+
+# (name, SQL, parameters) of the filters audited in the routers, agents and scraping
+HOT_QUERIES: List[Tuple[str, str, Tuple]] = [
+    (
+        "scoring_index_signature",
+        'SELECT COUNT(*), MAX("updatedAt") FROM "properties" WHERE "status" = ? AND "contractType" = ?',
+        ("available", "rent"),
+    ),
+    (
+        "properties_by_status",
+        'SELECT "id" FROM "properties" WHERE "status" = ? LIMIT 20',
+        ("option",),
+    ),
+    (
+        "stale_properties",
+        'SELECT COUNT(*) FROM "properties" WHERE "status" = ? AND "createdAt" < ?',
+        ("available", str(NOW - timedelta(days=60))),
+    ),
+    (
+        "properties_changed_since",
+        'SELECT "id" FROM "properties" WHERE "updatedAt" > ?',
+        (str(NOW - timedelta(hours=1)),),
+    ),
+    (
+        "dedup_by_source_url",
+        'SELECT "id" FROM "properties" WHERE "sourceUrl" = ? LIMIT 1',
+        ("https://www.immobiliare.it/annunci/bench-not-found/",),
+    ),
+    (
+        "dedup_by_content_hash",
+        'SELECT "id" FROM "properties" WHERE "source" = ? AND "contentHash" = ? LIMIT 1',
+        ("casa_it", "0123456789abcdef"),
+    ),
+    (
+        "scraped_properties_page",
+        'SELECT "id", "title", "city" FROM "properties" WHERE "source" = ? '
+        'ORDER BY "createdAt" DESC LIMIT 20 OFFSET 100',
+        ("casa_it",),
+    ),
+    (
+        "scraped_properties_count",
+        'SELECT COUNT(*) FROM "properties" WHERE "source" = ?',
+        ("casa_it",),
+    ),
+    (
+        "urgent_requests",
+        'SELECT COUNT(*) FROM "requests" WHERE "status" = ? AND "urgency" = ?',
+        ("active", "high"),
+    ),
+    (
+        "requests_changed_since",
+        'SELECT "id" FROM "requests" WHERE "updatedAt" > ?',
+        (str(NOW - timedelta(hours=1)),),
+    ),
+    (
+        "high_score_matches",
+        'SELECT COUNT(*) FROM "matches" WHERE "scoreTotal" >= ? AND "status" = ?',
+        (80, "suggested"),
+    ),
+    (
+        "upcoming_activities",
+        'SELECT "id" FROM "activities" WHERE "status" IN (?, ?) AND "scheduledAt" >= ? AND "scheduledAt" <= ? '
+        'ORDER BY "scheduledAt" LIMIT 20',
+        ("scheduled", "in_progress", str(NOW), str(NOW + timedelta(days=7))),
+    ),
+    (
+        "overdue_activities",
+        'SELECT "id" FROM "activities" WHERE "status" IN (?, ?) AND "dueDate" < ? LIMIT 10',
+        ("scheduled", "in_progress", str(NOW - timedelta(days=30))),
+    ),
+    (
+        "audit_deletes_since",
+        'SELECT "entityType", "entityId" FROM "audit_logs" WHERE "entityType" IN (?, ?) AND "createdAt" > ?',
+        ("Property", "Request", str(NOW - timedelta(hours=1))),
+    ),
+    (
+        "conversations_by_status",
+        'SELECT "id" FROM "agent_conversations" WHERE "status" = ? ORDER BY "createdAt" DESC LIMIT 20',
+        ("failed",),
+    ),
+    (
+        "scraping_session_by_portal",
+        'SELECT "id" FROM "scraping_sessions" WHERE "portal" = ?',
+        ("casa_it",),
+    ),
+]
+
+
+def split_statements(sql: str) -> List[str]:
+    """SQL statements of a migration file (comment lines dropped, triggers kept whole)"""
+    statements = []
+    buffer = ""
+    for line in sql.splitlines():
+        if line.strip().startswith("--"):
+            continue
+        buffer += line + "\n"
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip().rstrip(";").strip())
+            buffer = ""
+
+    if buffer.strip():
+        statements.append(buffer.strip().rstrip(";").strip())
+    return [statement for statement in statements if statement]
+
+
+def load_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> List[Tuple[str, List[str]]]:
+    """(name, statements) of every Prisma migration, oldest first"""
+    return [
+        (path.parent.name, split_statements(path.read_text(encoding="utf-8")))
+        for path in sorted(migrations_dir.glob("*/migration.sql"))
+    ]
+
+
+def _is_index(statement: str) -> bool:
+    return re.match(r"CREATE\s+INDEX", statement, re.IGNORECASE) is not None
+
+
+def create_schema(connection: sqlite3.Connection, migrations: List[Tuple[str, List[str]]]):
+    """Apply every migration except its non-unique indexes"""
+    for _, statements in migrations:
+        for statement in statements:
+            if not _is_index(statement):
+                connection.execute(statement)
+    connection.commit()
+
+
+def create_indexes(connection: sqlite3.Connection, statements: Sequence[str]) -> int:
+    """Apply the non-unique indexes of one migration, returning how many"""
+    indexes = [statement for statement in statements if _is_index(statement)]
+    for statement in indexes:
+        connection.execute(statement)
+    connection.commit()
+    return len(indexes)
+
+
+def _required_defaults(connection: sqlite3.Connection, table: str) -> Dict:
+    """Placeholder values for NOT NULL columns without a default"""
+    placeholders = {"TEXT": "", "INTEGER": 0, "REAL": 0.0, "BOOLEAN": 0, "DATETIME": str(NOW), "JSONB": "{}"}
+    return {
+        name: placeholders.get(column_type.upper(), "")
+        for _, name, column_type, not_null, default, _ in connection.execute(f'PRAGMA table_info("{table}")')
+        if not_null and default is None
+    }
+
+
+def _insert(connection: sqlite3.Connection, table: str, rows: Iterator[Dict], batch_size: int = 10_000) -> int:
+    """Insert dict rows (missing required columns get placeholders)"""
+    defaults = _required_defaults(connection, table)
+    columns = set(row[1] for row in connection.execute(f'PRAGMA table_info("{table}")'))
+    count = 0
+    batch: List[Dict] = []
+    statement = None
+
+    def flush():
+        connection.executemany(statement, [tuple(row[key] for key in keys) for row in batch])
+
+    for row in rows:
+        row = {**defaults, **{key: value for key, value in row.items() if key in columns}}
+        if statement is None:
+            keys = list(row)
+            statement = 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+                table, ", ".join(f'"{key}"' for key in keys), ", ".join("?" * len(keys))
+            )
+        batch.append(row)
+        count += 1
+        if len(batch) == batch_size:
+            flush()
+            batch = []
+
+    if batch:
+        flush()
+    connection.commit()
+    return count
+
+
+def populate(connection: sqlite3.Connection, property_count: int, seed: int = 42) -> Dict[str, int]:
+    """
+    Fill the audited tables with a synthetic portfolio
+
+    Requests, matches, activities, audit logs and conversations scale with
+    the number of properties; updates are spread over the last two years.
+    """
+    generator = PortfolioGenerator(seed=seed)
+    rng = random.Random(seed)
+
+    def timestamp(max_days: int = 730) -> datetime:
+        return NOW - timedelta(seconds=rng.randint(0, max_days * 86400))
+
+    def properties() -> Iterator[Dict]:
+        for row in generator.iter_properties(property_count):
+            created = timestamp()
+            source = rng.choice(SCRAPING_SOURCES) if rng.random() < 0.7 else "direct_mandate"
+            scraped = source != "direct_mandate"
+            yield {
+                **row,
+                "street": "Via Roma",
+                "province": row["city"][:2].upper(),
+                "latitude": row["latitude"] or 0.0,
+                "longitude": row["longitude"] or 0.0,
+                "source": source,
+                "sourceUrl": f"https://www.{source.replace('_', '.')}/annunci/{row['id']}/" if scraped else None,
+                "contentHash": hashlib.sha256(row["id"].encode()).hexdigest()[:16] if scraped else None,
+                "createdAt": str(created),
+                "updatedAt": str(created + (NOW - created) * rng.random()),
+            }
+
+    def requests() -> Iterator[Dict]:
+        for row in generator.iter_requests(max(1, property_count // 10)):
+            yield {**row, "status": rng.choice(["active", "active", "paused", "satisfied"]), "updatedAt": str(timestamp())}
+
+    def matches() -> Iterator[Dict]:
+        for index in range(property_count):
+            yield {
+                "id": f"bench_match_{index:07d}",
+                "requestId": f"bench_req_{rng.randrange(max(1, property_count // 10)):07d}",
+                "propertyId": f"bench_prop_{rng.randrange(property_count):07d}",
+                "scoreTotal": rng.randint(40, 100),
+                "status": rng.choice(["suggested", "sent", "viewed", "rejected", "closed"]),
+                "updatedAt": str(timestamp()),
+            }
+
+    def activities() -> Iterator[Dict]:
+        for index in range(max(1, property_count // 5)):
+            scheduled = timestamp() + timedelta(days=60)
+            yield {
+                "id": f"bench_act_{index:07d}",
+                "activityType": rng.choice(["call", "visit", "email", "meeting"]),
+                "title": "Attività",
+                "status": rng.choice(["scheduled", "completed", "completed", "completed", "cancelled"]),
+                "scheduledAt": str(scheduled),
+                "dueDate": str(scheduled + timedelta(days=3)),
+                "updatedAt": str(scheduled),
+            }
+
+    def audit_logs() -> Iterator[Dict]:
+        for index in range(max(1, property_count // 5)):
+            yield {
+                "id": f"bench_audit_{index:07d}",
+                "entityType": rng.choice(["Property", "Request", "Contact", "Activity"]),
+                "entityId": f"bench_entity_{index:07d}",
+                "action": rng.choice(["create", "update", "delete"]),
+                "createdAt": str(timestamp()),
+            }
+
+    def conversations() -> Iterator[Dict]:
+        for index in range(max(1, property_count // 25)):
+            yield {
+                "id": f"bench_conv_{index:07d}",
+                "userPrompt": "Cerca trilocali a Milano",
+                "status": rng.choice(["completed", "completed", "completed", "failed", "running"]),
+                "createdAt": str(timestamp()),
+                "updatedAt": str(NOW),
+            }
+
+    def sessions() -> Iterator[Dict]:
+        for index, portal in enumerate(SCRAPING_SOURCES):
+            yield {"id": f"bench_session_{index}", "portal": portal, "userAgent": "bench", "cookies": "{}"}
+
+    return {
+        "properties": _insert(connection, "properties", properties()),
+        "requests": _insert(connection, "requests", requests()),
+        "matches": _insert(connection, "matches", matches()),
+        "activities": _insert(connection, "activities", activities()),
+        "audit_logs": _insert(connection, "audit_logs", audit_logs()),
+        "agent_conversations": _insert(connection, "agent_conversations", conversations()),
+        "scraping_sessions": _insert(connection, "scraping_sessions", sessions()),
+    }
+
+
+def time_queries(connection: sqlite3.Connection, repeat: int = 10) -> Dict[str, Dict]:
+    """p50/mean latency (ms) and query plan of every hot query"""
+    results = {}
+    for name, sql, params in HOT_QUERIES:
+        plan = " | ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        connection.execute(sql, params).fetchall()  # warm the page cache
+
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            connection.execute(sql, params).fetchall()
+            latencies.append(time.perf_counter() - start)
+
+        results[name] = {
+            "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 4),
+            "plan": plan,
+        }
+    return results
+
+
+def run_benchmark(
+    property_count: int = 500_000,
+    repeat: int = 10,
+    seed: int = 42,
+    database_path: Optional[Path] = None,
+) -> Dict:
+    """
+    Time the hot queries after each migration's indexes
+
+    Args:
+        property_count: Properties in the synthetic database
+        repeat: Timed runs per query and phase
+        seed: Portfolio seed
+        database_path: SQLite file to build (default: a temporary file)
+
+    Returns:
+        Results dict (JSON serializable)
+    """
+    database_path = database_path or Path(tempfile.mkdtemp(prefix="index-bench-")) / "bench.db"
+    migrations = load_migrations()
+
+    connection = sqlite3.connect(database_path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+
+    try:
+        create_schema(connection, migrations)
+        start = time.perf_counter()
+        rows = populate(connection, property_count, seed=seed)
+        logger.info(f"Populated {database_path} in {time.perf_counter() - start:.1f}s: {rows}")
+
+        phases = [{"phase": BASELINE_PHASE, "indexes_created": 0, "queries": time_queries(connection, repeat)}]
+        for name, statements in migrations:
+            start = time.perf_counter()
+            created = create_indexes(connection, statements)
+            build_seconds = time.perf_counter() - start
+            logger.info(f"{name}: {created} indexes in {build_seconds:.1f}s")
+            phases.append({
+                "phase": name,
+                "indexes_created": created,
+                "build_seconds": round(build_seconds, 2),
+                "queries": time_queries(connection, repeat),
+            })
+    finally:
+        connection.close()
+
+    return {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": seed,
+        "rows": rows,
+        "phases": phases,
+    }
+
+
+def format_results(results: Dict) -> List[str]:
+    """Table of p50 latency per query and phase, with the speedup over the first phase"""
+    phases = results["phases"]
+    header = f"{'query':<28}" + "".join(f"{phase['phase'][:28]:>30}" for phase in phases) + f"{'speedup':>10}"
+    lines = [header]
+
+    for name, _, _ in HOT_QUERIES:
+        timings = [phase["queries"][name]["p50_ms"] for phase in phases]
+        speedup = timings[0] / timings[-1] if timings[-1] else float("inf")
+        lines.append(
+            f"{name:<28}" + "".join(f"{timing:>28.3f}ms" for timing in timings) + f"{speedup:>9.1f}x"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot queries before/after the migration indexes")
+    parser.add_argument("--properties", type=int, default=500_000, help="Properties in the synthetic database")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query and phase")
+    parser.add_argument("--seed", type=int, default=42, help="Portfolio seed")
+    parser.add_argument("--database", type=Path, default=None, help="SQLite file to build (must not exist)")
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default: indexes-<commit>.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.database and args.database.exists():
+        parser.error(f"{args.database} already exists")
+
+    results = run_benchmark(args.properties, repeat=args.repeat, seed=args.seed, database_path=args.database)
+
+    output = args.output or Path(f"indexes-{results['git_commit'] or 'local'}.json")
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    logger.info(f"Results saved to {output}")
+
+    for line in format_results(results):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
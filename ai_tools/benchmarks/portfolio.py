@@ -0,0 +1,240 @@
+"""
+Synthetic Portfolio Generator
+Deterministic Property/Request rows with realistic Italian market distributions
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import json
+import logging
+import math
+import random
+
+logger = logging.getLogger(__name__)
+
+
+ZONE_STATS_PATH = Path(__file__).parent.parent.parent / "data" / "zone-stats.json"
+
+# Main markets: center coordinates, zones (most expensive first),
+# sale €/sqm, rent €/sqm per month, share of the portfolio
+CITY_MARKETS = [
+    {
+        "city": "Milano", "lat": 45.4642, "lon": 9.1900, "sale_sqm": 5200, "rent_sqm": 22, "weight": 30,
+        "zones": ["Brera", "Centro Storico", "Porta Romana", "Isola", "Navigli", "Città Studi", "Lorenteggio", "Bicocca"],
+    },
+    {
+        "city": "Roma", "lat": 41.9028, "lon": 12.4964, "sale_sqm": 3600, "rent_sqm": 16, "weight": 28,
+        "zones": ["Parioli", "Centro Storico", "Prati", "Trastevere", "Monteverde", "EUR", "San Giovanni", "Tuscolano"],
+    },
+    {
+        "city": "Torino", "lat": 45.0703, "lon": 7.6869, "sale_sqm": 2000, "rent_sqm": 10, "weight": 12,
+        "zones": ["Crocetta", "Centro", "Borgo Po", "San Salvario", "Vanchiglia", "Santa Rita"],
+    },
+    {
+        "city": "Napoli", "lat": 40.8518, "lon": 14.2681, "sale_sqm": 2600, "rent_sqm": 12, "weight": 10,
+        "zones": ["Posillipo", "Chiaia", "Vomero", "Arenella", "Centro Storico", "Fuorigrotta"],
+    },
+    {
+        "city": "Bologna", "lat": 44.4949, "lon": 11.3426, "sale_sqm": 3600, "rent_sqm": 16, "weight": 8,
+        "zones": ["Santo Stefano", "Centro Storico", "Saragozza", "San Donato", "Navile"],
+    },
+    {
+        "city": "Firenze", "lat": 43.7696, "lon": 11.2558, "sale_sqm": 4200, "rent_sqm": 19, "weight": 8,
+        "zones": ["Centro Storico", "Oltrarno", "Campo di Marte", "Rifredi", "Novoli"],
+    },
+]
+
+# Comuni of data/zone-stats.json (Milan hinterland): coordinates and prices
+HINTERLAND_COORDINATES = {
+    "Albairate": (45.4195, 8.9353),
+    "Cassinetta di Lugagnano": (45.4233, 8.9064),
+    "Cisliano": (45.4446, 8.9888),
+    "Corbetta": (45.4685, 8.9186),
+    "Vittuone": (45.4882, 8.9513),
+}
+HINTERLAND_SALE_SQM = 2300
+HINTERLAND_RENT_SQM = 10
+
+PROPERTY_TYPES = {"apartment": 70, "house": 10, "villa": 8, "attic": 4, "loft": 4, "office": 4}
+CONDITIONS = {"nuovo": 10, "ottimo": 25, "buono": 35, "abitabile": 18, "da ristrutturare": 12}
+ENERGY_CLASSES = ["A4", "A3", "A2", "A1", "B", "C", "D", "E", "F", "G"]
+URGENCIES = ["low", "medium", "high"]
+
+
+def load_markets(zone_stats_path: Path = ZONE_STATS_PATH) -> List[Dict]:
+    """
+    Main city markets plus the comuni and zones of zone-stats.json
+
+    Comuni are weighted by their property count; a missing or invalid
+    file just leaves the main markets.
+    """
+    markets = [dict(market) for market in CITY_MARKETS]
+
+    try:
+        stats = json.loads(Path(zone_stats_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Zone stats not loaded ({e}), using main markets only")
+        return markets
+
+    for comune in stats.get("comuni", []):
+        name = comune.get("comune")
+        if not name:
+            continue
+        lat, lon = HINTERLAND_COORDINATES.get(name, (CITY_MARKETS[0]["lat"], CITY_MARKETS[0]["lon"]))
+        markets.append({
+            "city": name,
+            "lat": lat,
+            "lon": lon,
+            "sale_sqm": HINTERLAND_SALE_SQM,
+            "rent_sqm": HINTERLAND_RENT_SQM,
+            "weight": max(1, comune.get("totalProperties", 1)),
+            "zones": [zone["zone"] for zone in comune.get("zones", []) if zone.get("zone")],
+        })
+
+    return markets
+
+
+class PortfolioGenerator:
+    """
+    Deterministic generator of Property and Request rows
+
+    Rows are dicts of Property/Request column values, generated lazily so
+    that million-row portfolios can be streamed into a database or into
+    scoring snapshots without holding every dict in memory.
+    """
+
+    def __init__(self, seed: int = 42, zone_stats_path: Path = ZONE_STATS_PATH):
+        """
+        Args:
+            seed: Random seed (same seed, same portfolio)
+            zone_stats_path: zone-stats.json with the hinterland comuni
+        """
+        self.seed = seed
+        self.markets = load_markets(zone_stats_path)
+        self._market_weights = [market["weight"] for market in self.markets]
+
+    def _market(self, rng: random.Random) -> Dict:
+        return rng.choices(self.markets, weights=self._market_weights)[0]
+
+    @staticmethod
+    def _zone_factor(market: Dict, zone: Optional[str]) -> float:
+        """Price multiplier of a zone: 1.3 for the first listed, down to 0.8"""
+        zones = market["zones"]
+        if not zone or len(zones) < 2:
+            return 1.0
+        return 1.3 - 0.5 * zones.index(zone) / (len(zones) - 1)
+
+    @staticmethod
+    def _sqm(rng: random.Random, property_type: str) -> float:
+        median = {"villa": 180, "house": 130, "office": 110}.get(property_type, 80)
+        return round(min(600, max(20, rng.lognormvariate(math.log(median), 0.35))), 1)
+
+    def iter_properties(self, count: int, start: int = 0) -> Iterator[Dict]:
+        """
+        Yield `count` Property rows
+
+        Args:
+            count: Number of rows
+            start: Index of the first row (ids are bench_prop_<index>)
+        """
+        rng = random.Random(f"{self.seed}:properties:{start}")
+        types, type_weights = list(PROPERTY_TYPES), list(PROPERTY_TYPES.values())
+        conditions, condition_weights = list(CONDITIONS), list(CONDITIONS.values())
+
+        for index in range(start, start + count):
+            market = self._market(rng)
+            zone = rng.choice(market["zones"]) if market["zones"] and rng.random() > 0.1 else None
+            property_type = rng.choices(types, weights=type_weights)[0]
+            contract_type = "sale" if rng.random() < 0.75 else "rent"
+
+            sqm = self._sqm(rng, property_type)
+            noise = rng.lognormvariate(0, 0.2)
+            factor = self._zone_factor(market, zone) * noise
+            price_sale = round(market["sale_sqm"] * factor * sqm, -3) if contract_type == "sale" else None
+            price_rent = round(market["rent_sqm"] * factor * sqm, -1) if contract_type == "rent" else None
+
+            rooms = max(1, min(8, round(sqm / 28 + rng.uniform(-0.6, 0.6))))
+            located = rng.random() > 0.05
+
+            yield {
+                "id": f"bench_prop_{index:07d}",
+                "code": f"BENCH-P-{index:07d}",
+                "status": "available" if rng.random() < 0.9 else rng.choice(["sold", "rented", "option"]),
+                "contractType": contract_type,
+                "city": market["city"],
+                "zone": zone,
+                "propertyType": property_type,
+                "title": f"{property_type} {sqm:g}mq - {market['city']}",
+                "priceSale": price_sale,
+                "priceRentMonthly": price_rent,
+                "sqmCommercial": sqm,
+                "rooms": rooms,
+                "bedrooms": max(1, rooms - 1),
+                "bathrooms": 1 if sqm < 90 else 2,
+                "hasElevator": rng.random() < 0.6,
+                "hasParking": rng.random() < 0.3,
+                "hasGarage": rng.random() < 0.25,
+                "hasGarden": rng.random() < (0.7 if property_type in ("villa", "house") else 0.1),
+                "hasTerrace": rng.random() < 0.3,
+                "hasBalcony": rng.random() < 0.55,
+                "hasCellar": rng.random() < 0.4,
+                "hasAlarm": rng.random() < 0.15,
+                "furnished": rng.random() < (0.6 if contract_type == "rent" else 0.1),
+                "condition": rng.choices(conditions, weights=condition_weights)[0],
+                "energyClass": rng.choice(ENERGY_CLASSES),
+                "latitude": round(rng.gauss(market["lat"], 0.03), 6) if located else None,
+                "longitude": round(rng.gauss(market["lon"], 0.04), 6) if located else None,
+            }
+
+    def iter_requests(self, count: int, start: int = 0) -> Iterator[Dict]:
+        """
+        Yield `count` active Request rows
+
+        Args:
+            count: Number of rows
+            start: Index of the first row (ids are bench_req_<index>)
+        """
+        rng = random.Random(f"{self.seed}:requests:{start}")
+        types = list(PROPERTY_TYPES)
+
+        for index in range(start, start + count):
+            market = self._market(rng)
+            contract_type = "sale" if rng.random() < 0.75 else "rent"
+
+            cities = [market["city"]]
+            if rng.random() < 0.2:
+                cities.append(self._market(rng)["city"])
+            zones = rng.sample(market["zones"], k=min(len(market["zones"]), rng.randint(1, 2))) \
+                if market["zones"] and rng.random() < 0.5 else []
+
+            target_sqm = self._sqm(rng, "apartment")
+            price_sqm = market["sale_sqm"] if contract_type == "sale" else market["rent_sqm"]
+            price_max = round(price_sqm * target_sqm * rng.uniform(0.8, 1.3), -3 if contract_type == "sale" else -1)
+
+            radius_search = rng.random() < 0.15
+
+            yield {
+                "id": f"bench_req_{index:07d}",
+                "code": f"BENCH-R-{index:07d}",
+                "contactId": f"bench_contact_{index:07d}",
+                "status": "active",
+                "urgency": rng.choice(URGENCIES),
+                "contractType": contract_type,
+                "searchCities": json.dumps(sorted(set(cities))),
+                "searchZones": json.dumps(zones),
+                "propertyTypes": json.dumps(rng.sample(types, k=rng.randint(1, 2))) if rng.random() < 0.7 else None,
+                "priceMin": round(price_max * 0.7, -1) if rng.random() < 0.6 else None,
+                "priceMax": price_max,
+                "sqmMin": round(target_sqm * 0.85),
+                "sqmMax": round(target_sqm * 1.3) if rng.random() < 0.5 else None,
+                "roomsMin": max(1, round(target_sqm / 30)) if rng.random() < 0.7 else None,
+                "roomsMax": None,
+                "bedroomsMin": None,
+                "requiresElevator": rng.random() < 0.3,
+                "requiresParking": rng.random() < 0.25,
+                "requiresGarden": rng.random() < 0.1,
+                "requiresTerrace": rng.random() < 0.1,
+                "searchRadiusKm": round(rng.uniform(2, 10), 1) if radius_search else None,
+                "centerLatitude": round(rng.gauss(market["lat"], 0.02), 6) if radius_search else None,
+                "centerLongitude": round(rng.gauss(market["lon"], 0.02), 6) if radius_search else None,
+            }
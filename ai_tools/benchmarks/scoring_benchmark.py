@@ -0,0 +1,352 @@
+"""
+Scoring Benchmark
+Latency, throughput and peak memory of the scoring path on synthetic portfolios
+
+Usage (from ai_tools/):
+    python -m benchmarks.scoring_benchmark --sizes 1000 10000 --output bench.json
+    python -m benchmarks.scoring_benchmark --endpoint --compare previous.json
+"""
+
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.portfolio import PortfolioGenerator
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Fixed updatedAt of the synthetic requests, so RequestProfiles are cached
+# like they are for ORM rows
+REQUEST_UPDATED_AT = datetime(2025, 1, 1)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], pairs: int) -> Dict:
+    """
+    Latency percentiles (ms) and throughput of a list of call durations (s)
+
+    Args:
+        latencies: Duration of each call in seconds
+        pairs: Property-request pairs scored by all the calls
+    """
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "pairs": pairs,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 4),
+        "mean_ms": round(total / len(latencies) * 1000, 4),
+        "pairs_per_second": round(pairs / total, 1) if total else None,
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(call: Callable) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+def bench_calculate_match_score(scorer, properties: List, requests: List, samples: int, seed: int) -> Dict:
+    """Single-pair latency of PropertyScorer.calculate_match_score"""
+    rng = random.Random(seed)
+    pairs = [(rng.choice(properties), rng.choice(requests)) for _ in range(samples)]
+
+    latencies = [
+        _timed(lambda: scorer.calculate_match_score(prop, request))
+        for prop, request in pairs
+    ]
+    return summarize(latencies, len(pairs))
+
+
+def bench_get_sorted_matches(scorer, properties: List, requests: List, limit: Optional[int] = None) -> Dict:
+    """Latency of one get_sorted_matches call over the whole portfolio"""
+    latencies = [
+        _timed(lambda: scorer.get_sorted_matches(request, properties, min_score=60, limit=limit))
+        for request in requests
+    ]
+    return summarize(latencies, len(properties) * len(requests))
+
+
+def bench_batch_rank(scorer, columns, requests: List, limit: int = 10) -> Dict:
+    """Latency of the vectorized BatchPropertyScorer.rank over the portfolio"""
+    latencies = [
+        _timed(lambda: scorer.rank(request, columns, min_score=60, limit=limit))
+        for request in requests
+    ]
+    return summarize(latencies, len(columns) * len(requests))
+
+
+def bench_endpoint(generator: PortfolioGenerator, size: int, requests: List[Dict], available: int) -> Dict:
+    """
+    POST /api/scoring/calculate end to end on a SQLite copy of the portfolio
+
+    Pairs are counted as available properties x requests, like the other
+    benchmarks (the endpoint also filters on contract type).
+    The database is the one of DATABASE_URL, pointed to a scratch file by main().
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete, insert
+
+    from app.database import SessionLocal, engine
+    from app.models import Base, Property, Request
+    from app.routers import scoring
+
+    Base.metadata.create_all(engine, tables=[Property.__table__, Request.__table__])
+    property_columns = set(Property.__table__.columns.keys())
+    request_columns = set(Request.__table__.columns.keys())
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(Property))
+        db.execute(delete(Request))
+
+        batch = []
+        for row in generator.iter_properties(size):
+            batch.append({key: value for key, value in row.items() if key in property_columns})
+            if len(batch) == 10_000:
+                db.execute(insert(Property), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Property), batch)
+
+        db.execute(insert(Request), [
+            {key: value for key, value in row.items() if key in request_columns}
+            for row in requests
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    app = FastAPI()
+    app.include_router(scoring.router, prefix="/api/scoring")
+    client = TestClient(app)
+
+    latencies = []
+    for row in requests:
+        start = time.perf_counter()
+        response = client.post("/api/scoring/calculate", json={
+            "request_id": row["id"], "min_score": 60, "limit": 10
+        })
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+    stats = summarize(latencies, available * len(requests))
+    # The first call also builds the candidate index
+    stats["first_call_ms"] = round(latencies[0] * 1000, 4)
+    return stats
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    request_count: int = 20,
+    pair_samples: int = 5_000,
+    pair_budget: int = 5_000_000,
+    endpoint_max_size: Optional[int] = None,
+    seed: int = 42
+) -> Dict:
+    """
+    Run every benchmark for each portfolio size
+
+    Args:
+        sizes: Property counts to benchmark (ascending keeps peak RSS meaningful)
+        request_count: Requests in the synthetic portfolio
+        pair_samples: Pairs timed for calculate_match_score
+        pair_budget: Max pairs per whole-portfolio benchmark (fewer requests for big sizes)
+        endpoint_max_size: Also benchmark the endpoint up to this size (None = skip)
+        seed: Portfolio seed
+
+    Returns:
+        Results dict (JSON serializable)
+    """
+    from app.services import BatchPropertyScorer, PropertyColumns, PropertyScorer, PropertyVector
+    from app.services.property_vector import VECTOR_COLUMNS
+
+    generator = PortfolioGenerator(seed=seed)
+    request_rows = list(generator.iter_requests(request_count))
+    requests = [SimpleNamespace(updatedAt=REQUEST_UPDATED_AT, **row) for row in request_rows]
+
+    scorer = PropertyScorer()
+    batch_scorer = BatchPropertyScorer()
+
+    results = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "requests": request_count,
+        "sizes": [],
+    }
+
+    for size in sizes:
+        logger.info(f"Benchmarking {size} properties...")
+        gc.collect()
+
+        start = time.perf_counter()
+        properties = [
+            PropertyVector(tuple(row.get(name) for name in VECTOR_COLUMNS))
+            for row in generator.iter_properties(size)
+            if row["status"] == "available"
+        ]
+        columns = PropertyColumns.from_properties(properties)
+        setup_seconds = time.perf_counter() - start
+
+        # Whole-portfolio benchmarks use fewer requests on big portfolios
+        portfolio_requests = requests[:max(1, min(len(requests), pair_budget // max(1, len(properties))))]
+
+        benchmarks = {
+            "calculate_match_score": bench_calculate_match_score(
+                scorer, properties, requests, pair_samples, seed
+            ),
+            "get_sorted_matches": bench_get_sorted_matches(scorer, properties, portfolio_requests),
+            "get_sorted_matches_top10": bench_get_sorted_matches(scorer, properties, portfolio_requests, limit=10),
+            "batch_rank_top10": bench_batch_rank(batch_scorer, columns, portfolio_requests),
+        }
+
+        if endpoint_max_size is not None and size <= endpoint_max_size:
+            benchmarks["endpoint_calculate"] = bench_endpoint(
+                generator, size, request_rows[:len(portfolio_requests)], len(properties)
+            )
+
+        entry = {
+            "size": size,
+            "available_properties": len(properties),
+            "setup_seconds": round(setup_seconds, 3),
+            "benchmarks": benchmarks,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        results["sizes"].append(entry)
+
+        for name, stats in benchmarks.items():
+            logger.info(
+                f"  {name}: p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, "
+                f"{stats['pairs_per_second']} pairs/s"
+            )
+
+        del properties, columns
+
+    return results
+
+
+def compare_results(current: Dict, baseline: Dict) -> List[str]:
+    """
+    Lines comparing p50 latency per (size, benchmark) against a baseline run
+
+    Ratios above 1 are slower than the baseline.
+    """
+    baseline_stats = {
+        (entry["size"], name): stats
+        for entry in baseline.get("sizes", [])
+        for name, stats in entry["benchmarks"].items()
+    }
+
+    lines = []
+    for entry in current["sizes"]:
+        for name, stats in entry["benchmarks"].items():
+            previous = baseline_stats.get((entry["size"], name))
+            if not previous or not previous["p50_ms"]:
+                continue
+            ratio = stats["p50_ms"] / previous["p50_ms"]
+            lines.append(
+                f"{entry['size']:>9} {name:<26} p50 {previous['p50_ms']:>10.3f} -> "
+                f"{stats['p50_ms']:>10.3f} ms  x{ratio:.2f}"
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the property scoring path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Portfolio sizes")
+    parser.add_argument("--requests", type=int, default=20, help="Synthetic requests")
+    parser.add_argument("--pair-samples", type=int, default=5_000, help="Pairs timed for calculate_match_score")
+    parser.add_argument("--pair-budget", type=int, default=5_000_000, help="Max pairs per portfolio benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Portfolio seed")
+    parser.add_argument("--endpoint", action="store_true", help="Also benchmark POST /api/scoring/calculate")
+    parser.add_argument("--endpoint-max-size", type=int, default=100_000, help="Largest size for the endpoint benchmark")
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default: scoring-<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    # Per-call logs of the scorer and the test client would dominate the output
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.endpoint:
+        # Never write the synthetic portfolio into the configured database
+        scratch_db = Path(tempfile.mkdtemp(prefix="scoring-bench-")) / "bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch_db}"
+        logger.info(f"Endpoint benchmark database: {scratch_db}")
+
+    results = run_benchmarks(
+        sorted(args.sizes),
+        request_count=args.requests,
+        pair_samples=args.pair_samples,
+        pair_budget=args.pair_budget,
+        endpoint_max_size=args.endpoint_max_size if args.endpoint else None,
+        seed=args.seed,
+    )
+
+    output = args.output or Path(f"scoring-{results['git_commit'] or 'local'}.json")
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    logger.info(f"Results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"Compared with {args.compare} ({baseline.get('git_commit')}):")
+        for line in compare_results(results, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
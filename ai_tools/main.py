@@ -11,7 +11,7 @@ import time
 import logging
 
 from app.config import settings
-from app.database import init_db
+from app.database import dispose_async_engine, get_pool_metrics, init_db
 
 # Import routers
 from app.routers import chat, scoring, scraping, orchestrator
@@ -57,6 +57,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down CRM Immobiliare AI Backend...")
+    await dispose_async_engine()
 
 
 # Create FastAPI app
@@ -112,6 +113,7 @@ async def health_check():
         "status": "healthy",
         "timestamp": time.time(),
         "database": "connected",
+        "database_pool": get_pool_metrics(),
         "qdrant_mode": settings.qdrant_mode,
     }
 
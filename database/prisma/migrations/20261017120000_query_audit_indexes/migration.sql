@@ -0,0 +1,26 @@
+-- CreateIndex
+CREATE INDEX "properties_status_contractType_updatedAt_idx" ON "properties"("status", "contractType", "updatedAt");
+
+-- CreateIndex
+CREATE INDEX "properties_status_createdAt_idx" ON "properties"("status", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "properties_updatedAt_idx" ON "properties"("updatedAt");
+
+-- CreateIndex
+CREATE INDEX "properties_sourceUrl_idx" ON "properties"("sourceUrl");
+
+-- CreateIndex
+CREATE INDEX "properties_source_createdAt_idx" ON "properties"("source", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "requests_updatedAt_idx" ON "requests"("updatedAt");
+
+-- CreateIndex
+CREATE INDEX "activities_status_dueDate_idx" ON "activities"("status", "dueDate");
+
+-- CreateIndex
+CREATE INDEX "audit_logs_entityType_createdAt_idx" ON "audit_logs"("entityType", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "agent_conversations_status_createdAt_idx" ON "agent_conversations"("status", "createdAt");
@@ -0,0 +1,18 @@
+-- AlterTable
+ALTER TABLE "properties" ADD COLUMN "contentHash" TEXT;
+
+-- Backfill from the "hash:<16 hex chars>" line ScrapingRepository wrote into internalNotes
+UPDATE "properties" SET "contentHash" = substr("internalNotes", 6, 16)
+WHERE "internalNotes" LIKE 'hash:%';
+
+-- Keep the hash only on the first row of each (source, contentHash) duplicate group
+UPDATE "properties" SET "contentHash" = NULL
+WHERE "contentHash" IS NOT NULL
+  AND "rowid" NOT IN (
+    SELECT MIN("rowid") FROM "properties"
+    WHERE "contentHash" IS NOT NULL
+    GROUP BY "source", "contentHash"
+  );
+
+-- CreateIndex
+CREATE UNIQUE INDEX "properties_source_contentHash_key" ON "properties"("source", "contentHash");
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "properties_createdAt_id_idx" ON "properties"("createdAt", "id");
@@ -0,0 +1,24 @@
+-- CreateTable
+CREATE TABLE "scraping_job_stats" (
+    "portal" TEXT NOT NULL PRIMARY KEY,
+    "totalJobs" INTEGER NOT NULL DEFAULT 0,
+    "successfulJobs" INTEGER NOT NULL DEFAULT 0,
+    "failedJobs" INTEGER NOT NULL DEFAULT 0,
+    "listingsFound" INTEGER NOT NULL DEFAULT 0,
+    "listingsSaved" INTEGER NOT NULL DEFAULT 0,
+    "stale" BOOLEAN NOT NULL DEFAULT false,
+    "updatedAt" DATETIME NOT NULL
+);
+
+-- Backfill from the existing job history
+INSERT INTO "scraping_job_stats" ("portal", "totalJobs", "successfulJobs", "failedJobs", "listingsFound", "listingsSaved", "updatedAt")
+SELECT
+    "portal",
+    COUNT(*),
+    SUM(CASE WHEN "status" = 'completed' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN "status" = 'failed' THEN 1 ELSE 0 END),
+    COALESCE(SUM("listingsFound"), 0),
+    COALESCE(SUM("listingsSaved"), 0),
+    CURRENT_TIMESTAMP
+FROM "scraping_jobs"
+GROUP BY "portal";
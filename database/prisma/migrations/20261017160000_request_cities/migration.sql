@@ -0,0 +1,40 @@
+-- CreateTable
+CREATE TABLE "request_cities" (
+    "requestId" TEXT NOT NULL,
+    "city" TEXT NOT NULL,
+
+    PRIMARY KEY ("requestId", "city")
+);
+
+-- CreateIndex
+CREATE INDEX "request_cities_city_idx" ON "request_cities"("city");
+
+-- Backfill from the JSON arrays of requests.searchCities
+INSERT OR IGNORE INTO "request_cities" ("requestId", "city")
+SELECT "requests"."id", lower(trim(city.value))
+FROM "requests", json_each("requests"."searchCities") AS city
+WHERE json_valid("requests"."searchCities") AND city.type = 'text' AND trim(city.value) <> '';
+
+-- Keep request_cities in sync with every writer of requests
+CREATE TRIGGER "requests_cities_insert" AFTER INSERT ON "requests"
+WHEN json_valid(NEW."searchCities")
+BEGIN
+    INSERT OR IGNORE INTO "request_cities" ("requestId", "city")
+    SELECT NEW."id", lower(trim(city.value))
+    FROM json_each(NEW."searchCities") AS city
+    WHERE city.type = 'text' AND trim(city.value) <> '';
+END;
+
+CREATE TRIGGER "requests_cities_update" AFTER UPDATE OF "searchCities" ON "requests"
+BEGIN
+    DELETE FROM "request_cities" WHERE "requestId" = OLD."id";
+    INSERT OR IGNORE INTO "request_cities" ("requestId", "city")
+    SELECT NEW."id", lower(trim(city.value))
+    FROM json_each(CASE WHEN json_valid(NEW."searchCities") THEN NEW."searchCities" ELSE '[]' END) AS city
+    WHERE city.type = 'text' AND trim(city.value) <> '';
+END;
+
+CREATE TRIGGER "requests_cities_delete" AFTER DELETE ON "requests"
+BEGIN
+    DELETE FROM "request_cities" WHERE "requestId" = OLD."id";
+END;
@@ -21,6 +21,9 @@ from .database import (
     SessionLocal,
     get_db,
     get_db_context,
+    AsyncSessionLocal,
+    get_async_db,
+    get_async_db_context,
     init_db,
     check_db_connection,
     get_or_create,
@@ -43,6 +46,9 @@ __all__ = [
     "SessionLocal",
     "get_db",
     "get_db_context",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "get_async_db_context",
     "init_db",
     "check_db_connection",
     "get_or_create",
@@ -5,13 +5,16 @@ SQLAlchemy session management
 ==============================================
 """
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, SingletonThreadPool, StaticPool
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 import os
-from typing import Generator
+import threading
+from typing import AsyncGenerator, Dict, Generator, Optional, Union
 
 # Database file path (relative to project root)
 DB_PATH = Path(__file__).parent.parent / "prisma" / "dev.db"
@@ -19,21 +22,233 @@ DB_PATH = Path(__file__).parent.parent / "prisma" / "dev.db"
 # Ensure database directory exists
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+
+def normalize_database_url(url: str) -> str:
+    """
+    Convert a Prisma SQLite URL ("file:./dev.db") to the SQLAlchemy format.
+
+    Other URLs are returned unchanged.
+    """
+    if url.startswith("file:"):
+        return f"sqlite:///{url[len('file:'):]}"
+    return url
+
+
 # Database URL
-DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
+DATABASE_URL = normalize_database_url(os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}"))
+
+SQL_DEBUG = os.getenv("SQL_DEBUG", "false").lower() == "true"
+
+# Connection pool (server databases, and SQLite files with DB_SQLITE_POOL=queue)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite: "thread" = one connection per thread, "queue" = shared QueuePool
+DB_SQLITE_POOL = os.getenv("DB_SQLITE_POOL", "thread").lower()
+# Threads holding a connection at once; keep it above the worker threads
+# (FastAPI runs sync endpoints on 40), or connections get closed under them
+SQLITE_THREAD_POOL_SIZE = int(os.getenv("SQLITE_THREAD_POOL_SIZE", "64"))
+
+# SQLite pragmas, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _sqlite_pragmas(
+    busy_timeout_ms: int,
+    synchronous: str,
+    cache_size_kb: int,
+    mmap_size_mb: int,
+    wal: bool,
+) -> list:
+    """PRAGMA statements for a new SQLite connection"""
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLite synchronous mode: {synchronous}")
+
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(busy_timeout_ms)}",
+        f"PRAGMA synchronous = {synchronous}",
+        # Negative cache_size is in KiB instead of pages
+        f"PRAGMA cache_size = -{int(cache_size_kb)}",
+        f"PRAGMA mmap_size = {int(mmap_size_mb) * 1024 * 1024}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if wal:
+        # Readers no longer block the writer (and vice versa)
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+
+def _set_sqlite_pragmas(engine: Engine, pragmas: list):
+    """Run the PRAGMA statements on every new connection of an engine"""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _track_pool_events(engine: Engine) -> Dict[str, int]:
+    """Count connection lifecycle events of an engine's pool"""
+    counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+    lock = threading.Lock()
+
+    def listener(counter: str):
+        def increment(*args):
+            with lock:
+                counters[counter] += 1
+        return increment
+
+    event.listen(engine, "connect", listener("connects"))
+    event.listen(engine, "checkout", listener("checkouts"))
+    event.listen(engine, "checkin", listener("checkins"))
+    event.listen(engine, "invalidate", listener("invalidations"))
+    return counters
+
+
+def create_db_engine(
+    url: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_timeout: Optional[float] = None,
+    pool_recycle: Optional[int] = None,
+    sqlite_pool: Optional[str] = None,
+    busy_timeout_ms: Optional[int] = None,
+    synchronous: Optional[str] = None,
+    cache_size_kb: Optional[int] = None,
+    mmap_size_mb: Optional[int] = None,
+    echo: Optional[bool] = None,
+) -> Engine:
+    """
+    Create an engine with a pool suited to the database backend.
+
+    SQLite files get one connection per thread (SingletonThreadPool) or a shared QueuePool (sqlite_pool="queue"); every
+    connection runs in WAL mode with busy_timeout, synchronous, cache_size
+    and mmap_size pragmas. In-memory SQLite keeps a single StaticPool
+    connection, so all sessions see the same data. Other databases get a
+    sized QueuePool with pre-ping and connection recycling.
+
+    Unset arguments default to the DB_* / SQLITE_* environment variables.
+
+    Args:
+        url: Database URL (default: DATABASE_URL)
+        pool_size: Pooled connections (SQLite thread pool: max threads
+            holding one, default SQLITE_THREAD_POOL_SIZE)
+        max_overflow: Extra connections above pool_size (QueuePool)
+        pool_timeout: Seconds to wait for a free connection (QueuePool)
+        pool_recycle: Reconnect connections older than this many seconds
+        sqlite_pool: "thread" or "queue"
+        busy_timeout_ms: SQLite wait on a locked database
+        synchronous: SQLite synchronous mode (OFF, NORMAL, FULL, EXTRA)
+        cache_size_kb: SQLite page cache per connection
+        mmap_size_mb: SQLite memory-mapped I/O size (0 disables it)
+        echo: Log SQL statements (default: SQL_DEBUG)
+
+    Returns:
+        Engine, with pool counters used by get_pool_metrics()
+    """
+    url = normalize_database_url(url or DATABASE_URL)
+    echo = SQL_DEBUG if echo is None else echo
+
+    if not url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+            pool_recycle=DB_POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            pool_pre_ping=True,
+            echo=echo,
+        )
+        engine.pool_counters = _track_pool_events(engine)
+        return engine
+
+    busy_timeout_ms = SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+    # sqlite3's own timeout (seconds) also covers the connect itself
+    connect_args = {"check_same_thread": False, "timeout": busy_timeout_ms / 1000}
+
+    memory = _is_sqlite_memory(url)
+    if memory:
+        pool_args = {"poolclass": StaticPool}
+    elif (sqlite_pool or DB_SQLITE_POOL) == "queue":
+        pool_args = {
+            "poolclass": QueuePool,
+            "pool_size": DB_POOL_SIZE if pool_size is None else pool_size,
+            "max_overflow": DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            "pool_timeout": DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+        }
+    else:
+        pool_args = {
+            "poolclass": SingletonThreadPool,
+            "pool_size": SQLITE_THREAD_POOL_SIZE if pool_size is None else pool_size,
+        }
+
+    engine = create_engine(url, connect_args=connect_args, echo=echo, **pool_args)
+
+    _set_sqlite_pragmas(engine, _sqlite_pragmas(
+        busy_timeout_ms,
+        (synchronous or SQLITE_SYNCHRONOUS).upper(),
+        SQLITE_CACHE_SIZE_KB if cache_size_kb is None else cache_size_kb,
+        SQLITE_MMAP_SIZE_MB if mmap_size_mb is None else mmap_size_mb,
+        wal=not memory,
+    ))
+
+    engine.pool_counters = _track_pool_events(engine)
+    return engine
+
+
+def get_pool_metrics(db_engine: Optional[Union[Engine, AsyncEngine]] = None) -> Dict:
+    """
+    Connection pool state and counters of an engine.
+
+    Args:
+        db_engine: Engine or AsyncEngine to inspect (default: the shared engine)
+
+    Returns:
+        dict: pool class, size/checked_in/checked_out/overflow (when the
+        pool reports them), lifetime counters and the pool status line
+    """
+    db_engine = db_engine or engine
+    db_engine = getattr(db_engine, "sync_engine", db_engine)
+    pool = db_engine.pool
+
+    metrics = {
+        "backend": db_engine.dialect.name,
+        "pool": type(pool).__name__,
+    }
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            metrics[{"checkedin": "checked_in", "checkedout": "checked_out"}.get(name, name)] = method()
+    metrics.update(getattr(db_engine, "pool_counters", {}))
+    metrics["status"] = pool.status()
+    return metrics
+
 
 # Create engine
-# For SQLite, use StaticPool to avoid connection issues
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-    poolclass=StaticPool,
-    echo=os.getenv("SQL_DEBUG", "false").lower() == "true",  # Log SQL queries if SQL_DEBUG=true
-)
+engine = create_db_engine(DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Declarative base of the models (database/python/models.py)
+Base = declarative_base()
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -81,6 +296,181 @@ def get_db_context() -> Generator[Session, None, None]:
         db.close()
 
 
+# ----------------------------------------------------------------------
+# Async access (aiosqlite / asyncpg)
+# ----------------------------------------------------------------------
+
+# Async driver of each backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Swap the driver of a database URL for its async counterpart.
+
+    "sqlite:///dev.db" -> "sqlite+aiosqlite:///dev.db",
+    "postgresql://..." -> "postgresql+asyncpg://...".
+    """
+    url = normalize_database_url(url)
+    scheme, separator, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+
+    if not separator or backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database URL: {url}")
+
+    return f"{ASYNC_DRIVERS[backend]}://{rest}"
+
+
+def create_async_db_engine(
+    url: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_timeout: Optional[float] = None,
+    pool_recycle: Optional[int] = None,
+    busy_timeout_ms: Optional[int] = None,
+    synchronous: Optional[str] = None,
+    cache_size_kb: Optional[int] = None,
+    mmap_size_mb: Optional[int] = None,
+    echo: Optional[bool] = None,
+) -> AsyncEngine:
+    """
+    Create an AsyncEngine (aiosqlite / asyncpg) for the same database.
+
+    Pool settings and SQLite pragmas are the ones of create_db_engine();
+    aiosqlite runs every connection on its own thread, so SQLite files use
+    a sized queue pool instead of the per-thread one.
+
+    Args:
+        url: Database URL, sync or async (default: DATABASE_URL)
+        (the others as in create_db_engine)
+
+    Returns:
+        AsyncEngine, with pool counters used by get_pool_metrics()
+    """
+    url = to_async_url(url or DATABASE_URL)
+    echo = SQL_DEBUG if echo is None else echo
+    pool_args = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": DB_POOL_SIZE if pool_size is None else pool_size,
+        "max_overflow": DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+    }
+
+    if not url.startswith("sqlite"):
+        async_engine = create_async_engine(
+            url,
+            pool_recycle=DB_POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            pool_pre_ping=True,
+            echo=echo,
+            **pool_args,
+        )
+        async_engine.sync_engine.pool_counters = _track_pool_events(async_engine.sync_engine)
+        return async_engine
+
+    busy_timeout_ms = SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+    memory = _is_sqlite_memory(url)
+    if memory:
+        pool_args = {"poolclass": StaticPool}
+
+    async_engine = create_async_engine(
+        url,
+        connect_args={"timeout": busy_timeout_ms / 1000},
+        echo=echo,
+        **pool_args,
+    )
+
+    _set_sqlite_pragmas(async_engine.sync_engine, _sqlite_pragmas(
+        busy_timeout_ms,
+        (synchronous or SQLITE_SYNCHRONOUS).upper(),
+        SQLITE_CACHE_SIZE_KB if cache_size_kb is None else cache_size_kb,
+        SQLITE_MMAP_SIZE_MB if mmap_size_mb is None else mmap_size_mb,
+        wal=not memory,
+    ))
+
+    async_engine.sync_engine.pool_counters = _track_pool_events(async_engine.sync_engine)
+    return async_engine
+
+
+# Created on first use, so the async driver is only required by async callers
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Shared AsyncEngine for DATABASE_URL (created on first call).
+
+    Raises:
+        ImportError: if the async driver (aiosqlite / asyncpg) is not installed
+    """
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(DATABASE_URL)
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            # Loaded objects stay readable after commit without a lazy (sync) refresh
+            expire_on_commit=False,
+        )
+
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """New AsyncSession on the shared AsyncEngine"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency function to get database session.
+
+    Usage with FastAPI:
+        from fastapi import Depends
+        @app.get("/items")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_async_db_context() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async context manager for database session.
+
+    Usage:
+        async with get_async_db_context() as db:
+            result = await db.execute(select(Item))
+            # Committed on success, rolled back on error, always closed
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def dispose_async_engine():
+    """Close the connections of the shared AsyncEngine (e.g. on shutdown)"""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
 def init_db():
     """
     Initialize database tables.
@@ -93,6 +483,41 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
+def create_missing_indexes(db_engine: Optional[Engine] = None) -> list:
+    """
+    Create the model indexes missing from existing tables.
+
+    For databases created by init_db() before the indexes were declared;
+    Prisma databases get them from the migrations instead.
+
+    Args:
+        db_engine: Engine to update (default: the shared engine)
+
+    Returns:
+        list: Names of the indexes created
+    """
+    from sqlalchemy import inspect
+    from .models import Base
+
+    db_engine = db_engine or engine
+    created = []
+
+    with db_engine.begin() as connection:
+        inspector = inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=connection)
+                    created.append(index.name)
+
+    return created
+
+
 def check_db_connection() -> bool:
     """
     Check if database connection is working.
@@ -155,9 +580,20 @@ __all__ = [
     "SessionLocal",
     "get_db",
     "get_db_context",
+    "AsyncSessionLocal",
+    "get_async_engine",
+    "get_async_db",
+    "get_async_db_context",
+    "dispose_async_engine",
+    "create_async_db_engine",
+    "to_async_url",
     "init_db",
+    "create_missing_indexes",
     "check_db_connection",
     "get_or_create",
     "bulk_insert",
     "DATABASE_URL",
+    "create_db_engine",
+    "get_pool_metrics",
+    "normalize_database_url",
 ]
@@ -10,13 +10,19 @@
 # To regenerate: npm run generate:sqlalchemy
 # ==============================================================================
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum, DECIMAL, BigInteger
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum, DECIMAL, Numeric, BigInteger, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
 from typing import Optional
 import enum
 
+
+def enum_type(enum_class):
+    """Enum column type storing the member values, as Prisma does on SQLite"""
+    return SQLEnum(enum_class, native_enum=False, values_callable=lambda members: [member.value for member in members])
+
+
 # ==============================================================================
 # ENUMS
 # ==============================================================================
@@ -79,7 +85,7 @@ class UserProfile(Base):
     agencyAddress = Column(String, nullable=True)  # Optional
     settings = Column(JSON, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<UserProfile(id={self.id})>"
@@ -88,9 +94,23 @@ class Contact(Base):
     """Contact model"""
     __tablename__ = "contacts"
 
+    __table_args__ = (
+        Index("contacts_code_idx", "code"),
+        Index("contacts_fullName_idx", "fullName"),
+        Index("contacts_city_idx", "city"),
+        Index("contacts_status_idx", "status"),
+        Index("contacts_source_idx", "source"),
+        Index("contacts_importance_idx", "importance"),
+        Index("contacts_status_lastContactDate_idx", "status", "lastContactDate"),
+        Index("contacts_city_status_idx", "city", "status"),
+        Index("contacts_importance_status_idx", "importance", "status"),
+        Index("contacts_lastEmailDate_idx", "lastEmailDate"),
+        Index("contacts_lastWhatsAppDate_idx", "lastWhatsAppDate"),
+    )
+
     id = Column(String, primary_key=True)
     code = Column(String, unique=True)
-    entityType = Column(String)
+    entityType = Column(String, default="person")
     fullName = Column(String)
     firstName = Column(String, nullable=True)  # Optional
     lastName = Column(String, nullable=True)  # Optional
@@ -104,35 +124,39 @@ class Contact(Base):
     city = Column(String, nullable=True)  # Optional
     province = Column(String, nullable=True)  # Optional
     zip = Column(String, nullable=True)  # Optional
-    country = Column(String, nullable=True)  # Optional
+    country = Column(String, nullable=True, default="Italia")  # Optional
     latitude = Column(Float, nullable=True)  # Optional
     longitude = Column(Float, nullable=True)  # Optional
     taxCode = Column(String, nullable=True, unique=True)  # Optional
     vatNumber = Column(String, nullable=True, unique=True)  # Optional
     birthDate = Column(DateTime, nullable=True)  # Optional
     nationality = Column(String, nullable=True)  # Optional
-    privacyFirstContact = Column(Boolean)
+    privacyFirstContact = Column(Boolean, default=False)
     privacyFirstContactDate = Column(DateTime, nullable=True)  # Optional
-    privacyExtended = Column(Boolean)
+    privacyExtended = Column(Boolean, default=False)
     privacyExtendedDate = Column(DateTime, nullable=True)  # Optional
-    privacyMarketing = Column(Boolean)
+    privacyMarketing = Column(Boolean, default=False)
     source = Column(String, nullable=True)  # Optional
     leadScore = Column(Integer, nullable=True)  # Optional
-    importance = Column(String)
+    importance = Column(String, default="normal")
     budgetMin = Column(Numeric, nullable=True)  # Optional
     budgetMax = Column(Numeric, nullable=True)  # Optional
-    status = Column(ContactStatus)
+    status = Column(enum_type(ContactStatus), default="active")
     lastContactDate = Column(DateTime, nullable=True)  # Optional
     notes = Column(String, nullable=True)  # Optional
+    lastEmailDate = Column(DateTime, nullable=True)  # Optional
+    lastWhatsAppDate = Column(DateTime, nullable=True)  # Optional
+    emailThreadId = Column(String, nullable=True)  # Optional
+    whatsappThreadId = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    ownedProperties = relationship("Property")  # TODO: Configure relationship
-    requests = relationship("Request")  # TODO: Configure relationship
-    matches = relationship("Match")  # TODO: Configure relationship
-    activities = relationship("Activity")  # TODO: Configure relationship
-    tags = relationship("EntityTag")  # TODO: Configure relationship
+    ownedProperties = relationship("Property", back_populates="owner", passive_deletes=True)
+    requests = relationship("Request", back_populates="contact", passive_deletes=True)
+    matches = relationship("Match", back_populates="contact", passive_deletes=True)
+    activities = relationship("Activity", back_populates="contact", passive_deletes=True)
+    tags = relationship("EntityTag", back_populates="contact", passive_deletes=True)
 
     def __repr__(self):
         return f"<Contact(id={self.id})>"
@@ -141,6 +165,15 @@ class Building(Base):
     """Building model"""
     __tablename__ = "buildings"
 
+    __table_args__ = (
+        Index("buildings_code_idx", "code"),
+        Index("buildings_city_street_civic_idx", "city", "street", "civic"),
+        Index("buildings_nextSurveyDue_idx", "nextSurveyDue"),
+        Index("buildings_latitude_longitude_idx", "latitude", "longitude"),
+        Index("buildings_city_cadastralZone_idx", "city", "cadastralZone"),
+        Index("buildings_avgUrgency_idx", "avgUrgency"),
+    )
+
     id = Column(String, primary_key=True)
     code = Column(String, unique=True)
     street = Column(String)
@@ -156,26 +189,26 @@ class Building(Base):
     yearBuilt = Column(Integer, nullable=True)  # Optional
     totalFloors = Column(Integer, nullable=True)  # Optional
     totalUnits = Column(Integer, nullable=True)  # Optional
-    hasElevator = Column(Boolean)
+    hasElevator = Column(Boolean, default=False)
     condition = Column(String, nullable=True)  # Optional
-    activeUnits = Column(Integer)
-    soldUnits = Column(Integer)
+    activeUnits = Column(Integer, default=0)
+    soldUnits = Column(Integer, default=0)
     avgUrgency = Column(Float, nullable=True)  # Optional
     lastSurveyDate = Column(DateTime, nullable=True)  # Optional
     nextSurveyDue = Column(DateTime, nullable=True)  # Optional
-    unitsSurveyed = Column(Integer)
-    unitsInterested = Column(Integer)
+    unitsSurveyed = Column(Integer, default=0)
+    unitsInterested = Column(Integer, default=0)
     administratorName = Column(String, nullable=True)  # Optional
     administratorPhone = Column(String, nullable=True)  # Optional
     administratorEmail = Column(String, nullable=True)  # Optional
     notes = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    properties = relationship("Property")  # TODO: Configure relationship
-    activities = relationship("Activity")  # TODO: Configure relationship
-    tags = relationship("EntityTag")  # TODO: Configure relationship
+    properties = relationship("Property", back_populates="building", passive_deletes=True)
+    activities = relationship("Activity", back_populates="building", passive_deletes=True)
+    tags = relationship("EntityTag", back_populates="building", passive_deletes=True)
 
     def __repr__(self):
         return f"<Building(id={self.id})>"
@@ -184,16 +217,50 @@ class Property(Base):
     """Property model"""
     __tablename__ = "properties"
 
+    __table_args__ = (
+        Index("properties_code_idx", "code"),
+        Index("properties_ownerContactId_idx", "ownerContactId"),
+        Index("properties_buildingId_idx", "buildingId"),
+        Index("properties_status_idx", "status"),
+        Index("properties_contractType_idx", "contractType"),
+        Index("properties_propertyType_idx", "propertyType"),
+        Index("properties_city_idx", "city"),
+        Index("properties_zone_idx", "zone"),
+        Index("properties_priceSale_idx", "priceSale"),
+        Index("properties_priceRentMonthly_idx", "priceRentMonthly"),
+        Index("properties_sqmCommercial_idx", "sqmCommercial"),
+        Index("properties_rooms_idx", "rooms"),
+        Index("properties_bedrooms_idx", "bedrooms"),
+        Index("properties_status_contractType_idx", "status", "contractType"),
+        Index("properties_needsInternalVisit_idx", "needsInternalVisit"),
+        Index("properties_mandateEndDate_idx", "mandateEndDate"),
+        Index("properties_urgencyScore_idx", "urgencyScore"),
+        Index("properties_lastActivityAt_idx", "lastActivityAt"),
+        Index("properties_latitude_longitude_idx", "latitude", "longitude"),
+        Index("properties_status_contractType_city_idx", "status", "contractType", "city"),
+        Index("properties_contractType_propertyType_city_idx", "contractType", "propertyType", "city"),
+        Index("properties_city_zone_status_idx", "city", "zone", "status"),
+        Index("properties_status_urgencyScore_idx", "status", "urgencyScore"),
+        Index("properties_status_contractType_updatedAt_idx", "status", "contractType", "updatedAt"),
+        Index("properties_status_createdAt_idx", "status", "createdAt"),
+        Index("properties_updatedAt_idx", "updatedAt"),
+        Index("properties_sourceUrl_idx", "sourceUrl"),
+        Index("properties_source_createdAt_idx", "source", "createdAt"),
+        Index("properties_createdAt_id_idx", "createdAt", "id"),
+        Index("properties_source_contentHash_key", "source", "contentHash", unique=True),
+    )
+
     id = Column(String, primary_key=True)
     code = Column(String, unique=True)
-    ownerContactId = Column(String, nullable=True)  # Optional
-    buildingId = Column(String, nullable=True)  # Optional
-    status = Column(PropertyStatus)
-    visibility = Column(String)
-    source = Column(String)
+    ownerContactId = Column(String, ForeignKey("contacts.id"), nullable=True)  # Optional
+    buildingId = Column(String, ForeignKey("buildings.id"), nullable=True)  # Optional
+    status = Column(enum_type(PropertyStatus), default="draft")
+    visibility = Column(String, default="public")
+    source = Column(String, default="direct_mandate")
     sourceUrl = Column(String, nullable=True)  # Optional
+    contentHash = Column(String, nullable=True)  # Optional
     importDate = Column(DateTime, nullable=True)  # Optional
-    verified = Column(Boolean)
+    verified = Column(Boolean, default=False)
     street = Column(String)
     civic = Column(String, nullable=True)  # Optional
     internal = Column(String, nullable=True)  # Optional
@@ -212,18 +279,18 @@ class Property(Base):
     rooms = Column(Integer, nullable=True)  # Optional
     bedrooms = Column(Integer, nullable=True)  # Optional
     bathrooms = Column(Integer, nullable=True)  # Optional
-    hasElevator = Column(Boolean)
-    hasParking = Column(Boolean)
-    hasGarage = Column(Boolean)
-    hasGarden = Column(Boolean)
-    hasTerrace = Column(Boolean)
-    hasBalcony = Column(Boolean)
-    hasCellar = Column(Boolean)
-    hasAttic = Column(Boolean)
-    hasSwimmingPool = Column(Boolean)
-    hasFireplace = Column(Boolean)
-    hasAlarm = Column(Boolean)
-    hasAirConditioning = Column(Boolean)
+    hasElevator = Column(Boolean, default=False)
+    hasParking = Column(Boolean, default=False)
+    hasGarage = Column(Boolean, default=False)
+    hasGarden = Column(Boolean, default=False)
+    hasTerrace = Column(Boolean, default=False)
+    hasBalcony = Column(Boolean, default=False)
+    hasCellar = Column(Boolean, default=False)
+    hasAttic = Column(Boolean, default=False)
+    hasSwimmingPool = Column(Boolean, default=False)
+    hasFireplace = Column(Boolean, default=False)
+    hasAlarm = Column(Boolean, default=False)
+    hasAirConditioning = Column(Boolean, default=False)
     condition = Column(String, nullable=True)  # Optional
     heatingType = Column(String, nullable=True)  # Optional
     energyClass = Column(String, nullable=True)  # Optional
@@ -240,22 +307,22 @@ class Property(Base):
     mandateStartDate = Column(DateTime, nullable=True)  # Optional
     mandateEndDate = Column(DateTime, nullable=True)  # Optional
     mandateNumber = Column(String, nullable=True)  # Optional
-    needsInternalVisit = Column(Boolean)
-    needsPhotos = Column(Boolean)
-    needsValuation = Column(Boolean)
-    ownerToContact = Column(Boolean)
+    needsInternalVisit = Column(Boolean, default=False)
+    needsPhotos = Column(Boolean, default=False)
+    needsValuation = Column(Boolean, default=False)
+    ownerToContact = Column(Boolean, default=False)
     title = Column(String, nullable=True)  # Optional
     description = Column(String, nullable=True)  # Optional
-    photosCount = Column(Integer)
-    hasProfessionalPhotos = Column(Boolean)
-    hasVirtualTour = Column(Boolean)
-    has3DModel = Column(Boolean)
-    hasFloorPlan = Column(Boolean)
-    viewsCount = Column(Integer)
-    inquiriesCount = Column(Integer)
-    visitsCount = Column(Integer)
-    daysOnMarket = Column(Integer)
-    urgencyScore = Column(Integer)
+    photosCount = Column(Integer, default=0)
+    hasProfessionalPhotos = Column(Boolean, default=False)
+    hasVirtualTour = Column(Boolean, default=False)
+    has3DModel = Column(Boolean, default=False)
+    hasFloorPlan = Column(Boolean, default=False)
+    viewsCount = Column(Integer, default=0)
+    inquiriesCount = Column(Integer, default=0)
+    visitsCount = Column(Integer, default=0)
+    daysOnMarket = Column(Integer, default=0)
+    urgencyScore = Column(Integer, default=0)
     lastActivityAt = Column(DateTime, nullable=True)  # Optional
     notes = Column(String, nullable=True)  # Optional
     internalNotes = Column(String, nullable=True)  # Optional
@@ -265,16 +332,16 @@ class Property(Base):
     rentedPrice = Column(Numeric, nullable=True)  # Optional
     closedBy = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     publishedAt = Column(DateTime, nullable=True)  # Optional
     archivedAt = Column(DateTime, nullable=True)  # Optional
 
     # Relationships
-    owner = relationship("Contact")  # TODO: Configure relationship
-    building = relationship("Building")  # TODO: Configure relationship
-    matches = relationship("Match")  # TODO: Configure relationship
-    activities = relationship("Activity")  # TODO: Configure relationship
-    tags = relationship("EntityTag")  # TODO: Configure relationship
+    owner = relationship("Contact", back_populates="ownedProperties")
+    building = relationship("Building", back_populates="properties")
+    matches = relationship("Match", back_populates="property", passive_deletes=True)
+    activities = relationship("Activity", back_populates="property", passive_deletes=True)
+    tags = relationship("EntityTag", back_populates="property", passive_deletes=True)
 
     def __repr__(self):
         return f"<Property(id={self.id})>"
@@ -283,12 +350,25 @@ class Request(Base):
     """Request model"""
     __tablename__ = "requests"
 
+    __table_args__ = (
+        Index("requests_code_idx", "code"),
+        Index("requests_contactId_idx", "contactId"),
+        Index("requests_status_idx", "status"),
+        Index("requests_requestType_idx", "requestType"),
+        Index("requests_urgency_idx", "urgency"),
+        Index("requests_expiresAt_idx", "expiresAt"),
+        Index("requests_contactId_status_idx", "contactId", "status"),
+        Index("requests_status_urgency_idx", "status", "urgency"),
+        Index("requests_requestType_status_idx", "requestType", "status"),
+        Index("requests_updatedAt_idx", "updatedAt"),
+    )
+
     id = Column(String, primary_key=True)
     code = Column(String, unique=True)
-    contactId = Column(String)
-    requestType = Column(String)
-    status = Column(RequestStatus)
-    urgency = Column(String)
+    contactId = Column(String, ForeignKey("contacts.id"))
+    requestType = Column(String, default="search_buy")
+    status = Column(enum_type(RequestStatus), default="active")
+    urgency = Column(String, default="medium")
     contractType = Column(String, nullable=True)  # Optional
     searchCities = Column(JSON, nullable=True)  # Optional
     searchZones = Column(JSON, nullable=True)  # Optional
@@ -305,16 +385,16 @@ class Request(Base):
     bedroomsMin = Column(Integer, nullable=True)  # Optional
     bedroomsMax = Column(Integer, nullable=True)  # Optional
     bathroomsMin = Column(Integer, nullable=True)  # Optional
-    requiresElevator = Column(Boolean)
-    requiresParking = Column(Boolean)
-    requiresGarage = Column(Boolean)
-    requiresGarden = Column(Boolean)
-    requiresTerrace = Column(Boolean)
-    requiresBalcony = Column(Boolean)
-    excludeGroundFloor = Column(Boolean)
-    excludeTopFloorNoElevator = Column(Boolean)
-    excludeBasement = Column(Boolean)
-    excludeNorthFacing = Column(Boolean)
+    requiresElevator = Column(Boolean, default=False)
+    requiresParking = Column(Boolean, default=False)
+    requiresGarage = Column(Boolean, default=False)
+    requiresGarden = Column(Boolean, default=False)
+    requiresTerrace = Column(Boolean, default=False)
+    requiresBalcony = Column(Boolean, default=False)
+    excludeGroundFloor = Column(Boolean, default=False)
+    excludeTopFloorNoElevator = Column(Boolean, default=False)
+    excludeBasement = Column(Boolean, default=False)
+    excludeNorthFacing = Column(Boolean, default=False)
     minCondition = Column(String, nullable=True)  # Optional
     minEnergyClass = Column(String, nullable=True)  # Optional
     maxYearBuilt = Column(Integer, nullable=True)  # Optional
@@ -324,32 +404,59 @@ class Request(Base):
     satisfiedByMatchId = Column(String, nullable=True)  # Optional
     satisfiedDate = Column(DateTime, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    contact = relationship("Contact")  # TODO: Configure relationship
-    matches = relationship("Match")  # TODO: Configure relationship
-    activities = relationship("Activity")  # TODO: Configure relationship
-    tags = relationship("EntityTag")  # TODO: Configure relationship
+    contact = relationship("Contact", back_populates="requests")
+    matches = relationship("Match", back_populates="request", passive_deletes=True)
+    activities = relationship("Activity", back_populates="request", passive_deletes=True)
+    tags = relationship("EntityTag", back_populates="request", passive_deletes=True)
 
     def __repr__(self):
         return f"<Request(id={self.id})>"
 
+class RequestCity(Base):
+    """RequestCity model"""
+    __tablename__ = "request_cities"
+
+    __table_args__ = (
+        Index("request_cities_city_idx", "city"),
+    )
+
+    requestId = Column(String, primary_key=True)
+    city = Column(String, primary_key=True)
+
+    def __repr__(self):
+        return f"<RequestCity(requestId={self.requestId})>"
+
 class Match(Base):
     """Match model"""
     __tablename__ = "matches"
 
+    __table_args__ = (
+        Index("matches_requestId_idx", "requestId"),
+        Index("matches_propertyId_idx", "propertyId"),
+        Index("matches_contactId_idx", "contactId"),
+        Index("matches_scoreTotal_idx", "scoreTotal"),
+        Index("matches_status_idx", "status"),
+        Index("matches_sentDate_idx", "sentDate"),
+        Index("matches_requestId_status_idx", "requestId", "status"),
+        Index("matches_propertyId_status_idx", "propertyId", "status"),
+        Index("matches_contactId_status_idx", "contactId", "status"),
+        Index("matches_status_scoreTotal_idx", "status", "scoreTotal"),
+    )
+
     id = Column(String, primary_key=True)
-    requestId = Column(String)
-    propertyId = Column(String)
-    contactId = Column(String, nullable=True)  # Optional
+    requestId = Column(String, ForeignKey("requests.id"))
+    propertyId = Column(String, ForeignKey("properties.id"))
+    contactId = Column(String, ForeignKey("contacts.id"), nullable=True)  # Optional
     scoreTotal = Column(Integer)
     scoreLocation = Column(Integer, nullable=True)  # Optional
     scorePrice = Column(Integer, nullable=True)  # Optional
     scoreSize = Column(Integer, nullable=True)  # Optional
     scoreFeatures = Column(Integer, nullable=True)  # Optional
     scoreCondition = Column(Integer, nullable=True)  # Optional
-    status = Column(MatchStatus)
+    status = Column(enum_type(MatchStatus), default="suggested")
     clientReaction = Column(String, nullable=True)  # Optional
     rejectionReason = Column(String, nullable=True)  # Optional
     clientNotes = Column(String, nullable=True)  # Optional
@@ -360,12 +467,12 @@ class Match(Base):
     closedDate = Column(DateTime, nullable=True)  # Optional
     closedReason = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    request = relationship("Request")  # TODO: Configure relationship
-    property = relationship("Property")  # TODO: Configure relationship
-    contact = relationship("Contact")  # TODO: Configure relationship
+    request = relationship("Request", back_populates="matches")
+    property = relationship("Property", back_populates="matches")
+    contact = relationship("Contact", back_populates="matches")
 
     def __repr__(self):
         return f"<Match(id={self.id})>"
@@ -374,14 +481,31 @@ class Activity(Base):
     """Activity model"""
     __tablename__ = "activities"
 
+    __table_args__ = (
+        Index("activities_contactId_idx", "contactId"),
+        Index("activities_propertyId_idx", "propertyId"),
+        Index("activities_requestId_idx", "requestId"),
+        Index("activities_buildingId_idx", "buildingId"),
+        Index("activities_activityType_idx", "activityType"),
+        Index("activities_status_idx", "status"),
+        Index("activities_scheduledAt_idx", "scheduledAt"),
+        Index("activities_dueDate_idx", "dueDate"),
+        Index("activities_contactId_status_idx", "contactId", "status"),
+        Index("activities_contactId_activityType_idx", "contactId", "activityType"),
+        Index("activities_status_scheduledAt_idx", "status", "scheduledAt"),
+        Index("activities_activityType_scheduledAt_idx", "activityType", "scheduledAt"),
+        Index("activities_googleEventId_idx", "googleEventId"),
+        Index("activities_status_dueDate_idx", "status", "dueDate"),
+    )
+
     id = Column(String, primary_key=True)
-    contactId = Column(String, nullable=True)  # Optional
-    propertyId = Column(String, nullable=True)  # Optional
-    requestId = Column(String, nullable=True)  # Optional
-    buildingId = Column(String, nullable=True)  # Optional
+    contactId = Column(String, ForeignKey("contacts.id"), nullable=True)  # Optional
+    propertyId = Column(String, ForeignKey("properties.id"), nullable=True)  # Optional
+    requestId = Column(String, ForeignKey("requests.id"), nullable=True)  # Optional
+    buildingId = Column(String, ForeignKey("buildings.id"), nullable=True)  # Optional
     activityType = Column(String)
-    status = Column(ActivityStatus)
-    priority = Column(String)
+    status = Column(enum_type(ActivityStatus), default="scheduled")
+    priority = Column(String, default="normal")
     scheduledAt = Column(DateTime, nullable=True)  # Optional
     completedAt = Column(DateTime, nullable=True)  # Optional
     dueDate = Column(DateTime, nullable=True)  # Optional
@@ -393,18 +517,23 @@ class Activity(Base):
     locationAddress = Column(String, nullable=True)  # Optional
     locationCity = Column(String, nullable=True)  # Optional
     locationNotes = Column(String, nullable=True)  # Optional
-    reminderSent = Column(Boolean)
+    reminderSent = Column(Boolean, default=False)
     reminderDate = Column(DateTime, nullable=True)  # Optional
+    googleEventId = Column(String, nullable=True)  # Optional
+    googleCalendarId = Column(String, nullable=True)  # Optional
+    googleEventUrl = Column(String, nullable=True)  # Optional
+    syncedToGoogle = Column(Boolean, default=False)
+    lastSyncedAt = Column(DateTime, nullable=True)  # Optional
     notes = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    contact = relationship("Contact")  # TODO: Configure relationship
-    property = relationship("Property")  # TODO: Configure relationship
-    request = relationship("Request")  # TODO: Configure relationship
-    building = relationship("Building")  # TODO: Configure relationship
-    tags = relationship("EntityTag")  # TODO: Configure relationship
+    contact = relationship("Contact", back_populates="activities")
+    property = relationship("Property", back_populates="activities")
+    request = relationship("Request", back_populates="activities")
+    building = relationship("Building", back_populates="activities")
+    tags = relationship("EntityTag", back_populates="activity", passive_deletes=True)
 
     def __repr__(self):
         return f"<Activity(id={self.id})>"
@@ -413,16 +542,21 @@ class Tag(Base):
     """Tag model"""
     __tablename__ = "tags"
 
+    __table_args__ = (
+        Index("tags_name_idx", "name"),
+        Index("tags_category_idx", "category"),
+    )
+
     id = Column(String, primary_key=True)
     name = Column(String, unique=True)
     category = Column(String, nullable=True)  # Optional
     color = Column(String, nullable=True)  # Optional
-    usageCount = Column(Integer)
+    usageCount = Column(Integer, default=0)
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    entities = relationship("EntityTag")  # TODO: Configure relationship
+    entities = relationship("EntityTag", back_populates="tag", passive_deletes=True)
 
     def __repr__(self):
         return f"<Tag(id={self.id})>"
@@ -431,22 +565,36 @@ class EntityTag(Base):
     """EntityTag model"""
     __tablename__ = "entity_tags"
 
+    __table_args__ = (
+        Index("entity_tags_tagId_contactId_key", "tagId", "contactId", unique=True),
+        Index("entity_tags_tagId_propertyId_key", "tagId", "propertyId", unique=True),
+        Index("entity_tags_tagId_requestId_key", "tagId", "requestId", unique=True),
+        Index("entity_tags_tagId_buildingId_key", "tagId", "buildingId", unique=True),
+        Index("entity_tags_tagId_activityId_key", "tagId", "activityId", unique=True),
+        Index("entity_tags_tagId_idx", "tagId"),
+        Index("entity_tags_contactId_idx", "contactId"),
+        Index("entity_tags_propertyId_idx", "propertyId"),
+        Index("entity_tags_requestId_idx", "requestId"),
+        Index("entity_tags_buildingId_idx", "buildingId"),
+        Index("entity_tags_activityId_idx", "activityId"),
+    )
+
     id = Column(String, primary_key=True)
-    tagId = Column(String)
-    contactId = Column(String, nullable=True)  # Optional
-    propertyId = Column(String, nullable=True)  # Optional
-    requestId = Column(String, nullable=True)  # Optional
-    buildingId = Column(String, nullable=True)  # Optional
-    activityId = Column(String, nullable=True)  # Optional
+    tagId = Column(String, ForeignKey("tags.id"))
+    contactId = Column(String, ForeignKey("contacts.id"), nullable=True)  # Optional
+    propertyId = Column(String, ForeignKey("properties.id"), nullable=True)  # Optional
+    requestId = Column(String, ForeignKey("requests.id"), nullable=True)  # Optional
+    buildingId = Column(String, ForeignKey("buildings.id"), nullable=True)  # Optional
+    activityId = Column(String, ForeignKey("activities.id"), nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    tag = relationship("Tag")  # TODO: Configure relationship
-    contact = relationship("Contact")  # TODO: Configure relationship
-    property = relationship("Property")  # TODO: Configure relationship
-    request = relationship("Request")  # TODO: Configure relationship
-    building = relationship("Building")  # TODO: Configure relationship
-    activity = relationship("Activity")  # TODO: Configure relationship
+    tag = relationship("Tag", back_populates="entities")
+    contact = relationship("Contact", back_populates="tags")
+    property = relationship("Property", back_populates="tags")
+    request = relationship("Request", back_populates="tags")
+    building = relationship("Building", back_populates="tags")
+    activity = relationship("Activity", back_populates="tags")
 
     def __repr__(self):
         return f"<EntityTag(id={self.id})>"
@@ -455,13 +603,20 @@ class AuditLog(Base):
     """AuditLog model"""
     __tablename__ = "audit_logs"
 
+    __table_args__ = (
+        Index("audit_logs_entityType_entityId_idx", "entityType", "entityId"),
+        Index("audit_logs_action_idx", "action"),
+        Index("audit_logs_createdAt_idx", "createdAt"),
+        Index("audit_logs_entityType_createdAt_idx", "entityType", "createdAt"),
+    )
+
     id = Column(String, primary_key=True)
     entityType = Column(String)
     entityId = Column(String)
     action = Column(String)
     oldValues = Column(JSON, nullable=True)  # Optional
     newValues = Column(JSON, nullable=True)  # Optional
-    userId = Column(String, nullable=True)  # Optional
+    userId = Column(String, nullable=True, default="system")  # Optional
     ipAddress = Column(String, nullable=True)  # Optional
     userAgent = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
@@ -473,22 +628,27 @@ class CustomFieldDefinition(Base):
     """CustomFieldDefinition model"""
     __tablename__ = "custom_field_definitions"
 
+    __table_args__ = (
+        Index("custom_field_definitions_entityType_name_key", "entityType", "name", unique=True),
+        Index("custom_field_definitions_entityType_isActive_idx", "entityType", "isActive"),
+    )
+
     id = Column(String, primary_key=True)
     name = Column(String)
     label = Column(String)
     entityType = Column(String)
-    fieldType = Column(String)
-    required = Column(Boolean)
+    fieldType = Column(String, default="text")
+    required = Column(Boolean, default=False)
     validationRules = Column(JSON, nullable=True)  # Optional
     options = Column(JSON, nullable=True)  # Optional
     section = Column(String, nullable=True)  # Optional
-    displayOrder = Column(Integer)
-    isActive = Column(Boolean)
+    displayOrder = Column(Integer, default=0)
+    isActive = Column(Boolean, default=True)
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    values = relationship("CustomFieldValue")  # TODO: Configure relationship
+    values = relationship("CustomFieldValue", back_populates="field", passive_deletes=True)
 
     def __repr__(self):
         return f"<CustomFieldDefinition(id={self.id})>"
@@ -497,8 +657,14 @@ class CustomFieldValue(Base):
     """CustomFieldValue model"""
     __tablename__ = "custom_field_values"
 
+    __table_args__ = (
+        Index("custom_field_values_fieldId_entityType_entityId_key", "fieldId", "entityType", "entityId", unique=True),
+        Index("custom_field_values_entityType_entityId_idx", "entityType", "entityId"),
+        Index("custom_field_values_fieldId_idx", "fieldId"),
+    )
+
     id = Column(String, primary_key=True)
-    fieldId = Column(String)
+    fieldId = Column(String, ForeignKey("custom_field_definitions.id"))
     entityType = Column(String)
     entityId = Column(String)
     valueText = Column(String, nullable=True)  # Optional
@@ -507,10 +673,10 @@ class CustomFieldValue(Base):
     valueDate = Column(DateTime, nullable=True)  # Optional
     valueJson = Column(JSON, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    field = relationship("CustomFieldDefinition")  # TODO: Configure relationship
+    field = relationship("CustomFieldDefinition", back_populates="values")
 
     def __repr__(self):
         return f"<CustomFieldValue(id={self.id})>"
@@ -519,6 +685,12 @@ class ScrapingJob(Base):
     """ScrapingJob model"""
     __tablename__ = "scraping_jobs"
 
+    __table_args__ = (
+        Index("scraping_jobs_status_idx", "status"),
+        Index("scraping_jobs_portal_idx", "portal"),
+        Index("scraping_jobs_createdAt_idx", "createdAt"),
+    )
+
     id = Column(String, primary_key=True)
     portal = Column(String)
     location = Column(String, nullable=True)  # Optional
@@ -530,45 +702,67 @@ class ScrapingJob(Base):
     sqmMax = Column(Float, nullable=True)  # Optional
     roomsMin = Column(Integer, nullable=True)  # Optional
     roomsMax = Column(Integer, nullable=True)  # Optional
-    maxPages = Column(Integer)
-    status = Column(String)
-    listingsFound = Column(Integer)
-    listingsSaved = Column(Integer)
+    maxPages = Column(Integer, default=5)
+    status = Column(String, default="queued")
+    listingsFound = Column(Integer, default=0)
+    listingsSaved = Column(Integer, default=0)
     errors = Column(JSON, nullable=True)  # Optional
     startedAt = Column(DateTime, nullable=True)  # Optional
     completedAt = Column(DateTime, nullable=True)  # Optional
     duration = Column(Integer, nullable=True)  # Optional
-    createdBy = Column(String)
+    createdBy = Column(String, default="user")
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<ScrapingJob(id={self.id})>"
 
+class ScrapingJobStats(Base):
+    """ScrapingJobStats model"""
+    __tablename__ = "scraping_job_stats"
+
+    portal = Column(String, primary_key=True)
+    totalJobs = Column(Integer, default=0)
+    successfulJobs = Column(Integer, default=0)
+    failedJobs = Column(Integer, default=0)
+    listingsFound = Column(Integer, default=0)
+    listingsSaved = Column(Integer, default=0)
+    stale = Column(Boolean, default=False)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ScrapingJobStats(portal={self.portal})>"
+
 class ScrapingSession(Base):
     """ScrapingSession model"""
     __tablename__ = "scraping_sessions"
 
+    __table_args__ = (
+        Index("scraping_sessions_portal_idx", "portal"),
+        Index("scraping_sessions_isAuthenticated_idx", "isAuthenticated"),
+        Index("scraping_sessions_lastUsedAt_idx", "lastUsedAt"),
+    )
+
     id = Column(String, primary_key=True)
     portal = Column(String, unique=True)
     userAgent = Column(String)
     cookies = Column(JSON)
     localStorage = Column(JSON, nullable=True)  # Optional
     sessionStorage = Column(JSON, nullable=True)  # Optional
-    viewportWidth = Column(Integer)
-    viewportHeight = Column(Integer)
-    isAuthenticated = Column(Boolean)
+    viewportWidth = Column(Integer, default=1920)
+    viewportHeight = Column(Integer, default=1080)
+    isAuthenticated = Column(Boolean, default=False)
     username = Column(String, nullable=True)  # Optional
     proxyUrl = Column(String, nullable=True)  # Optional
     proxyUsername = Column(String, nullable=True)  # Optional
-    useCount = Column(Integer)
-    successCount = Column(Integer)
-    failureCount = Column(Integer)
+    useCount = Column(Integer, default=0)
+    successCount = Column(Integer, default=0)
+    failureCount = Column(Integer, default=0)
     lastUsedAt = Column(DateTime, default=datetime.utcnow)
     lastSuccess = Column(DateTime, nullable=True)  # Optional
-    isValid = Column(Boolean)
+    isValid = Column(Boolean, default=True)
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<ScrapingSession(id={self.id})>"
@@ -577,12 +771,19 @@ class AgentConversation(Base):
     """AgentConversation model"""
     __tablename__ = "agent_conversations"
 
+    __table_args__ = (
+        Index("agent_conversations_status_idx", "status"),
+        Index("agent_conversations_startedAt_idx", "startedAt"),
+        Index("agent_conversations_createdAt_idx", "createdAt"),
+        Index("agent_conversations_status_createdAt_idx", "status", "createdAt"),
+    )
+
     id = Column(String, primary_key=True)
     userPrompt = Column(String)
     agentPlan = Column(JSON, nullable=True)  # Optional
     results = Column(JSON, nullable=True)  # Optional
     summary = Column(String, nullable=True)  # Optional
-    status = Column(String)
+    status = Column(String, default="pending")
     startedAt = Column(DateTime, default=datetime.utcnow)
     completedAt = Column(DateTime, nullable=True)  # Optional
     executionTime = Column(Integer, nullable=True)  # Optional
@@ -590,10 +791,10 @@ class AgentConversation(Base):
     userFeedback = Column(String, nullable=True)  # Optional
     confidence = Column(Float, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    tasks = relationship("AgentTask")  # TODO: Configure relationship
+    tasks = relationship("AgentTask", back_populates="conversation", passive_deletes=True)
 
     def __repr__(self):
         return f"<AgentConversation(id={self.id})>"
@@ -602,25 +803,32 @@ class AgentTask(Base):
     """AgentTask model"""
     __tablename__ = "agent_tasks"
 
+    __table_args__ = (
+        Index("agent_tasks_conversationId_idx", "conversationId"),
+        Index("agent_tasks_status_idx", "status"),
+        Index("agent_tasks_taskType_idx", "taskType"),
+        Index("agent_tasks_startedAt_idx", "startedAt"),
+    )
+
     id = Column(String, primary_key=True)
-    conversationId = Column(String)
+    conversationId = Column(String, ForeignKey("agent_conversations.id"))
     taskType = Column(String)
     description = Column(String)
     parameters = Column(JSON)
     sourceName = Column(String, nullable=True)  # Optional
-    status = Column(String)
+    status = Column(String, default="pending")
     result = Column(JSON, nullable=True)  # Optional
     error = Column(String, nullable=True)  # Optional
     startedAt = Column(DateTime, nullable=True)  # Optional
     completedAt = Column(DateTime, nullable=True)  # Optional
     duration = Column(Integer, nullable=True)  # Optional
     dependsOn = Column(JSON, nullable=True)  # Optional
-    priority = Column(Integer)
+    priority = Column(Integer, default=0)
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    conversation = relationship("AgentConversation")  # TODO: Configure relationship
+    conversation = relationship("AgentConversation", back_populates="tasks")
 
     def __repr__(self):
         return f"<AgentTask(id={self.id})>"
@@ -629,23 +837,31 @@ class AgentMemory(Base):
     """AgentMemory model"""
     __tablename__ = "agent_memories"
 
+    __table_args__ = (
+        Index("agent_memories_memoryType_idx", "memoryType"),
+        Index("agent_memories_scope_idx", "scope"),
+        Index("agent_memories_confidence_idx", "confidence"),
+        Index("agent_memories_usageCount_idx", "usageCount"),
+        Index("agent_memories_lastUsed_idx", "lastUsed"),
+    )
+
     id = Column(String, primary_key=True)
     memoryType = Column(String)
     key = Column(String, unique=True)
     value = Column(JSON)
     scope = Column(String, nullable=True)  # Optional
     context = Column(JSON, nullable=True)  # Optional
-    confidence = Column(Float)
-    usageCount = Column(Integer)
+    confidence = Column(Float, default=0.5)
+    usageCount = Column(Integer, default=0)
     lastUsed = Column(DateTime, nullable=True)  # Optional
-    successCount = Column(Integer)
-    failureCount = Column(Integer)
+    successCount = Column(Integer, default=0)
+    failureCount = Column(Integer, default=0)
     source = Column(String, nullable=True)  # Optional
     description = Column(String, nullable=True)  # Optional
-    isActive = Column(Boolean)
+    isActive = Column(Boolean, default=True)
     expiresAt = Column(DateTime, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<AgentMemory(id={self.id})>"
@@ -654,26 +870,32 @@ class ScrapingSource(Base):
     """ScrapingSource model"""
     __tablename__ = "scraping_sources"
 
+    __table_args__ = (
+        Index("scraping_sources_name_idx", "name"),
+        Index("scraping_sources_sourceType_idx", "sourceType"),
+        Index("scraping_sources_isActive_idx", "isActive"),
+    )
+
     id = Column(String, primary_key=True)
     name = Column(String, unique=True)
     baseUrl = Column(String)
-    sourceType = Column(String)
-    isActive = Column(Boolean)
-    requiresAuth = Column(Boolean)
+    sourceType = Column(String, default="portal")
+    isActive = Column(Boolean, default=True)
+    requiresAuth = Column(Boolean, default=False)
     aiKnowledge = Column(JSON, nullable=True)  # Optional
     lastLearning = Column(DateTime, nullable=True)  # Optional
     credentials = Column(JSON, nullable=True)  # Optional
-    successRate = Column(Float)
-    avgResponseTime = Column(Integer)
-    totalJobs = Column(Integer)
-    successfulJobs = Column(Integer)
-    failedJobs = Column(Integer)
+    successRate = Column(Float, default=0)
+    avgResponseTime = Column(Integer, default=0)
+    totalJobs = Column(Integer, default=0)
+    successfulJobs = Column(Integer, default=0)
+    failedJobs = Column(Integer, default=0)
     rateLimit = Column(Float, nullable=True)  # Optional
     lastRequestAt = Column(DateTime, nullable=True)  # Optional
     description = Column(String, nullable=True)  # Optional
     notes = Column(String, nullable=True)  # Optional
     createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<ScrapingSource(id={self.id})>"
@@ -52,6 +52,7 @@ class BrowserManager:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.session_manager = None
+        self._start_lock = asyncio.Lock()
 
         logger.info(f"BrowserManager initialized (profile: {self.profile_name})")
 
@@ -142,7 +143,10 @@ class BrowserManager:
             Page object
         """
         if not self.context:
-            await self.start()
+            # Concurrent first pages must not launch two browsers
+            async with self._start_lock:
+                if not self.context:
+                    await self.start()
 
         page = await self.context.new_page()
 
@@ -164,22 +168,28 @@ class BrowserManager:
 
         return page
 
-    async def navigate_with_session(self, url: str, wait_until: str = "networkidle") -> Page:
+    async def navigate_with_session(
+        self,
+        url: str,
+        wait_until: str = "networkidle",
+        with_response: bool = False,
+    ):
         """
         Navigate to URL and restore session storage if available
 
         Args:
             url: URL to navigate to
             wait_until: Wait until condition (networkidle, domcontentloaded, load)
+            with_response: Also return the main document Response
 
         Returns:
-            Page object
+            Page object, or (Page, Response or None) with with_response
         """
         page = await self.new_page()
 
         try:
             # Navigate first
-            await page.goto(url, wait_until=wait_until, timeout=30000)
+            response = await page.goto(url, wait_until=wait_until, timeout=30000)
             logger.info(f"Navigated to {url}")
 
             # Restore storage if session exists
@@ -190,9 +200,11 @@ class BrowserManager:
                 )
 
                 # Reload to apply storage
-                await page.reload(wait_until=wait_until, timeout=30000)
+                response = await page.reload(wait_until=wait_until, timeout=30000) or response
                 logger.debug("Page reloaded with session storage")
 
+            if with_response:
+                return page, response
             return page
 
         except Exception as e:
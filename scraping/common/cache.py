@@ -2,125 +2,461 @@
 Cache Manager for Scraping
 """
 
+import copy
 import json
 import hashlib
+import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Hashable, Tuple
 import logging
 
 from ..config import settings
 
+try:
+    import zstandard
+except ImportError:  # zlib is used instead
+    zstandard = None
+
 
 logger = logging.getLogger(__name__)
 
 
+# Database file inside CACHE_DIR, shared by all portals
+CACHE_FILE = "cache.db"
+
+# Bumped when the table layout changes; older cache files are dropped
+SCHEMA_VERSION = 2
+
+# Values at least this large (e.g. page HTML) are stored compressed
+COMPRESS_MIN_BYTES = 1024
+
+# Size of the memory-mapped window over the database file
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Share of the disk cap kept after an eviction, so evictions run in batches
+EVICT_TO = 0.9
+
+# Seconds between writes of the read times of memory hits to the disk tier
+TOUCH_FLUSH_SECONDS = 5.0
+
+
+def _compress(payload: bytes) -> Tuple[bytes, str]:
+    """(stored bytes, compression name) for a serialized value"""
+    if len(payload) < COMPRESS_MIN_BYTES:
+        return payload, "none"
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(payload), "zstd"
+    return zlib.compress(payload, 6), "zlib"
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def _copy(value: Any) -> Any:
+    """Copy of a JSON value, so callers never share the hot tier's objects"""
+    return value if isinstance(value, str) else copy.deepcopy(value)
+
+
+class MemoryLRU:
+    """
+    In-process LRU of decoded values, bounded by their serialized size
+
+    Entries keep their expiry time, so the hot tier never outlives the
+    TTL of the disk tier.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: int, expires_at: float):
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, expires_at)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """Drop the entries whose key matches predicate"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._remove(key)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+
+# Hot tier shared by the caches of this process (created on first use)
+_memory_tier: Optional[MemoryLRU] = None
+_memory_tier_lock = threading.Lock()
+
+
+def get_memory_tier() -> MemoryLRU:
+    global _memory_tier
+    with _memory_tier_lock:
+        if _memory_tier is None:
+            _memory_tier = MemoryLRU(settings.cache_memory_max_bytes)
+        return _memory_tier
+
+
 class Cache:
     """
-    File-based cache for scraping results
+    Two-tier cache for scraping results
+
+    Reads go to an in-process LRU of hot keys (shared by the scrapers of
+    the process) and then to a SQLite file in CACHE_DIR, shared by all
+    portals. Entries are looked up by a 64-bit hash of (portal, key), the
+    table's integer primary key, and expired with one DELETE on the
+    indexed expires_at column. Strings (page HTML) are stored as UTF-8,
+    other values as JSON; both are compressed with zstd (zlib without
+    zstandard) above COMPRESS_MIN_BYTES.
 
-    Stores cached data as JSON files organized by portal
+    The file is capped at CACHE_MAX_BYTES of stored values: past the cap
+    the least recently read entries are evicted. Triggers keep the total
+    in a one-row table, so checking the cap costs one lookup. Reads served
+    by the hot tier update accessed_at too, in batches written at most
+    every TOUCH_FLUSH_SECONDS (and before an eviction).
+
+    Values other than strings are copied in and out of the hot tier.
     """
 
-    def __init__(self, portal: str):
+    def __init__(
+        self,
+        portal: str,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        memory: Optional[MemoryLRU] = None,
+    ):
+        """
+        Args:
+            portal: Portal name (namespace of the keys)
+            cache_dir: Directory of the cache file (default: CACHE_DIR)
+            ttl: Default time to live in seconds (default: CACHE_TTL)
+            max_bytes: Cap of the disk tier (default: CACHE_MAX_BYTES)
+            memory: Hot tier (default: the process one, CACHE_MEMORY_MAX_BYTES)
+        """
         self.portal = portal
-        self.cache_dir = Path(settings.cache_dir) / portal
+        self.cache_dir = Path(cache_dir or settings.cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.ttl = settings.cache_ttl
+        self.ttl = ttl or settings.cache_ttl
+        self.max_bytes = max_bytes or settings.cache_max_bytes
+        self.memory = memory if memory is not None else get_memory_tier()
+        self.path = self.cache_dir / CACHE_FILE
 
-    def _get_cache_path(self, key: str) -> Path:
-        """Get cache file path for key"""
-        # Hash key to create filename
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.json"
+        self.counters: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+        }
 
-    def exists(self, key: str) -> bool:
-        """Check if key exists in cache and is not expired"""
-        cache_path = self._get_cache_path(key)
+        # Read times of memory hits not yet written, by key hash
+        self._touched: Dict[int, float] = {}
+        self._touched_flushed = time.monotonic()
 
-        if not cache_path.exists():
-            return False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._setup()
+        self.clear_expired()
 
-        # Check expiration
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                expires_at = data.get("expires_at", 0)
+    def _setup(self):
+        """Create (or recreate, on a schema change) the cache tables"""
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+        with self._lock:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS cache_entries")
+                conn.execute("DROP TABLE IF EXISTS cache_size")
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+            # value last: the other columns are read without touching
+            # its overflow pages
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key_hash INTEGER PRIMARY KEY,
+                    portal TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    encoding TEXT NOT NULL,
+                    compression TEXT NOT NULL,
+                    cached_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    value BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS cache_entries_expires_at_idx ON cache_entries (expires_at);
+                CREATE INDEX IF NOT EXISTS cache_entries_accessed_at_idx ON cache_entries (accessed_at);
+
+                CREATE TABLE IF NOT EXISTS cache_size (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_bytes INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO cache_size (id, total_bytes) VALUES (1, 0);
+
+                CREATE TRIGGER IF NOT EXISTS cache_entries_size_insert AFTER INSERT ON cache_entries
+                BEGIN
+                    UPDATE cache_size SET total_bytes = total_bytes + NEW.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS cache_entries_size_update AFTER UPDATE OF size ON cache_entries
+                BEGIN
+                    UPDATE cache_size SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS cache_entries_size_delete AFTER DELETE ON cache_entries
+                BEGIN
+                    UPDATE cache_size SET total_bytes = total_bytes - OLD.size WHERE id = 1;
+                END;
+                """
+            )
 
-                if time.time() > expires_at:
-                    # Expired, remove file
-                    cache_path.unlink()
-                    return False
+    def _key_hash(self, key: str) -> int:
+        """Signed 64-bit hash of (portal, key), the row id of the entry"""
+        digest = hashlib.blake2b(f"{self.portal}\0{key}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
 
-                return True
+    def _memory_key(self, key: str) -> Tuple[str, str, str]:
+        return (str(self.path), self.portal, key)
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in cache and is not expired"""
+        if self.memory.get(self._memory_key(key)) is not None:
+            return True
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT key FROM cache_entries WHERE key_hash = ? AND expires_at > ?",
+                    (self._key_hash(key), time.time())
+                ).fetchone()
+            return row is not None and row[0] == key
 
         except Exception as e:
-            logger.warning(f"Error reading cache {cache_path}: {e}")
+            logger.warning(f"Error reading cache {key}: {e}")
             return False
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if not self.exists(key):
-            return None
-
-        cache_path = self._get_cache_path(key)
+        value = self.memory.get(self._memory_key(key))
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            self._touch(key)
+            return _copy(value)
 
         try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("value")
+            key_hash = self._key_hash(key)
+            now = time.time()
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT key, value, encoding, compression, expires_at FROM cache_entries "
+                    "WHERE key_hash = ? AND expires_at > ?",
+                    (key_hash, now)
+                ).fetchone()
+
+                # Missing, expired, or a hash collision with another key
+                if row is None or row[0] != key:
+                    self.counters["misses"] += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key_hash = ?", (now, key_hash)
+                )
+
+            payload = _decompress(row[1], row[3])
+            value = payload.decode("utf-8") if row[2] == "str" else json.loads(payload)
+
+            self.counters["disk_hits"] += 1
+            self.memory.set(self._memory_key(key), _copy(value), len(payload), row[4])
+            return value
 
         except Exception as e:
-            logger.error(f"Error loading cache {cache_path}: {e}")
+            logger.error(f"Error loading cache {key}: {e}")
             return None
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """Set value in cache"""
-        cache_path = self._get_cache_path(key)
         ttl = ttl or self.ttl
-        expires_at = time.time() + ttl
-
-        data = {
-            "key": key,
-            "value": value,
-            "cached_at": time.time(),
-            "expires_at": expires_at,
-        }
+        now = time.time()
 
         try:
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if isinstance(value, str):
+                payload, encoding = value.encode("utf-8"), "str"
+            else:
+                payload, encoding = json.dumps(value, ensure_ascii=False).encode("utf-8"), "json"
+            data, compression = _compress(payload)
+
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO cache_entries "
+                    "(key_hash, portal, key, size, encoding, compression, cached_at, expires_at, accessed_at, value) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key_hash) DO UPDATE SET "
+                    "portal = excluded.portal, key = excluded.key, size = excluded.size, "
+                    "encoding = excluded.encoding, compression = excluded.compression, "
+                    "cached_at = excluded.cached_at, expires_at = excluded.expires_at, "
+                    "accessed_at = excluded.accessed_at, value = excluded.value",
+                    (self._key_hash(key), self.portal, key, len(data), encoding, compression,
+                     now, now + ttl, now, data)
+                )
+                self.counters["sets"] += 1
+                self._evict_over_cap()
 
+            self.memory.set(self._memory_key(key), _copy(value), len(payload), now + ttl)
             logger.debug(f"Cached {key} (expires in {ttl}s)")
 
         except Exception as e:
-            logger.error(f"Error saving cache {cache_path}: {e}")
+            logger.error(f"Error saving cache {key}: {e}")
+
+    def _touch(self, key: str):
+        """Record a memory hit; writes the pending read times when they are due"""
+        try:
+            with self._lock:
+                self._touched[self._key_hash(key)] = time.time()
+                if time.monotonic() - self._touched_flushed >= TOUCH_FLUSH_SECONDS:
+                    self._flush_touched()
+        except Exception as e:
+            logger.warning(f"Error updating cache read time {key}: {e}")
+
+    def _flush_touched(self):
+        """Write the read times of memory hits to accessed_at (lock held)"""
+        touched, self._touched = self._touched, {}
+        self._touched_flushed = time.monotonic()
+        if not touched:
+            return
+
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE key_hash = ?",
+            [(accessed_at, key_hash) for key_hash, accessed_at in touched.items()]
+        )
+        self._conn.execute("COMMIT")
+
+    def _evict_over_cap(self):
+        """Delete least recently read entries until the file is under EVICT_TO of the cap"""
+        total = self._conn.execute("SELECT total_bytes FROM cache_size WHERE id = 1").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Memory hits count as reads: write their times before picking victims
+        self._flush_touched()
+
+        excess = total - int(self.max_bytes * EVICT_TO)
+        victims, freed = [], 0
+        cursor = self._conn.execute("SELECT key_hash, size FROM cache_entries ORDER BY accessed_at")
+        for key_hash, size in cursor:
+            victims.append((key_hash,))
+            freed += size
+            if freed >= excess:
+                break
+        cursor.close()
+
+        self._conn.execute("BEGIN")
+        self._conn.executemany("DELETE FROM cache_entries WHERE key_hash = ?", victims)
+        self._conn.execute("COMMIT")
+
+        self.counters["disk_evictions"] += len(victims)
+        logger.info(f"Cache over {self.max_bytes} bytes: evicted {len(victims)} entries ({freed} bytes)")
 
     def clear(self):
         """Clear all cache for this portal"""
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                cache_file.unlink()
-            except Exception as e:
-                logger.error(f"Error deleting cache file {cache_file}: {e}")
+        path, portal = str(self.path), self.portal
+        self.memory.discard(lambda key: key[0] == path and key[1] == portal)
+
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM cache_entries WHERE portal = ?", (self.portal,))
+        except Exception as e:
+            logger.error(f"Error clearing cache for {self.portal}: {e}")
+            return
 
         logger.info(f"Cleared cache for {self.portal}")
 
     def clear_expired(self):
-        """Remove expired cache files"""
-        count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    expires_at = data.get("expires_at", 0)
+        """Remove expired entries (of every portal)"""
+        try:
+            with self._lock:
+                count = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+        except Exception as e:
+            logger.warning(f"Error removing expired cache entries: {e}")
+            return
 
-                    if time.time() > expires_at:
-                        cache_file.unlink()
-                        count += 1
+        self.counters["expired"] += count
+        if count > 0:
+            logger.info(f"Removed {count} expired cache entries")
 
-            except Exception as e:
-                logger.warning(f"Error checking cache file {cache_file}: {e}")
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit, miss and eviction counters of this cache, with tier sizes
 
-        if count > 0:
-            logger.info(f"Removed {count} expired cache files for {self.portal}")
+        Returns:
+            Counters, hit_rate (hits over reads), disk_bytes and memory
+            tier bytes/entries/evictions (the latter shared by the process)
+        """
+        reads = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+
+        with self._lock:
+            disk_bytes = self._conn.execute("SELECT total_bytes FROM cache_size WHERE id = 1").fetchone()[0]
+
+        return {
+            **self.counters,
+            "hit_rate": round(hits / reads, 4) if reads else None,
+            "disk_bytes": disk_bytes,
+            "disk_max_bytes": self.max_bytes,
+            "memory_bytes": self.memory.bytes,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+        }
+
+    def close(self):
+        """Write pending read times and close the database connection"""
+        with self._lock:
+            try:
+                self._flush_touched()
+            except Exception as e:
+                logger.warning(f"Error updating cache read times: {e}")
+            self._conn.close()
@@ -0,0 +1,66 @@
+"""
+Paged Fetch - bounded-concurrency fetching of numbered result pages
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int], Awaitable[List[Dict]]],
+    max_pages: int,
+    concurrency: int = 1,
+) -> List[Dict]:
+    """
+    Fetch pages 1..max_pages with up to `concurrency` pages in flight
+
+    Pages are started in order. Once a page comes back empty no later page
+    is started, and pages after it that were already in flight are
+    discarded, so the result is the same as fetching one page at a time
+    and stopping at the first empty one. Pacing is left to fetch_page
+    (the scraper rate limiter).
+
+    Args:
+        fetch_page: Coroutine function returning the listings of a page number
+        max_pages: Last page number to fetch
+        concurrency: Maximum pages in flight
+
+    Returns:
+        Listings of the pages before the first empty one, in page order.
+        Pages whose fetch raised are logged and skipped.
+    """
+    results: Dict[int, Optional[List[Dict]]] = {}
+    next_page = 1
+    last_page = max_pages
+
+    async def worker():
+        nonlocal next_page, last_page
+
+        while next_page <= last_page:
+            page_num = next_page
+            next_page += 1
+
+            try:
+                listings = await fetch_page(page_num)
+            except Exception as e:
+                logger.error(f"Error fetching page {page_num}: {e}")
+                results[page_num] = None
+                continue
+
+            results[page_num] = listings
+            if not listings and page_num <= last_page:
+                logger.info(f"Page {page_num} is empty, not fetching later pages")
+                last_page = page_num
+
+    workers = max(1, min(concurrency, max_pages))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+    all_listings = []
+    for page_num in range(1, last_page + 1):
+        all_listings.extend(results.get(page_num) or [])
+
+    return all_listings
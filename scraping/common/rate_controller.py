@@ -0,0 +1,139 @@
+"""
+Adaptive Rate Controller
+AIMD tuning of the per-portal request rate from portal response signals
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Signals that the portal wants us to slow down
+THROTTLE_SIGNALS = ("http_429", "http_403", "captcha", "timeout")
+
+
+def adaptive_ceiling(rate: float, max_rate: float, global_rps: Optional[float] = None) -> float:
+    """
+    Highest rate the controller may reach
+
+    At least the starting rate and max_rate, but never above the global
+    budget shared by every portal (the global bucket would hold the pace
+    there anyway).
+    """
+    ceiling = max(rate, max_rate)
+    return min(ceiling, global_rps) if global_rps else ceiling
+
+
+class ThrottledError(Exception):
+    """The portal answered with a block (429/403) or a captcha"""
+
+    def __init__(self, url: str, signal: str):
+        super().__init__(f"Throttled by portal ({signal}): {url}")
+        self.url = url
+        self.signal = signal
+
+
+class AdaptiveRateController:
+    """
+    Additive increase / multiplicative decrease of a request rate
+
+    Every successful, not slow response adds `increase` requests per
+    second; a throttle signal (429, 403, captcha, navigation timeout)
+    multiplies the rate by `decrease`. Decreases are at most one per
+    `cooldown` seconds, so one block seen by several concurrent tabs
+    halves the rate once. Response times are tracked as an exponential
+    moving average; a response slower than `slow_factor` times the
+    average holds the rate instead of increasing it.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 0.05,
+        max_rate: float = 5.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        cooldown: float = 10.0,
+        slow_factor: float = 2.0,
+        smoothing: float = 0.2,
+        avg_response_ms: Optional[float] = None,
+        on_change: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Args:
+            rate: Starting rate (requests per second)
+            min_rate: Lowest rate after decreases
+            max_rate: Highest rate after increases
+            increase: Requests per second added per good response
+            decrease: Factor applied on a throttle signal
+            cooldown: Minimum seconds between two decreases
+            slow_factor: Response time over average that counts as slow
+            smoothing: Weight of the last response in the moving average
+            avg_response_ms: Starting average response time
+            on_change: Called with the new rate whenever it changes
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.slow_factor = slow_factor
+        self.smoothing = smoothing
+        self.avg_response_ms = avg_response_ms or None
+        self.on_change = on_change
+
+        self.successes = 0
+        self.throttles = 0
+        self._last_decrease = float("-inf")
+
+    def _set_rate(self, rate: float):
+        rate = round(min(max(rate, self.min_rate), self.max_rate), 4)
+        if rate != self.rate:
+            self.rate = rate
+            if self.on_change:
+                self.on_change(rate)
+
+    def restore(self, rate: float, avg_response_ms: Optional[float] = None):
+        """Start from a rate (and average response time) learned earlier"""
+        if avg_response_ms:
+            self.avg_response_ms = avg_response_ms
+        self._set_rate(rate)
+
+    def record_success(self, response_ms: float):
+        """A page loaded normally in response_ms milliseconds"""
+        self.successes += 1
+        slow = (
+            self.avg_response_ms is not None
+            and response_ms > self.slow_factor * self.avg_response_ms
+        )
+
+        if self.avg_response_ms is None:
+            self.avg_response_ms = response_ms
+        else:
+            self.avg_response_ms += self.smoothing * (response_ms - self.avg_response_ms)
+
+        if slow:
+            logger.debug(f"Slow response ({response_ms:.0f}ms), holding rate at {self.rate}")
+            return
+
+        self._set_rate(self.rate + self.increase)
+
+    def record_throttle(self, signal: str):
+        """
+        The portal pushed back
+
+        Args:
+            signal: One of THROTTLE_SIGNALS
+        """
+        self.throttles += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+
+        self._last_decrease = now
+        self._set_rate(self.rate * self.decrease)
+        logger.warning(f"Throttle signal ({signal}), rate lowered to {self.rate} req/s")
@@ -2,58 +2,268 @@
 Rate Limiter for Scraping
 """
 
+import asyncio
+import sqlite3
+import threading
 import time
 import logging
-from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """
+    In-process token bucket
+
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second.
+    Callers reserve a token and sleep the returned delay: the balance may
+    go negative, so concurrent waiters are queued in reservation order
+    (first come, first served) without holding a lock while sleeping.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token; returns the seconds to wait before using it"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def refund(self):
+        """Give back a reserved token that was not used"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def set_rate(self, rate: float):
+        """Change the refill rate (tokens earned so far keep the old rate)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class SharedBucketState:
+    """
+    Token buckets stored in a SQLite file, shared by worker processes
+
+    Every reservation is one BEGIN IMMEDIATE transaction, so processes
+    reserve in turn and the same first-come ordering holds across them.
+    Wall-clock time is used since monotonic clocks are per process.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        connection = self._connect()
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        """Take one token from a bucket; returns the seconds to wait before using it"""
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT tokens, updated FROM token_buckets WHERE key = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            tokens -= 1
+
+            connection.execute(
+                "INSERT INTO token_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now)
+            )
+            connection.execute("COMMIT")
+            return max(0.0, -tokens / rate)
+        finally:
+            connection.close()
+
+    def refund(self, key: str, capacity: float):
+        """Give back a reserved token that was not used"""
+        connection = self._connect()
+        try:
+            connection.execute(
+                "UPDATE token_buckets SET tokens = MIN(?, tokens + 1) WHERE key = ?",
+                (capacity, key)
+            )
+        finally:
+            connection.close()
+
+    def reset(self, keys: List[str]):
+        connection = self._connect()
+        try:
+            connection.executemany("DELETE FROM token_buckets WHERE key = ?", [(key,) for key in keys])
+        finally:
+            connection.close()
+
+
+# In-process buckets by key, shared by every RateLimiter of the process
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(key: str, rate: float, capacity: float) -> TokenBucket:
+    """In-process bucket for a key, created on first use"""
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, capacity)
+        return bucket
+
+
 class RateLimiter:
     """
     Token bucket rate limiter
 
-    Ensures requests are spaced out according to configured rate
+    A request takes one token from each of:
+    - the portal bucket (requests_per_second)
+    - the bucket of the URL host (host_rps, default: follows the portal rate)
+    - the global bucket (global_rps, e.g. SCRAPING_RATE_LIMIT_RPS), if set
+
+    Buckets live in this process, shared by all scrapers of a portal, or
+    in a SQLite file (state_path) so several worker processes share the
+    same budgets.
     """
 
-    def __init__(self, requests_per_second: float = 1.0, burst: int = 5):
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        burst: int = 5,
+        portal: str = "default",
+        host_rps: Optional[float] = None,
+        global_rps: Optional[float] = None,
+        state_path: Optional[str] = None,
+    ):
         """
         Initialize rate limiter
 
         Args:
-            requests_per_second: Maximum requests per second
-            burst: Maximum burst size
+            requests_per_second: Maximum requests per second to the portal
+            burst: Maximum burst size (bucket capacity)
+            portal: Portal name, key of the portal bucket
+            host_rps: Maximum requests per second to one host (None: the portal rate,
+                also after set_rate)
+            global_rps: Maximum requests per second across all portals
+            state_path: SQLite file holding the buckets shared between processes
         """
         self.rate = requests_per_second
         self.burst = burst
-        self.interval = 1.0 / requests_per_second
-        self.timestamps = deque(maxlen=burst)
+        self.portal = portal
+        self.host_rps = host_rps or requests_per_second
+        self._host_follows_rate = not host_rps
+        self.global_rps = global_rps
+        self.shared = SharedBucketState(state_path) if state_path else None
+        self._hosts = set()
+
+    def _limits(self, url: Optional[str]) -> List[Tuple[str, float]]:
+        """(bucket key, rate) of the buckets a request to url draws from"""
+        limits = [(f"portal:{self.portal}", self.rate)]
+
+        host = urlparse(url).hostname if url else None
+        if host:
+            self._hosts.add(host)
+            limits.append((f"host:{host}", self.host_rps))
+
+        if self.global_rps:
+            limits.append(("global", self.global_rps))
+
+        return limits
+
+    def _reserve(self, limits: List[Tuple[str, float]]) -> float:
+        if self.shared:
+            return max(self.shared.reserve(key, rate, self.burst) for key, rate in limits)
+
+        delay = 0.0
+        for key, rate in limits:
+            bucket = get_bucket(key, rate, self.burst)
+            if bucket.rate != rate:
+                bucket.set_rate(rate)
+            delay = max(delay, bucket.reserve())
+        return delay
 
-    def wait(self):
+    def _refund(self, limits: List[Tuple[str, float]]):
+        for key, rate in limits:
+            if self.shared:
+                self.shared.refund(key, self.burst)
+            else:
+                get_bucket(key, rate, self.burst).refund()
+
+    async def acquire(self, url: Optional[str] = None):
         """
-        Wait if necessary to respect rate limit
+        Wait for a token without blocking the event loop
+
+        Call before each request. Waiters are served in arrival order; a
+        waiter cancelled while sleeping gives its token back.
 
-        This should be called before each request
+        Args:
+            url: URL about to be requested (selects the host bucket)
         """
-        now = time.time()
+        limits = self._limits(url)
+        if self.shared:
+            delay = await asyncio.to_thread(self._reserve, limits)
+        else:
+            delay = self._reserve(limits)
 
-        # If we have burst tokens, check if we need to wait
-        if len(self.timestamps) >= self.burst:
-            # Get oldest timestamp
-            oldest = self.timestamps[0]
-            time_passed = now - oldest
+        if delay > 0:
+            logger.debug(f"Rate limiting: sleeping {delay:.3f}s")
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._refund(limits)
+                raise
 
-            # If not enough time has passed, wait
-            if time_passed < self.interval:
-                sleep_time = self.interval - time_passed
-                logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
-                time.sleep(sleep_time)
-                now = time.time()
+    def wait(self, url: Optional[str] = None):
+        """
+        Blocking version of acquire() for synchronous callers
 
-        # Record this request
-        self.timestamps.append(now)
+        Never call it from a coroutine: it stops the whole event loop.
+        """
+        delay = self._reserve(self._limits(url))
+        if delay > 0:
+            logger.debug(f"Rate limiting: sleeping {delay:.3f}s")
+            time.sleep(delay)
+
+    def set_rate(self, requests_per_second: float):
+        """
+        Change the portal rate (applies from the next request)
+
+        A host rate left to its default follows it; an explicit host_rps
+        and the global rate are kept.
+        """
+        self.rate = requests_per_second
+        if self._host_follows_rate:
+            self.host_rps = requests_per_second
 
     def reset(self):
-        """Reset rate limiter"""
-        self.timestamps.clear()
+        """Reset rate limiter (refill the buckets it used)"""
+        keys = [key for key, _ in self._limits(None)] + [f"host:{host}" for host in self._hosts]
+        if self.shared:
+            self.shared.reset(keys)
+            return
+
+        with _buckets_lock:
+            for key in keys:
+                _buckets.pop(key, None)
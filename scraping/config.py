@@ -44,6 +44,14 @@ class ScrapingSettings(BaseSettings):
         default=86400,  # 24 hours
         alias="CACHE_TTL"
     )
+    cache_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,  # 1 GiB on disk, least recently used evicted first
+        alias="CACHE_MAX_BYTES"
+    )
+    cache_memory_max_bytes: int = Field(
+        default=64 * 1024 * 1024,  # in-process hot tier
+        alias="CACHE_MEMORY_MAX_BYTES"
+    )
 
     # Rate Limiting
     rate_limit_rps: float = Field(
@@ -54,6 +62,18 @@ class ScrapingSettings(BaseSettings):
         default=5,
         alias="SCRAPING_RATE_LIMIT_BURST"
     )
+    rate_limit_state: Optional[str] = Field(
+        default=None,  # SQLite file shared by worker processes (None = per process)
+        alias="SCRAPING_RATE_LIMIT_STATE"
+    )
+    adaptive_rate: bool = Field(
+        default=True,  # tune each portal rate from 429/403, captchas and timeouts
+        alias="SCRAPING_ADAPTIVE_RATE"
+    )
+    rate_limit_max_rps: float = Field(
+        default=2.0,  # ceiling of the adaptive rate (capped at SCRAPING_RATE_LIMIT_RPS)
+        alias="SCRAPING_RATE_LIMIT_MAX_RPS"
+    )
 
     # Retry Logic
     max_retries: int = Field(
@@ -116,6 +136,10 @@ class ScrapingSettings(BaseSettings):
         default=1000,
         alias="SCRAPING_MAX_LISTINGS"
     )
+    max_concurrent_pages: int = Field(
+        default=3,  # search result pages in flight (browser tabs)
+        alias="SCRAPING_MAX_CONCURRENT_PAGES"
+    )
 
     # Verification
     verify_ssl: bool = Field(
@@ -0,0 +1,71 @@
+"""
+Dedup Index
+In-memory set of the listings already saved for a source, preloaded per job
+"""
+
+import hashlib
+import logging
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def url_key(source_url: str) -> int:
+    """64-bit key of a listing URL (collisions are ~1e-7 at a million URLs)"""
+    return int.from_bytes(hashlib.blake2b(source_url.encode(), digest_size=8).digest(), "big")
+
+
+def hash_key(content_hash: str) -> int:
+    """Integer form of a 16 hex chars content hash (exact, 64 bits)"""
+    return int(content_hash, 16)
+
+
+class DedupIndex:
+    """
+    Content hashes and URLs of the saved listings of one source
+
+    Both are kept as 64-bit ints in plain sets (~60 bytes per entry), so
+    most duplicates of a large scrape are rejected without querying the
+    database. A miss is not proof of novelty for listings saved by other
+    processes after loading: the unique (source, contentHash) index stays
+    the final check.
+    """
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Source portal name (e.g., "immobiliare_it")
+        """
+        self.source = source
+        self._hashes = set()
+        self._urls = set()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @classmethod
+    def from_rows(cls, source: str, rows: Iterable[Tuple[Optional[str], Optional[str]]]) -> "DedupIndex":
+        """
+        Build the index from (contentHash, sourceUrl) rows
+
+        Args:
+            source: Source portal name
+            rows: Pairs of content hash and source URL (either can be None)
+        """
+        index = cls(source)
+        for content_hash, source_url in rows:
+            index.add(content_hash, source_url)
+        return index
+
+    def contains(self, content_hash: Optional[str] = None, source_url: Optional[str] = None) -> bool:
+        """True if the content hash or the URL was already saved"""
+        if content_hash and hash_key(content_hash) in self._hashes:
+            return True
+        return bool(source_url) and url_key(source_url) in self._urls
+
+    def add(self, content_hash: Optional[str] = None, source_url: Optional[str] = None):
+        """Record a saved listing"""
+        if content_hash:
+            self._hashes.add(hash_key(content_hash))
+        if source_url:
+            self._urls.add(url_key(source_url))
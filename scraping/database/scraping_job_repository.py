@@ -10,21 +10,51 @@ Replaces in-memory job storage with persistent database storage.
 from typing import Optional, List, Dict
 from datetime import datetime
 import json
+import logging
 import sys
 import os
 from pathlib import Path
 
 # Add database module to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "database" / "python"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from database import get_db_context
-from models import ScrapingJob
-from sqlalchemy import desc
+from database.python.database import get_db_context
+from database.python.models import ScrapingJob, ScrapingJobStats
+from sqlalchemy import case, desc, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+logger = logging.getLogger(__name__)
+
+
+# Counters of scraping_job_stats, one row per portal
+STATS_COLUMNS = ("totalJobs", "successfulJobs", "failedJobs", "listingsFound", "listingsSaved")
+
+# Dialects with INSERT ... ON CONFLICT support
+INSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _job_counts(job: ScrapingJob) -> Dict[str, int]:
+    """What a job adds to the stats counters of its portal"""
+    return {
+        "totalJobs": 1,
+        "successfulJobs": int(job.status == "completed"),
+        "failedJobs": int(job.status == "failed"),
+        "listingsFound": job.listingsFound or 0,
+        "listingsSaved": job.listingsSaved or 0,
+    }
 
 
 class ScrapingJobRepository:
     """Repository for scraping job database operations"""
 
+    def __init__(self, materialized_stats: bool = True):
+        """
+        Args:
+            materialized_stats: Maintain the scraping_job_stats counters on
+                every job change and serve get_stats from them
+        """
+        self.materialized_stats = materialized_stats
+
     def create_job(
         self,
         job_id: str,
@@ -81,6 +111,7 @@ class ScrapingJobRepository:
             )
 
             db.add(job)
+            self._update_stats(db, portal, _job_counts(job))
             db.commit()
             db.refresh(job)
 
@@ -132,6 +163,8 @@ class ScrapingJobRepository:
             if not job:
                 return None
 
+            counts_before = _job_counts(job)
+
             job.status = status
 
             if started_at:
@@ -152,6 +185,12 @@ class ScrapingJobRepository:
             if duration is not None:
                 job.duration = duration
 
+            # Only status and listing changes (a job finishing) touch the stats
+            counts_after = _job_counts(job)
+            self._update_stats(db, job.portal, {
+                column: counts_after[column] - counts_before[column] for column in STATS_COLUMNS
+            })
+
             db.commit()
             db.refresh(job)
 
@@ -208,6 +247,9 @@ class ScrapingJobRepository:
             if not job:
                 return False
 
+            self._update_stats(db, job.portal, {
+                column: -count for column, count in _job_counts(job).items()
+            })
             db.delete(job)
             db.commit()
 
@@ -217,33 +259,142 @@ class ScrapingJobRepository:
         """
         Get aggregated statistics about scraping jobs
 
+        Reads the materialized per-portal counters when enabled (one row
+        per portal), otherwise a single GROUP BY over scraping_jobs.
+
         Returns:
             Dict with statistics
         """
         with get_db_context() as db:
-            all_jobs = db.query(ScrapingJob).all()
-
-            total_jobs = len(all_jobs)
-            successful_jobs = len([j for j in all_jobs if j.status == "completed"])
-            failed_jobs = len([j for j in all_jobs if j.status == "failed"])
-
-            total_listings_scraped = sum(j.listingsFound or 0 for j in all_jobs)
-            total_properties_saved = sum(j.listingsSaved or 0 for j in all_jobs)
-
-            # Count by portal
-            portals = {}
-            for job in all_jobs:
-                portal = job.portal
-                portals[portal] = portals.get(portal, 0) + 1
-
-            return {
-                "total_jobs": total_jobs,
-                "successful_jobs": successful_jobs,
-                "failed_jobs": failed_jobs,
-                "total_listings_scraped": total_listings_scraped,
-                "total_properties_saved": total_properties_saved,
-                "portals": portals,
+            rows = []
+            if self.materialized_stats:
+                try:
+                    rows = db.query(ScrapingJobStats).all()
+                except Exception as e:
+                    logger.warning(f"Scraping job stats not readable, aggregating jobs: {e}")
+                    db.rollback()
+
+            # Also covers counters never built (table created after the jobs)
+            if not rows:
+                rows = self._aggregate_stats(db)
+
+            # Counters that missed an update are aggregated from the jobs
+            stale = [row.portal for row in rows if getattr(row, "stale", False)]
+            if stale:
+                rows = [row for row in rows if row.portal not in stale]
+                rows += self._aggregate_stats(db, stale)
+
+            stats = {
+                "total_jobs": 0,
+                "successful_jobs": 0,
+                "failed_jobs": 0,
+                "total_listings_scraped": 0,
+                "total_properties_saved": 0,
+                "portals": {},
             }
+            for row in rows:
+                stats["total_jobs"] += row.totalJobs or 0
+                stats["successful_jobs"] += row.successfulJobs or 0
+                stats["failed_jobs"] += row.failedJobs or 0
+                stats["total_listings_scraped"] += row.listingsFound or 0
+                stats["total_properties_saved"] += row.listingsSaved or 0
+                if row.totalJobs:
+                    stats["portals"][row.portal] = row.totalJobs
+
+            return stats
+
+    def rebuild_stats(self) -> int:
+        """
+        Recompute the materialized counters from scraping_jobs
+
+        Use after enabling materialized_stats on a repository that ran
+        without it.
+
+        Returns:
+            Number of portals
+        """
+        with get_db_context() as db:
+            rows = self._aggregate_stats(db)
+            now = datetime.utcnow()
+
+            db.query(ScrapingJobStats).delete()
+            db.add_all([
+                ScrapingJobStats(
+                    portal=row.portal,
+                    stale=False,
+                    updatedAt=now,
+                    **{column: getattr(row, column) or 0 for column in STATS_COLUMNS}
+                )
+                for row in rows
+            ])
+            db.commit()
+
+            return len(rows)
+
+    def _aggregate_stats(self, db, portals: Optional[List[str]] = None) -> List:
+        """Per-portal counters computed by one GROUP BY over scraping_jobs"""
+        query = db.query(
+            ScrapingJob.portal.label("portal"),
+            func.count().label("totalJobs"),
+            func.sum(case((ScrapingJob.status == "completed", 1), else_=0)).label("successfulJobs"),
+            func.sum(case((ScrapingJob.status == "failed", 1), else_=0)).label("failedJobs"),
+            func.sum(ScrapingJob.listingsFound).label("listingsFound"),
+            func.sum(ScrapingJob.listingsSaved).label("listingsSaved"),
+        )
+        if portals is not None:
+            query = query.filter(ScrapingJob.portal.in_(portals))
+        return query.group_by(ScrapingJob.portal).all()
+
+    def _update_stats(self, db, portal: str, delta: Dict[str, int]):
+        """
+        Add delta to the counters of a portal, in the caller's transaction
+
+        Failures (e.g. the stats table not migrated yet) never fail the job
+        update: the portal row is flagged stale instead (later deltas keep
+        the flag), so get_stats aggregates that portal from scraping_jobs
+        until rebuild_stats() recomputes its counters.
+        """
+        if not self.materialized_stats or not any(delta.values()):
+            return
+
+        now = datetime.utcnow()
+        try:
+            with db.begin_nested():
+                insert = INSERT_DIALECTS.get(db.bind.dialect.name)
+                if insert is not None:
+                    table = ScrapingJobStats.__table__
+                    statement = insert(table).values(portal=portal, stale=False, updatedAt=now, **delta)
+                    db.execute(statement.on_conflict_do_update(
+                        index_elements=[table.c.portal],
+                        set_={
+                            "updatedAt": now,
+                            **{column: table.c[column] + delta[column] for column in STATS_COLUMNS},
+                        }
+                    ))
+                else:
+                    stats = db.get(ScrapingJobStats, portal)
+                    if stats is None:
+                        stats = ScrapingJobStats(portal=portal, stale=False, **{column: 0 for column in STATS_COLUMNS})
+                        db.add(stats)
+                    for column in STATS_COLUMNS:
+                        setattr(stats, column, getattr(stats, column) + delta[column])
+                    stats.updatedAt = now
+        except Exception as e:
+            logger.warning(f"Scraping job stats not updated for {portal}, marking them stale: {e}")
+            self._mark_stats_stale(db, portal, now)
+
+    def _mark_stats_stale(self, db, portal: str, now: datetime):
+        """Flag the counters of a portal as stale (see _update_stats)"""
+        try:
+            with db.begin_nested():
+                stats = db.get(ScrapingJobStats, portal)
+                if stats is None:
+                    stats = ScrapingJobStats(portal=portal)
+                    db.add(stats)
+                stats.stale = True
+                stats.updatedAt = now
+        except Exception as e:
+            logger.error(f"Scraping job stats for {portal} drifted and could not be marked stale: {e}")
 
     def to_dict(self, job: ScrapingJob) -> Dict:
         """
@@ -8,34 +8,151 @@ import json
 import logging
 from typing import Dict, Optional, List
 from datetime import datetime
+from decimal import Decimal
 import uuid
 
+from sqlalchemy import and_, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+
 # Database imports
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 from database.python.database import get_db_context
-from database.python.models import Property, Contact, Building
+from database.python.models import AuditLog, Property, Contact, Building, ScrapingSource
+from .dedup_index import DedupIndex
 
 
 logger = logging.getLogger(__name__)
 
 
+# Listings per multi-row INSERT (~35 columns each, well below the SQLite
+# and PostgreSQL bind parameter limits)
+DEFAULT_CHUNK_SIZE = 500
+
+# Dialects with INSERT ... ON CONFLICT support
+INSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Fields a re-scrape updates on an existing listing. Location, status and
+# features are left alone, they are verified by hand after the import.
+TRACKED_FIELDS = (
+    "priceSale", "priceRentMonthly", "sqmCommercial", "rooms", "bathrooms",
+    "title", "description", "condition", "energyClass", "floor",
+)
+PRICE_FIELDS = ("priceSale", "priceRentMonthly")
+
+
 class ScrapingRepository:
     """
     Handles saving scraped data to database
 
     Features:
-    - Deduplication by content hash
+    - Deduplication by URL and content hash (in memory, then indexed lookups)
+    - Bulk inserts in chunks, one transaction per batch
+    - Change detection on re-scraped listings, with price history
     - Automatic code generation
     - Location parsing
     - Type mapping
     - Error handling
     """
 
-    def __init__(self):
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            chunk_size: Listings per multi-row INSERT in save_properties_batch
+        """
+        self.chunk_size = chunk_size
+        # Dedup index per source: loaded by the first batch, then kept
+        # current with the rows this repository saves (one repository per job)
+        self._dedup_indexes: Dict[str, DedupIndex] = {}
         logger.info("ScrapingRepository initialized")
 
+    def load_dedup_index(self, source: str) -> DedupIndex:
+        """
+        Preload the content hashes and URLs already saved for a source
+
+        Args:
+            source: Source portal name
+
+        Returns:
+            DedupIndex for the source
+        """
+        with get_db_context() as db:
+            rows = db.query(Property.contentHash, Property.sourceUrl).filter(
+                Property.source == source
+            ).yield_per(10_000)
+            index = DedupIndex.from_rows(source, rows)
+
+        logger.info(f"Dedup index for {source}: {len(index)} content hashes")
+        return index
+
+    def get_dedup_index(self, source: str) -> DedupIndex:
+        """Dedup index of a source, loaded from the database on first use"""
+        index = self._dedup_indexes.get(source)
+        if index is None:
+            index = self._dedup_indexes[source] = self.load_dedup_index(source)
+        return index
+
+    def load_source_rate(self, source: str) -> Optional[tuple]:
+        """
+        Request rate learned by the previous jobs of a source
+
+        Args:
+            source: Source portal name
+
+        Returns:
+            (rateLimit, avgResponseTime in ms or None), None if never learned
+        """
+        with get_db_context() as db:
+            row = db.query(ScrapingSource.rateLimit, ScrapingSource.avgResponseTime).filter(
+                ScrapingSource.name == source
+            ).first()
+
+        if row is None or not row.rateLimit:
+            return None
+        return row.rateLimit, row.avgResponseTime or None
+
+    def save_source_rate(
+        self,
+        source: str,
+        base_url: str,
+        rate: float,
+        avg_response_ms: Optional[float]
+    ):
+        """
+        Store the request rate learned by a job (creates the source if missing)
+
+        Args:
+            source: Source portal name
+            base_url: Portal base URL (for a new source)
+            rate: Requests per second
+            avg_response_ms: Average response time in milliseconds (None keeps the stored one)
+        """
+        now = datetime.utcnow()
+        values = {"rateLimit": rate, "lastRequestAt": now, "updatedAt": now}
+        if avg_response_ms:
+            values["avgResponseTime"] = int(round(avg_response_ms))
+
+        with get_db_context() as db:
+            updated = db.query(ScrapingSource).filter(ScrapingSource.name == source).update(values)
+            if not updated:
+                db.add(ScrapingSource(
+                    id=str(uuid.uuid4()),
+                    name=source,
+                    baseUrl=base_url,
+                    sourceType="portal",
+                    isActive=True,
+                    requiresAuth=False,
+                    successRate=0.0,
+                    totalJobs=0,
+                    successfulJobs=0,
+                    failedJobs=0,
+                    createdAt=now,
+                    **{"avgResponseTime": 0, **values},
+                ))
+
+        logger.info(f"Saved learned rate for {source}: {rate} req/s")
+
     def save_property(self, data: Dict, source: str) -> Optional[str]:
         """
         Save scraped property to database
@@ -63,10 +180,11 @@ class ScrapingRepository:
                         logger.info(f"Property already exists: {source_url}")
                         return existing.id
 
-                # Check for duplicates by content hash
+                # Check for duplicates by content hash (unique per source)
                 content_hash = self._compute_content_hash(data)
-                existing_by_hash = db.query(Property).filter(
-                    Property.internalNotes == f"hash:{content_hash}"
+                existing_by_hash = db.query(Property.id).filter(
+                    Property.source == source,
+                    Property.contentHash == content_hash
                 ).first()
 
                 if existing_by_hash:
@@ -92,36 +210,193 @@ class ScrapingRepository:
     def save_properties_batch(
         self,
         properties: List[Dict],
-        source: str
+        source: str,
+        chunk_size: Optional[int] = None
     ) -> Dict[str, int]:
         """
         Save multiple properties in batch
 
+        Listings are hashed and mapped in memory, then each chunk costs one
+        lookup of the existing rows and one multi-row INSERT ... ON CONFLICT
+        DO NOTHING, all in a single transaction. Listings already saved under
+        the same URL are diffed on TRACKED_FIELDS: only changed rows are
+        updated (price changes also get an AuditLog record), unchanged ones
+        are not written at all.
+
         Args:
             properties: List of property dictionaries
             source: Source portal name
+            chunk_size: Listings per INSERT (default: the repository chunk size)
 
         Returns:
-            Dict with counts: {"saved": X, "skipped": Y, "errors": Z}
+            Dict with counts: {"saved": X, "updated": U, "skipped": Y, "errors": Z}
+            (unchanged listings count as skipped)
         """
-        counts = {"saved": 0, "skipped": 0, "errors": 0}
+        counts = {"saved": 0, "updated": 0, "skipped": 0, "errors": 0}
+        chunk_size = chunk_size or self.chunk_size
+
+        # Listings already saved for this source, so duplicates skip the database
+        dedup = self.get_dedup_index(source)
+        seen = DedupIndex(source)
 
+        rows = []
         for prop_data in properties:
             try:
-                property_id = self.save_property(prop_data, source)
+                content_hash = self._compute_content_hash(prop_data)
+                source_url = prop_data.get("source_url")
+
+                if seen.contains(content_hash, source_url):
+                    counts["skipped"] += 1
+                    continue
+                seen.add(content_hash, source_url)
 
-                if property_id:
-                    counts["saved"] += 1
-                else:
+                # Same content under another (or no) URL: nothing to update
+                known_url = bool(source_url) and dedup.contains(source_url=source_url)
+                if not known_url and dedup.contains(content_hash):
                     counts["skipped"] += 1
+                    continue
+
+                code = self._generate_property_code(source)
+                rows.append(self._map_to_property_model(prop_data, source, code, content_hash))
 
             except Exception as e:
-                logger.error(f"Error in batch save: {e}")
+                logger.error(f"Error mapping property: {e}")
                 counts["errors"] += 1
 
+        if rows:
+            stored = []
+            try:
+                with get_db_context() as db:
+                    for start in range(0, len(rows), chunk_size):
+                        chunk = rows[start:start + chunk_size]
+                        try:
+                            # Savepoint: a failing chunk does not discard the others
+                            with db.begin_nested():
+                                saved, updated = self._upsert_chunk(db, chunk, source)
+                            counts["saved"] += saved
+                            counts["updated"] += updated
+                            counts["skipped"] += len(chunk) - saved - updated
+                        except Exception as e:
+                            logger.error(f"Error in batch save: {e}")
+                            counts["errors"] += len(chunk)
+                            continue
+
+                        stored.extend(chunk)
+                    db.commit()
+
+                # Only committed rows join the index
+                for row in stored:
+                    dedup.add(row["contentHash"], row["sourceUrl"])
+
+            except Exception as e:
+                logger.error(f"Error committing batch: {e}", exc_info=True)
+                counts["errors"] += counts["saved"] + counts["updated"]
+                counts["saved"] = counts["updated"] = 0
+
         logger.info(f"Batch save complete: {counts}")
         return counts
 
+    def _upsert_chunk(self, db, rows: List[Dict], source: str) -> tuple:
+        """
+        Insert the new listings of a chunk and update the changed ones
+
+        Rows whose URL is already in the database are diffed against it;
+        rows whose content hash only is (another URL, or saved by another
+        process after the dedup index was loaded) are left out.
+
+        Returns:
+            (inserted, updated) row counts
+        """
+        urls = [row["sourceUrl"] for row in rows if row["sourceUrl"]]
+        hashes = [row["contentHash"] for row in rows]
+
+        matches = [and_(Property.source == source, Property.contentHash.in_(hashes))]
+        if urls:
+            matches.append(Property.sourceUrl.in_(urls))
+
+        tracked = [getattr(Property, field) for field in TRACKED_FIELDS]
+        existing = db.query(Property.id, Property.sourceUrl, Property.contentHash, *tracked).filter(
+            or_(*matches)
+        ).all()
+        existing_by_url = {row.sourceUrl: row for row in existing if row.sourceUrl}
+        existing_hashes = {row.contentHash: row.id for row in existing if row.contentHash}
+
+        now = datetime.utcnow()
+        new_rows, updates, price_changes = [], [], []
+        for row in rows:
+            current = existing_by_url.get(row["sourceUrl"])
+            if current is None:
+                if row["contentHash"] not in existing_hashes:
+                    new_rows.append(row)
+                continue
+
+            changes = self._diff_fields(current, row)
+            if not changes:
+                continue
+
+            # The hash follows the content, unless another listing already has it
+            if existing_hashes.get(row["contentHash"], current.id) == current.id:
+                changes["contentHash"] = row["contentHash"]
+            updates.append({"id": current.id, **changes, "updatedAt": now})
+
+            old_prices = {
+                field: self._json_value(getattr(current, field))
+                for field in PRICE_FIELDS if field in changes
+            }
+            if old_prices:
+                price_changes.append({
+                    "id": str(uuid.uuid4()),
+                    "entityType": "Property",
+                    "entityId": current.id,
+                    "action": "price_change",
+                    "oldValues": old_prices,
+                    "newValues": {field: changes[field] for field in old_prices},
+                    "userId": "system",
+                    "createdAt": now,
+                })
+
+        if updates:
+            db.execute(update(Property), updates)
+        if price_changes:
+            db.bulk_insert_mappings(AuditLog, price_changes)
+
+        return self._insert_rows(db, new_rows), len(updates)
+
+    def _insert_rows(self, db, rows: List[Dict]) -> int:
+        """Multi-row INSERT ... ON CONFLICT (source, contentHash) DO NOTHING, returns the rows inserted"""
+        if not rows:
+            return 0
+
+        insert = INSERT_DIALECTS.get(db.bind.dialect.name)
+        if insert is None:
+            # No ON CONFLICT: the lookup of _upsert_chunk is the only check
+            db.bulk_insert_mappings(Property, rows)
+            return len(rows)
+
+        # Only a (source, contentHash) twin is a duplicate, code or id collisions still raise
+        statement = insert(Property).values(rows).on_conflict_do_nothing(
+            index_elements=[Property.source, Property.contentHash]
+        ).returning(Property.id)
+        return len(db.execute(statement).fetchall())
+
+    def _diff_fields(self, current, row: Dict) -> Dict:
+        """
+        Tracked fields of a mapped listing that differ from the saved row
+
+        Fields missing from the scrape (None) never clear a saved value.
+        """
+        changes = {}
+        for field in TRACKED_FIELDS:
+            value = row.get(field)
+            if value is not None and self._json_value(getattr(current, field)) != value:
+                changes[field] = value
+        return changes
+
+    @staticmethod
+    def _json_value(value):
+        """Numeric columns come back as Decimal on PostgreSQL"""
+        return float(value) if isinstance(value, Decimal) else value
+
     def _generate_property_code(self, source: str) -> str:
         """Generate unique property code"""
         timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
@@ -185,6 +460,7 @@ class ScrapingRepository:
             "code": code,
             "source": source,
             "sourceUrl": data.get("source_url"),
+            "contentHash": content_hash,
             "importDate": datetime.utcnow(),
             "verified": False,
             "status": "draft",  # Requires manual verification
@@ -226,8 +502,8 @@ class ScrapingRepository:
             "energyClass": data.get("energyClass"),
             "floor": data.get("floor"),
 
-            # Internal notes with hash for dedup
-            "internalNotes": f"hash:{content_hash}\nScraped at: {datetime.utcnow().isoformat()}\nSource: {source}",
+            # Internal notes (dedup uses contentHash)
+            "internalNotes": f"Scraped at: {datetime.utcnow().isoformat()}\nSource: {source}",
 
             # Timestamps
             "createdAt": datetime.utcnow(),
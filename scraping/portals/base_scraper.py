@@ -5,15 +5,18 @@ All portal scrapers inherit from this class
 
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from ..config import settings
 from ..common.browser_manager import BrowserManager
 from ..common.cache import Cache
 from ..common.rate_limiter import RateLimiter
+from ..common.rate_controller import AdaptiveRateController, ThrottledError, adaptive_ceiling
 
 
 logger = logging.getLogger(__name__)
@@ -34,7 +37,15 @@ class BaseScraper(ABC):
 
     portal_name: str = "base"
     base_url: str = ""
-    rate_limit: float = 1.0  # requests per second
+    rate_limit: float = 1.0  # requests per second (starting rate with adaptive rate)
+
+    # HTML fragments of captcha / bot-check pages
+    captcha_markers: tuple = (
+        "captcha-delivery.com",
+        "g-recaptcha",
+        "h-captcha",
+        "cf-chl-",
+    )
 
     def __init__(
         self,
@@ -75,7 +86,22 @@ class BaseScraper(ABC):
 
         # Rate limiter
         if self.rate_limit_enabled:
-            self.rate_limiter = RateLimiter(requests_per_second=self.rate_limit)
+            self.rate_limiter = RateLimiter(
+                requests_per_second=self.rate_limit,
+                burst=settings.rate_limit_burst,
+                portal=self.portal_name,
+                global_rps=settings.rate_limit_rps,
+                state_path=settings.rate_limit_state,
+            )
+
+        # Adaptive rate (AIMD on portal signals), driving the limiter
+        self.rate_controller = None
+        if self.rate_limit_enabled and settings.adaptive_rate:
+            self.rate_controller = AdaptiveRateController(
+                rate=self.rate_limit,
+                max_rate=adaptive_ceiling(self.rate_limit, settings.rate_limit_max_rps, settings.rate_limit_rps),
+                on_change=self.rate_limiter.set_rate,
+            )
 
         logger.info(f"Initialized {self.portal_name} scraper with Playwright")
 
@@ -100,16 +126,19 @@ class BaseScraper(ABC):
 
         # Rate limiting
         if self.rate_limit_enabled:
-            self.rate_limiter.wait()
+            await self.rate_limiter.acquire(url)
 
         # Fetch with Playwright
         logger.info(f"Fetching {url} with Playwright")
 
+        page = None
         try:
             page = await self.browser.new_page()
 
             # Navigate
-            await page.goto(url, wait_until=wait_until, timeout=30000)
+            started = time.monotonic()
+            response = await page.goto(url, wait_until=wait_until, timeout=30000)
+            response_ms = (time.monotonic() - started) * 1000
 
             # Wait for content (can be overridden)
             await self.wait_for_content(page)
@@ -117,8 +146,8 @@ class BaseScraper(ABC):
             # Get HTML
             html = await page.content()
 
-            # Close page
-            await page.close()
+            # Blocked pages raise instead of being cached
+            self._observe_response(url, response, html, response_ms)
 
             # Cache result
             if use_cache and self.cache_enabled:
@@ -127,9 +156,15 @@ class BaseScraper(ABC):
             return html
 
         except Exception as e:
+            self._observe_error(e)
             logger.error(f"Error fetching {url}: {e}")
             raise
 
+        finally:
+            # Close the tab even on errors (concurrent fetches open several)
+            if page is not None:
+                await page.close()
+
     async def fetch_page_with_session(
         self,
         url: str,
@@ -156,17 +191,25 @@ class BaseScraper(ABC):
 
         # Rate limiting
         if self.rate_limit_enabled:
-            self.rate_limiter.wait()
+            await self.rate_limiter.acquire(url)
 
         logger.info(f"Fetching {url} with session restoration")
 
+        page = None
         try:
             # Navigate with session restoration
-            page = await self.browser.navigate_with_session(url, wait_until=wait_until)
+            started = time.monotonic()
+            page, response = await self.browser.navigate_with_session(
+                url, wait_until=wait_until, with_response=True
+            )
+            response_ms = (time.monotonic() - started) * 1000
 
             # Wait for content
             await self.wait_for_content(page)
 
+            # Blocked pages must not invalidate the session nor be cached
+            self._observe_response(url, response, await page.content(), response_ms)
+
             # Verify authentication if needed
             if self.browser.session_manager:
                 is_authenticated = await self.browser.verify_and_save_session(page)
@@ -176,9 +219,6 @@ class BaseScraper(ABC):
             # Get HTML
             html = await page.content()
 
-            # Close page
-            await page.close()
-
             # Cache result
             if use_cache and self.cache_enabled:
                 self.cache.set(url, html)
@@ -186,11 +226,76 @@ class BaseScraper(ABC):
             return html
 
         except Exception as e:
+            self._observe_error(e)
             logger.error(f"Error fetching {url} with session: {e}")
             import traceback
             traceback.print_exc()
             raise
 
+        finally:
+            if page is not None:
+                await page.close()
+
+    def _observe_response(self, url: str, response, html: str, response_ms: float):
+        """
+        Feed a loaded page to the adaptive rate controller
+
+        Raises:
+            ThrottledError: If the portal answered 429/403 or with a captcha
+        """
+        signal = None
+        if response is not None and response.status in (429, 403):
+            signal = f"http_{response.status}"
+        elif any(marker in html for marker in self.captcha_markers):
+            signal = "captcha"
+
+        if signal:
+            if self.rate_controller:
+                self.rate_controller.record_throttle(signal)
+            raise ThrottledError(url, signal)
+
+        if self.rate_controller:
+            self.rate_controller.record_success(response_ms)
+
+    def _observe_error(self, error: Exception):
+        """Navigation timeouts count as throttle signals"""
+        if self.rate_controller and isinstance(error, PlaywrightTimeoutError):
+            self.rate_controller.record_throttle("timeout")
+
+    def load_learned_rate(self):
+        """Start from the rate the previous jobs learned (ScrapingSource.rateLimit)"""
+        if not self.rate_controller:
+            return
+
+        try:
+            from ..database.scraping_repository import ScrapingRepository
+            learned = ScrapingRepository().load_source_rate(self.portal_name)
+        except Exception as e:
+            logger.warning(f"Could not load learned rate for {self.portal_name}: {e}")
+            return
+
+        if learned:
+            rate, avg_response_ms = learned
+            self.rate_controller.restore(rate, avg_response_ms)
+            logger.info(f"Starting {self.portal_name} at learned rate {self.rate_controller.rate} req/s")
+
+    def save_learned_rate(self):
+        """Persist the current rate and average response time for the next job"""
+        controller = self.rate_controller
+        if not controller or not (controller.successes or controller.throttles):
+            return
+
+        try:
+            from ..database.scraping_repository import ScrapingRepository
+            ScrapingRepository().save_source_rate(
+                self.portal_name,
+                self.base_url,
+                controller.rate,
+                controller.avg_response_ms,
+            )
+        except Exception as e:
+            logger.warning(f"Could not save learned rate for {self.portal_name}: {e}")
+
     async def wait_for_content(self, page):
         """
         Wait for page content to load
@@ -251,12 +356,16 @@ class BaseScraper(ABC):
         logger.info(f"Saving listing: {listing.get('title', 'Untitled')}")
 
     async def close(self):
-        """Close browser"""
+        """Close browser (and store the learned rate)"""
+        self.save_learned_rate()
+        if self.cache_enabled:
+            logger.info(f"{self.portal_name} cache stats: {self.cache.stats()}")
         await self.browser.close()
         logger.info(f"Closed {self.portal_name} scraper")
 
     async def __aenter__(self):
         """Async context manager entry"""
+        self.load_learned_rate()
         await self.browser.start()
         return self
 
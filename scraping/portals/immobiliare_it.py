@@ -12,6 +12,8 @@ from bs4 import BeautifulSoup
 import logging
 
 from .base_scraper import BaseScraper
+from ..config import settings
+from ..common.paged_fetch import fetch_pages
 
 
 logger = logging.getLogger(__name__)
@@ -36,8 +38,6 @@ class ImmobiliareItScraper(BaseScraper):
                 timeout=15000,
                 state="visible"
             )
-            # Additional wait for JS to finish
-            await asyncio.sleep(2)
             logger.debug("Content loaded successfully")
         except Exception as e:
             logger.warning(f"Content wait timeout (may be OK): {e}")
@@ -53,10 +53,15 @@ class ImmobiliareItScraper(BaseScraper):
         rooms_min: Optional[int] = None,
         sqm_min: Optional[float] = None,
         max_pages: int = 3,
+        concurrency: Optional[int] = None,
     ) -> List[Dict]:
         """
         Scrape search results from Immobiliare.it
 
+        Up to `concurrency` pages are fetched at once, each in its own tab of
+        the shared browser context and paced by the rate limiter. Listings
+        are returned in page order, stopping at the first empty page.
+
         Args:
             location: City name (e.g., "roma", "milano")
             contract_type: "vendita" or "affitto"
@@ -66,51 +71,41 @@ class ImmobiliareItScraper(BaseScraper):
             rooms_min: Minimum rooms
             sqm_min: Minimum square meters
             max_pages: Max pages to scrape
+            concurrency: Pages in flight (default: SCRAPING_MAX_CONCURRENT_PAGES, 1 = sequential)
 
         Returns:
             List of listing dictionaries
         """
-        all_listings = []
-
-        for page_num in range(1, max_pages + 1):
-            try:
-                # Build URL
-                url = self._build_search_url(
-                    location=location,
-                    contract_type=contract_type,
-                    property_type=property_type,
-                    price_min=price_min,
-                    price_max=price_max,
-                    rooms_min=rooms_min,
-                    sqm_min=sqm_min,
-                    page=page_num,
-                )
-
-                logger.info(f"Scraping page {page_num}/{max_pages}: {url}")
-
-                # Fetch page with session (for authenticated features)
-                html = await self.fetch_page_with_session(url)
+        async def scrape_page(page_num: int) -> List[Dict]:
+            # Build URL
+            url = self._build_search_url(
+                location=location,
+                contract_type=contract_type,
+                property_type=property_type,
+                price_min=price_min,
+                price_max=price_max,
+                rooms_min=rooms_min,
+                sqm_min=sqm_min,
+                page=page_num,
+            )
 
-                # Parse listings
-                listings = self._parse_search_page(html, url)
+            logger.info(f"Scraping page {page_num}/{max_pages}: {url}")
 
-                logger.info(f"Found {len(listings)} listings on page {page_num}")
+            # Fetch page with session (for authenticated features)
+            html = await self.fetch_page_with_session(url)
 
-                all_listings.extend(listings)
+            # Parse listings
+            listings = self._parse_search_page(html, url)
 
-                # Check if last page (no listings found)
-                if len(listings) == 0:
-                    logger.info("No more listings found, stopping")
-                    break
+            logger.info(f"Found {len(listings)} listings on page {page_num}")
 
-                # Delay between pages
-                await asyncio.sleep(2)
+            return listings
 
-            except Exception as e:
-                logger.error(f"Error scraping page {page_num}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
+        all_listings = await fetch_pages(
+            scrape_page,
+            max_pages=max_pages,
+            concurrency=concurrency or settings.max_concurrent_pages,
+        )
 
         logger.info(f"Total listings scraped: {len(all_listings)}")
         return all_listings
@@ -40,8 +40,12 @@ async function generateModels() {
   // Generate enums
   const enumsCode = dmmf.datamodel.enums.map(generateEnum).join('\n\n');
 
-  // Generate models
-  const modelsCode = dmmf.datamodel.models.map(generateModel).join('\n\n');
+  // Generate models (with their @@index / @@unique declarations)
+  const indexes = collectIndexes(dmmf);
+  const models = dmmf.datamodel.models;
+  const modelsCode = models
+    .map((model: any) => generateModel(model, indexes.get(model.name) || [], models))
+    .join('\n\n');
 
   // Header
   const header = `# ==============================================================================
@@ -56,13 +60,19 @@ async function generateModels() {
 # To regenerate: npm run generate:sqlalchemy
 # ==============================================================================
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum, DECIMAL, BigInteger
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum, DECIMAL, Numeric, BigInteger, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
 from typing import Optional
 import enum
 
+
+def enum_type(enum_class):
+    """Enum column type storing the member values, as Prisma does on SQLite"""
+    return SQLEnum(enum_class, native_enum=False, values_callable=lambda members: [member.value for member in members])
+
+
 # ==============================================================================
 # ENUMS
 # ==============================================================================
@@ -95,40 +105,113 @@ function generateEnum(enumDef: any): string {
 ${values}`;
 }
 
-function generateModel(model: any): string {
-  const tableName = model.dbName || model.name.toLowerCase();
+interface ModelIndex {
+  name?: string;
+  fields: string[];
+  unique: boolean;
+}
+
+/**
+ * Block-level indexes (@@index, @@unique) per model name.
+ * Single-field @unique stays on the column (unique=True).
+ */
+function collectIndexes(dmmf: any): Map<string, ModelIndex[]> {
+  const byModel = new Map<string, ModelIndex[]>();
+
+  for (const index of dmmf.datamodel.indexes || []) {
+    if (index.isDefinedOnField || !['normal', 'unique'].includes(index.type)) continue;
+
+    const modelIndexes = byModel.get(index.model) || [];
+    modelIndexes.push({
+      name: index.dbName || undefined,
+      fields: index.fields.map((f: any) => f.name),
+      unique: index.type === 'unique',
+    });
+    byModel.set(index.model, modelIndexes);
+  }
+
+  return byModel;
+}
+
+function generateTableArgs(tableName: string, indexes: ModelIndex[]): string {
+  if (indexes.length === 0) return '';
+
+  // Same names as Prisma Migrate, so the SQLAlchemy and Prisma indexes coincide
+  const entries = indexes.map(index => {
+    const name = index.name || `${tableName}_${index.fields.join('_')}_${index.unique ? 'key' : 'idx'}`;
+    const columns = index.fields.map(f => `"${f}"`).join(', ');
+    return `        Index("${name}", ${columns}${index.unique ? ', unique=True' : ''}),`;
+  });
+
+  return `\n    __table_args__ = (\n${entries.join('\n')}\n    )\n`;
+}
+
+function tableNameOf(model: any): string {
+  return model.dbName || model.name.toLowerCase();
+}
+
+/**
+ * Referenced "table.column" per scalar field of a model, from the
+ * @relation(fields: [...], references: [...]) of its relation fields
+ */
+function collectForeignKeys(model: any, models: any[]): Map<string, string> {
+  const foreignKeys = new Map<string, string>();
+
+  for (const field of model.fields) {
+    if (field.kind !== 'object' || !field.relationFromFields?.length) continue;
+
+    const target = models.find((m: any) => m.name === field.type);
+    field.relationFromFields.forEach((from: string, i: number) => {
+      foreignKeys.set(from, `${tableNameOf(target)}.${field.relationToFields[i]}`);
+    });
+  }
+
+  return foreignKeys;
+}
+
+function generateModel(model: any, indexes: ModelIndex[] = [], models: any[] = []): string {
+  const tableName = tableNameOf(model);
+  // Composite @@id fields are primary key columns too
+  const compositeKey: string[] = model.primaryKey?.fields || [];
+  const idField = model.fields.find((f: any) => f.isId)?.name || compositeKey[0] || 'id';
+  const foreignKeys = collectForeignKeys(model, models);
 
   // Generate fields
   const fields = model.fields
-    .filter((f: any) => f.kind !== 'object') // Skip relations for now
-    .map(generateField)
+    .filter((f: any) => f.kind !== 'object')
+    .map((f: any) => generateField(f, compositeKey.includes(f.name), foreignKeys.get(f.name)))
     .join('\n    ');
 
   // Generate relationships
   const relationships = model.fields
     .filter((f: any) => f.kind === 'object')
-    .map(generateRelationship)
+    .map((f: any) => generateRelationship(f, models))
     .join('\n    ');
 
   return `class ${model.name}(Base):
     """${model.name} model"""
     __tablename__ = "${tableName}"
-
+${generateTableArgs(tableName, indexes)}
     ${fields}${relationships ? '\n\n    # Relationships\n    ' + relationships : ''}
 
     def __repr__(self):
-        return f"<${model.name}(id={self.id})>"`;
+        return f"<${model.name}(${idField}={self.${idField}})>"`;
 }
 
-function generateField(field: any): string {
-  const sqlType = TYPE_MAP[field.type] || field.type;
-  const isPrimary = field.isId;
+function generateField(field: any, inCompositeKey: boolean = false, foreignKey?: string): string {
+  // Enums are stored by value (TEXT on SQLite)
+  const sqlType = field.kind === 'enum' ? `enum_type(${field.type})` : TYPE_MAP[field.type] || field.type;
+  const isPrimary = field.isId || inCompositeKey;
   const isRequired = field.isRequired;
   const isUnique = field.isUnique;
   const hasDefault = field.default !== undefined;
 
   let column = `${field.name} = Column(${sqlType}`;
 
+  if (foreignKey) {
+    column += `, ForeignKey("${foreignKey}")`;
+  }
+
   // Primary key
   if (isPrimary) {
     column += ', primary_key=True';
@@ -151,6 +234,13 @@ function generateField(field: any): string {
     } else if (field.default.name === 'autoincrement') {
       column += ', autoincrement=True';
     }
+  } else if (hasDefault) {
+    // Literal defaults (columns are NOT NULL DEFAULT ... in the migrations)
+    column += `, default=${pythonLiteral(field.default)}`;
+  }
+
+  if (field.isUpdatedAt) {
+    column += ', default=datetime.utcnow, onupdate=datetime.utcnow';
   }
 
   column += ')';
@@ -163,9 +253,31 @@ function generateField(field: any): string {
   return column;
 }
 
-function generateRelationship(field: any): string {
-  // Basic relationship (many-to-one)
-  return `${field.name} = relationship("${field.type}")  # TODO: Configure relationship`;
+function pythonLiteral(value: any): string {
+  if (typeof value === 'boolean') return value ? 'True' : 'False';
+  if (typeof value === 'number') return String(value);
+  // Strings and enum values
+  return JSON.stringify(String(value));
+}
+
+function generateRelationship(field: any, models: any[]): string {
+  // The other side of the relation, so both sides share the foreign key
+  const target = models.find((m: any) => m.name === field.type);
+  const back = target?.fields.find(
+    (f: any) => f.kind === 'object' && f.relationName === field.relationName && f !== field
+  );
+
+  let relationship = `${field.name} = relationship("${field.type}"`;
+  if (back) {
+    relationship += `, back_populates="${back.name}"`;
+  }
+  // The database applies onDelete (Cascade / SetNull): deleting a row
+  // does not load its children
+  if (field.isList) {
+    relationship += ', passive_deletes=True';
+  }
+
+  return relationship + ')';
 }
 
 // Run generator
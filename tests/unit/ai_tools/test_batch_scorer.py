@@ -0,0 +1,140 @@
+# ==============================================
+# AI Tools Unit Test - Batch Property Scoring
+# ==============================================
+
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app.services import batch_scorer  # noqa: E402
+from app.services import property_scorer  # noqa: E402
+
+
+def _random_property(rng):
+    return SimpleNamespace(
+        id=f"prop_{rng.random()}",
+        contractType=rng.choice(["sale", "rent"]),
+        city=rng.choice(["Milano", "milano", "Roma", "Torino", None]),
+        zone=rng.choice(["Brera", "Prati", "Centro", None, ""]),
+        propertyType=rng.choice(["apartment", "villa", "house"]),
+        priceSale=rng.choice([None, 0, 300000.0, rng.uniform(50000, 900000)]),
+        priceRentMonthly=rng.choice([None, 0, rng.uniform(300, 3000)]),
+        sqmCommercial=rng.choice([None, 0, 80.0, rng.uniform(20, 300)]),
+        rooms=rng.choice([None, 0, 1, 2, 3, 4, 5, 6]),
+        bedrooms=rng.choice([None, 1, 2, 3]),
+        hasElevator=rng.choice([None, True, False]),
+        hasParking=rng.choice([True, False]),
+        hasGarage=rng.choice([None, True, False]),
+        hasGarden=rng.choice([True, False]),
+        hasTerrace=rng.choice([True, False]),
+        hasBalcony=rng.choice([True, False]),
+        hasCellar=False,
+        hasAlarm=False,
+        furnished=None,
+        condition=rng.choice(["nuovo", "Ottimo", "buono", "da ristrutturare", "altro", None]),
+        energyClass="A",
+        latitude=rng.choice([None, 0.0, rng.uniform(45.3, 45.6)]),
+        longitude=rng.choice([None, 0.0, rng.uniform(9.0, 9.3)]),
+    )
+
+
+def _random_request(rng):
+    return SimpleNamespace(
+        id="req_test",
+        contractType=rng.choice(["sale", "rent", None]),
+        searchCities=rng.choice([None, "[]", json.dumps(["Milano", "Roma"]), "not json"]),
+        searchZones=rng.choice([None, "[]", json.dumps(["Brera"])]),
+        propertyTypes=rng.choice([None, json.dumps(["villa", "apartment"])]),
+        priceMin=rng.choice([None, 0, 500.0, 100000.0]),
+        priceMax=rng.choice([None, 0, 1500.0, 400000.0]),
+        sqmMin=rng.choice([None, 60.0]),
+        sqmMax=rng.choice([None, 100.0]),
+        roomsMin=rng.choice([None, 2, 3]),
+        roomsMax=rng.choice([None, 4]),
+        bedroomsMin=None,
+        requiresElevator=rng.choice([None, True, False]),
+        requiresParking=rng.choice([True, False]),
+        requiresGarden=rng.choice([True, False]),
+        requiresTerrace=False,
+        searchRadiusKm=rng.choice([None, 0, 3.0, 10.0]),
+        centerLatitude=rng.choice([None, 45.46]),
+        centerLongitude=9.19,
+    )
+
+
+@pytest.mark.unit
+def test_batch_matches_per_object_path():
+    """Vectorized scoring must return exactly what get_sorted_matches returns"""
+    rng = random.Random(42)
+    scorer = property_scorer.PropertyScorer()
+    batch = batch_scorer.BatchPropertyScorer()
+
+    for _ in range(100):
+        properties = [_random_property(rng) for _ in range(200)]
+        request = _random_request(rng)
+        min_score = rng.choice([0, 40, 55.5, 70])
+        limit = rng.choice([None, 5, 50])
+
+        expected = scorer.get_sorted_matches(request, properties, min_score)[:limit]
+        actual = batch.get_sorted_matches_batch(request, properties, min_score, limit)
+
+        assert [(m["property"].id, m["score_data"]) for m in actual] == \
+            [(m["property"].id, m["score_data"]) for m in expected]
+
+
+@pytest.mark.unit
+def test_top_k_matches_full_sort():
+    """get_sorted_matches with a limit must equal the full sort sliced to the limit"""
+    rng = random.Random(3)
+    scorer = property_scorer.PropertyScorer()
+
+    for _ in range(100):
+        properties = [_random_property(rng) for _ in range(200)]
+        request = _random_request(rng)
+        min_score = rng.choice([0, 40, 55.5, 70])
+        limit = rng.choice([1, 5, 50, 500])
+
+        expected = scorer.get_sorted_matches(request, properties, min_score)[:limit]
+        actual = scorer.get_sorted_matches(request, properties, min_score, limit=limit)
+
+        assert [(m["property"].id, m["score_data"]) for m in actual] == \
+            [(m["property"].id, m["score_data"]) for m in expected]
+
+
+@pytest.mark.unit
+def test_batch_handles_empty_candidates():
+    """Scoring an empty candidate set returns no matches"""
+    batch = batch_scorer.BatchPropertyScorer()
+    columns = batch_scorer.PropertyColumns([])
+
+    assert batch.rank(_random_request(random.Random(0)), columns) == []
+
+
+@pytest.mark.unit
+def test_batch_requests_match_per_object_path():
+    """Scoring one property against many requests must match get_sorted_requests"""
+    rng = random.Random(7)
+    scorer = property_scorer.PropertyScorer()
+    batch = batch_scorer.BatchPropertyScorer()
+
+    for _ in range(100):
+        property = _random_property(rng)
+        requests = []
+        for i in range(200):
+            request = _random_request(rng)
+            request.id = f"req_{i}"
+            requests.append(request)
+        min_score = rng.choice([0, 40, 55.5, 70])
+        limit = rng.choice([None, 5, 50])
+
+        expected = scorer.get_sorted_requests(property, requests, min_score)[:limit]
+        actual = batch.get_sorted_requests_batch(property, requests, min_score, limit)
+
+        assert [(m["request"].id, m["score_data"]) for m in actual] == \
+            [(m["request"].id, m["score_data"]) for m in expected]
@@ -0,0 +1,63 @@
+# ==============================================
+# AI Tools Unit Test - Benchmark Portfolio Generator
+# ==============================================
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from benchmarks.portfolio import PortfolioGenerator, load_markets
+from benchmarks.scoring_benchmark import compare_results, percentile
+
+
+@pytest.mark.unit
+def test_portfolio_is_deterministic():
+    """Same seed, same rows"""
+    first = list(PortfolioGenerator(seed=1).iter_properties(200))
+    second = list(PortfolioGenerator(seed=1).iter_properties(200))
+    other = list(PortfolioGenerator(seed=2).iter_properties(200))
+
+    assert first == second
+    assert first != other
+
+
+@pytest.mark.unit
+def test_markets_include_zone_stats_comuni():
+    """Comuni and zones of data/zone-stats.json are part of the markets"""
+    markets = {market["city"]: market for market in load_markets()}
+
+    assert "Milano" in markets
+    assert "Corbetta" in markets
+    assert set(markets["Corbetta"]["zones"]) == {"A", "B", "C"}
+
+
+@pytest.mark.unit
+def test_rows_are_consistent():
+    """Prices match the contract type and requests have parseable JSON"""
+    generator = PortfolioGenerator(seed=3)
+
+    for row in generator.iter_properties(500):
+        if row["contractType"] == "sale":
+            assert row["priceSale"] > 0 and row["priceRentMonthly"] is None
+        else:
+            assert row["priceRentMonthly"] > 0 and row["priceSale"] is None
+        assert 20 <= row["sqmCommercial"] <= 600
+
+    for row in generator.iter_requests(100):
+        assert json.loads(row["searchCities"])
+        assert row["priceMax"] > 0
+
+
+@pytest.mark.unit
+def test_percentile_and_compare():
+    """Nearest-rank percentiles and p50 ratios against a baseline"""
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile([3, 1, 2, 4], 95) == 4
+
+    baseline = {"sizes": [{"size": 10, "benchmarks": {"x": {"p50_ms": 2.0}}}]}
+    current = {"sizes": [{"size": 10, "benchmarks": {"x": {"p50_ms": 3.0}}}]}
+    assert compare_results(current, baseline)[0].endswith("x1.50")
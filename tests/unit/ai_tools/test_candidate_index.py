@@ -0,0 +1,94 @@
+# ==============================================
+# AI Tools Unit Test - Candidate Index
+# ==============================================
+
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app.services import batch_scorer  # noqa: E402
+from app.services import candidate_index  # noqa: E402
+
+
+def _random_row(rng, index):
+    """Row in PropertyColumns.query_columns() order"""
+    return (
+        f"prop_{index}",
+        rng.choice(["sale", "rent"]),
+        rng.choice(["Milano", "Roma", "Torino", "Napoli", None]),
+        rng.choice(["Brera", "Prati", "Centro", None, ""]),
+        rng.choice(["apartment", "villa", "house"]),
+        rng.choice([None, 0, rng.uniform(50000, 1500000)]),
+        rng.choice([None, 0, rng.uniform(300, 5000)]),
+        rng.choice([None, 0, rng.uniform(20, 400)]),
+        rng.choice([None, 0, 1, 2, 3, 4, 5, 6]),
+        rng.choice([None, True, False]),
+        rng.choice([True, False]),
+        rng.choice([None, True, False]),
+        rng.choice([True, False]),
+        rng.choice([True, False]),
+        rng.choice(["nuovo", "ottimo", "buono", "da ristrutturare", None]),
+        rng.choice([None, rng.uniform(45.3, 45.6)]),
+        rng.choice([None, rng.uniform(9.0, 9.3)]),
+    )
+
+
+def _random_request(rng):
+    return SimpleNamespace(
+        id="req_test",
+        contractType=rng.choice(["sale", "rent", None]),
+        searchCities=rng.choice([None, json.dumps(["Milano"]), json.dumps(["Roma", "Torino"])]),
+        searchZones=rng.choice([None, "[]", json.dumps(["Brera"])]),
+        propertyTypes=rng.choice([None, json.dumps(["villa", "apartment"])]),
+        priceMin=rng.choice([None, 500.0, 100000.0]),
+        priceMax=rng.choice([None, 1500.0, 400000.0]),
+        sqmMin=rng.choice([None, 60.0]),
+        sqmMax=rng.choice([None, 100.0]),
+        roomsMin=rng.choice([None, 2, 3]),
+        roomsMax=rng.choice([None, 4]),
+        bedroomsMin=None,
+        requiresElevator=rng.choice([None, True]),
+        requiresParking=rng.choice([True, False]),
+        requiresGarden=False,
+        requiresTerrace=False,
+        searchRadiusKm=rng.choice([None, 2.0, 8.0]),
+        centerLatitude=45.46,
+        centerLongitude=9.19,
+    )
+
+
+@pytest.mark.unit
+def test_index_rank_matches_full_scan():
+    """Ranking through the index must equal ranking every row"""
+    rng = random.Random(7)
+    scorer = batch_scorer.BatchPropertyScorer()
+    columns = batch_scorer.PropertyColumns([_random_row(rng, i) for i in range(2000)])
+    index = candidate_index.CandidateIndex(columns)
+
+    pruned = False
+    for _ in range(100):
+        request = _random_request(rng)
+        min_score = rng.choice([0, 50, 65, 80])
+        limit = rng.choice([None, 10])
+
+        ranked, candidates_scored = index.rank(scorer, request, min_score, limit)
+
+        assert ranked == scorer.rank(request, columns, min_score=min_score, limit=limit)
+        pruned = pruned or candidates_scored < len(columns)
+
+    assert pruned
+
+
+@pytest.mark.unit
+def test_index_handles_empty_columns():
+    """An empty index has no candidates"""
+    scorer = batch_scorer.BatchPropertyScorer()
+    index = candidate_index.CandidateIndex(batch_scorer.PropertyColumns([]))
+
+    assert index.rank(scorer, _random_request(random.Random(0)), 60) == ([], 0)
@@ -0,0 +1,143 @@
+# ==============================================
+# AI Tools Unit Test - Shared Database Engine
+# ==============================================
+
+import asyncio
+import importlib.util
+import threading
+from pathlib import Path
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from sqlalchemy import text
+
+DATABASE_MODULE = Path(__file__).parent.parent.parent.parent / "database" / "python" / "database.py"
+
+
+@pytest.fixture(scope="module")
+def shared_database():
+    """database/python/database.py, loaded from its path (the name clashes with the package)"""
+    spec = importlib.util.spec_from_file_location("shared_database_under_test", DATABASE_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.unit
+def test_prisma_url_is_normalized(shared_database):
+    """Prisma file: URLs become SQLAlchemy sqlite URLs"""
+    assert shared_database.normalize_database_url("file:./dev.db") == "sqlite:///./dev.db"
+    assert shared_database.normalize_database_url("postgresql://u@h/db") == "postgresql://u@h/db"
+
+
+@pytest.mark.unit
+def test_sqlite_file_engine_uses_wal_and_pragmas(shared_database, tmp_path):
+    """Every SQLite connection gets WAL, busy_timeout and the tuned pragmas"""
+    engine = shared_database.create_db_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        busy_timeout_ms=2500,
+        synchronous="normal",
+        cache_size_kb=1024,
+        mmap_size_mb=8,
+    )
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 2500
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -1024
+        assert connection.execute(text("PRAGMA mmap_size")).scalar() == 8 * 1024 * 1024
+
+    assert type(engine.pool).__name__ == "SingletonThreadPool"
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_concurrent_writers_get_their_own_connection(shared_database, tmp_path):
+    """Threads write concurrently without losing rows; metrics count the connections"""
+    engine = shared_database.create_db_engine(f"sqlite:///{tmp_path / 'threads.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, worker INTEGER)"))
+
+    def write(worker):
+        for _ in range(25):
+            with engine.begin() as connection:
+                connection.execute(text("INSERT INTO item (worker) VALUES (:w)"), {"w": worker})
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM item")).scalar() == 200
+
+    metrics = shared_database.get_pool_metrics(engine)
+    assert metrics["backend"] == "sqlite"
+    assert metrics["connects"] == 9  # main thread + one per writer
+    assert metrics["checkouts"] == metrics["checkins"]
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_queue_pool_and_memory_engines(shared_database, tmp_path):
+    """SQLite can use a sized QueuePool; in-memory databases keep one shared connection"""
+    engine = shared_database.create_db_engine(
+        f"sqlite:///{tmp_path / 'queue.db'}", sqlite_pool="queue", pool_size=3
+    )
+    with engine.connect():
+        metrics = shared_database.get_pool_metrics(engine)
+    assert metrics["pool"] == "QueuePool"
+    assert metrics["size"] == 3
+    assert metrics["checked_out"] == 1
+    engine.dispose()
+
+    memory = shared_database.create_db_engine("sqlite://")
+    with memory.begin() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER)"))
+    with memory.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM t")).scalar() == 0
+    assert shared_database.get_pool_metrics(memory)["pool"] == "StaticPool"
+
+
+@pytest.mark.unit
+def test_async_url_uses_async_drivers(shared_database):
+    """Sync URLs map to aiosqlite / asyncpg"""
+    assert shared_database.to_async_url("sqlite:///dev.db") == "sqlite+aiosqlite:///dev.db"
+    assert shared_database.to_async_url("file:./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert shared_database.to_async_url("postgresql+psycopg2://u@h/db") == "postgresql+asyncpg://u@h/db"
+
+    with pytest.raises(ValueError):
+        shared_database.to_async_url("mysql://u@h/db")
+
+
+@pytest.mark.unit
+def test_async_engine_shares_pragmas_and_data(shared_database, tmp_path):
+    """Async sessions see the rows of the sync engine, with the same pragmas"""
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = shared_database.create_db_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO item (id) VALUES (1), (2)"))
+
+    async def read():
+        async_engine = shared_database.create_async_db_engine(url, busy_timeout_ms=1500)
+        try:
+            async with async_engine.connect() as connection:
+                journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+                busy_timeout = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+                count = (await connection.execute(text("SELECT COUNT(*) FROM item"))).scalar()
+            return journal_mode, busy_timeout, count, shared_database.get_pool_metrics(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    journal_mode, busy_timeout, count, metrics = asyncio.run(read())
+
+    assert (journal_mode, busy_timeout, count) == ("wal", 1500, 2)
+    assert metrics["checkouts"] == metrics["checkins"] == 1
+    engine.dispose()
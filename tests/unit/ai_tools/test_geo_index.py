@@ -0,0 +1,97 @@
+# ==============================================
+# AI Tools Unit Test - Geo Index
+# ==============================================
+
+import random
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app.services import geo_index  # noqa: E402
+
+
+@pytest.mark.unit
+def test_within_matches_brute_force():
+    """Radius queries must return exactly the points a full scan finds"""
+    rng = random.Random(11)
+    points = [(i, rng.uniform(45.0, 46.0), rng.uniform(8.5, 10.0)) for i in range(3000)]
+    index = geo_index.GeoGridIndex.from_points(points, cell_km=1.5)
+
+    for _ in range(50):
+        lat, lon = rng.uniform(45.0, 46.0), rng.uniform(8.5, 10.0)
+        radius = rng.choice([0.5, 2.0, 10.0, 40.0])
+
+        expected = sorted(
+            key for key, p_lat, p_lon in points
+            if geo_index.haversine_km(lat, lon, p_lat, p_lon) <= radius
+        )
+
+        assert sorted(key for key, _ in index.within(lat, lon, radius)) == expected
+
+
+@pytest.mark.unit
+def test_upsert_moves_and_remove_drops_points():
+    """Points can be moved and removed incrementally"""
+    index = geo_index.GeoGridIndex()
+    index.upsert("a", 45.4642, 9.1900)
+    index.upsert("b", 41.9028, 12.4964)
+
+    assert [key for key, _ in index.within(45.4642, 9.1900, 5)] == ["a"]
+
+    index.upsert("b", 45.4700, 9.1950)
+    assert [key for key, _ in index.within(45.4642, 9.1900, 5)] == ["a", "b"]
+
+    index.remove("a")
+    assert [key for key, _ in index.within(45.4642, 9.1900, 5)] == ["b"]
+    assert len(index) == 1
+
+
+@pytest.mark.unit
+def test_placeholder_coordinates_are_skipped():
+    """(0, 0) and missing coordinates are not indexed"""
+    index = geo_index.GeoGridIndex.from_points([("a", 0.0, 0.0), ("b", None, 9.19), ("c", 45.46, 9.19)])
+
+    assert "a" not in index and "b" not in index and "c" in index
+
+
+@pytest.mark.unit
+def test_concurrent_updates_and_queries():
+    """Queries running alongside updates must not see a cell mid-change"""
+    index = geo_index.GeoGridIndex(cell_km=50.0)
+    for i in range(200):
+        index.upsert(i, 45.4642, 9.1900)
+
+    errors = []
+    stop = threading.Event()
+
+    def update():
+        rng = random.Random(5)
+        while not stop.is_set():
+            key = rng.randrange(400)
+            if rng.random() < 0.5:
+                index.upsert(key, 45.4642 + rng.uniform(-0.01, 0.01), 9.1900)
+            else:
+                index.remove(key)
+
+    def query():
+        try:
+            for _ in range(300):
+                index.within(45.4642, 9.1900, 5.0)
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    updater = threading.Thread(target=update)
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    updater.start()
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    stop.set()
+    updater.join()
+
+    assert errors == []
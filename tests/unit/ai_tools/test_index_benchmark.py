@@ -0,0 +1,154 @@
+# ==============================================
+# AI Tools Unit Test - Index Benchmark
+# ==============================================
+
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from benchmarks import index_benchmark  # noqa: E402
+
+# Hot filters covered by the query audit migration
+AUDITED_QUERIES = [
+    "scoring_index_signature",
+    "stale_properties",
+    "properties_changed_since",
+    "dedup_by_source_url",
+    "dedup_by_content_hash",
+    "scraped_properties_page",
+    "requests_changed_since",
+    "overdue_activities",
+    "audit_deletes_since",
+    "conversations_by_status",
+]
+
+
+@pytest.mark.unit
+def test_split_statements_drops_comments():
+    """Migration files split into statements without the Prisma comments"""
+    sql = '-- CreateIndex\nCREATE INDEX "a_idx" ON "a"("x");\n\n-- CreateIndex\nCREATE INDEX "b_idx" ON "b"("y");\n'
+
+    assert index_benchmark.split_statements(sql) == [
+        'CREATE INDEX "a_idx" ON "a"("x")',
+        'CREATE INDEX "b_idx" ON "b"("y")',
+    ]
+
+
+@pytest.mark.unit
+def test_audited_queries_use_the_migration_indexes():
+    """After every migration the audited filters are index searches, not scans"""
+    migrations = index_benchmark.load_migrations()
+    assert any(name.endswith("_query_audit_indexes") for name, _ in migrations)
+
+    connection = sqlite3.connect(":memory:")
+    index_benchmark.create_schema(connection, migrations)
+    rows = index_benchmark.populate(connection, 300, seed=3)
+    assert rows["properties"] == 300
+
+    for _, statements in migrations:
+        index_benchmark.create_indexes(connection, statements)
+
+    results = index_benchmark.time_queries(connection, repeat=1)
+    assert set(results) == {name for name, _, _ in index_benchmark.HOT_QUERIES}
+
+    for name in AUDITED_QUERIES:
+        assert "USING" in results[name]["plan"] and "INDEX" in results[name]["plan"], name
+        assert "SCAN" not in results[name]["plan"], name
+
+
+@pytest.mark.unit
+def test_models_declare_the_migration_indexes():
+    """database/python/models.py declares every non-unique index of its tables"""
+    models = (
+        Path(__file__).parent.parent.parent.parent / "database" / "python" / "models.py"
+    ).read_text(encoding="utf-8")
+    tables = set(re.findall(r'__tablename__ = "(\w+)"', models))
+
+    for _, statements in index_benchmark.load_migrations():
+        for statement in statements:
+            if statement.startswith("CREATE INDEX"):
+                name, table = statement.split('"')[1], statement.split('"')[3]
+                if table in tables:
+                    assert f'Index("{name}"' in models, name
+
+
+@pytest.mark.unit
+def test_content_hash_migration_backfills_from_notes():
+    """contentHash is filled from the notes hash line, once per (source, hash)"""
+    migrations = index_benchmark.load_migrations()
+    names = [name for name, _ in migrations]
+    position = next(i for i, name in enumerate(names) if name.endswith("_property_content_hash"))
+
+    connection = sqlite3.connect(":memory:")
+    index_benchmark.create_schema(connection, migrations[:position])
+    for _, statements in migrations[:position]:
+        index_benchmark.create_indexes(connection, statements)
+
+    defaults = index_benchmark._required_defaults(connection, "properties")
+    notes = {
+        "p1": ("casa_it", "hash:0123456789abcdef\nScraped at: 2025-01-01\nSource: casa_it"),
+        "p2": ("casa_it", "hash:0123456789abcdef\nScraped at: 2025-02-01\nSource: casa_it"),
+        "p3": ("immobiliare_it", "hash:0123456789abcdef\nScraped at: 2025-01-01"),
+        "p4": ("casa_it", "Chiamare il proprietario"),
+    }
+    for property_id, (source, internal_notes) in notes.items():
+        row = {**defaults, "id": property_id, "code": property_id, "source": source, "internalNotes": internal_notes}
+        connection.execute(
+            'INSERT INTO "properties" ({}) VALUES ({})'.format(
+                ", ".join(f'"{key}"' for key in row), ", ".join("?" * len(row))
+            ),
+            tuple(row.values()),
+        )
+
+    for statement in migrations[position][1]:
+        connection.execute(statement)
+
+    hashes = dict(connection.execute('SELECT "id", "contentHash" FROM "properties"'))
+    assert hashes == {"p1": "0123456789abcdef", "p2": None, "p3": "0123456789abcdef", "p4": None}
+
+
+@pytest.mark.unit
+def test_request_cities_migration_backfills_and_follows_requests():
+    """request_cities is backfilled from searchCities and kept in sync by triggers"""
+    migrations = index_benchmark.load_migrations()
+    names = [name for name, _ in migrations]
+    position = next(i for i, name in enumerate(names) if name.endswith("_request_cities"))
+
+    connection = sqlite3.connect(":memory:")
+    index_benchmark.create_schema(connection, migrations[:position])
+    defaults = index_benchmark._required_defaults(connection, "requests")
+
+    def insert(request_id, search_cities):
+        row = {**defaults, "id": request_id, "code": request_id, "searchCities": search_cities}
+        connection.execute(
+            'INSERT INTO "requests" ({}) VALUES ({})'.format(
+                ", ".join(f'"{key}"' for key in row), ", ".join("?" * len(row))
+            ),
+            tuple(row.values()),
+        )
+
+    def cities():
+        return set(connection.execute('SELECT "requestId", "city" FROM "request_cities"'))
+
+    insert("r1", '[" Milano ", "milano", "Roma"]')
+    insert("r2", "not json")
+    for statement in migrations[position][1]:
+        connection.execute(statement)
+
+    assert cities() == {("r1", "milano"), ("r1", "roma")}
+
+    insert("r3", '["Corbetta", "", 3]')
+    assert cities() == {("r1", "milano"), ("r1", "roma"), ("r3", "corbetta")}
+
+    connection.execute('UPDATE "requests" SET "searchCities" = ? WHERE "id" = ?', ('["Torino"]', "r1"))
+    connection.execute('UPDATE "requests" SET "searchCities" = ? WHERE "id" = ?', ('["Pavia"]', "r2"))
+    assert cities() == {("r1", "torino"), ("r2", "pavia"), ("r3", "corbetta")}
+
+    connection.execute('UPDATE "requests" SET "searchCities" = NULL WHERE "id" = ?', ("r2",))
+    connection.execute('DELETE FROM "requests" WHERE "id" = ?', ("r3",))
+    assert cities() == {("r1", "torino")}
@@ -0,0 +1,48 @@
+# ==============================================
+# AI Tools Unit Test - Load Profiles
+# ==============================================
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app.services import load_profiles  # noqa: E402
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("profile", ["card", "scoring"])
+def test_list_profiles_skip_long_text(profile):
+    """List profiles never load description, notes or internalNotes"""
+    sql = str(sqlalchemy.select(load_profiles.Property).options(
+        *load_profiles.property_load_options(profile)
+    ))
+
+    assert '"priceSale"' in sql
+    for column in ("description", "notes", '"internalNotes"'):
+        assert f"properties.{column}" not in sql
+
+
+@pytest.mark.unit
+def test_extra_columns_are_loaded():
+    """Callers can add columns on top of a profile"""
+    sql = str(sqlalchemy.select(load_profiles.Property).options(
+        *load_profiles.property_load_options("card", "description")
+    ))
+
+    assert "properties.description" in sql
+    assert "properties.notes" not in sql
+
+
+@pytest.mark.unit
+def test_detail_profile_loads_the_whole_row():
+    assert load_profiles.property_load_options("detail") == []
+
+
+@pytest.mark.unit
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        load_profiles.property_load_options("thumbnail")
@@ -0,0 +1,194 @@
+# ==============================================
+# AI Tools Unit Test - Market Stats
+# ==============================================
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+np = pytest.importorskip("numpy")
+from app import models  # noqa: E402
+from app.services import market_stats  # noqa: E402
+
+
+def _group(status, city, property_type, contract_type, prices, unpriced=0):
+    return {
+        "status": status,
+        "city": city,
+        "propertyType": property_type,
+        "contractType": contract_type,
+        "count": len(prices) + unpriced,
+        "priced": len(prices),
+        "price_sum": float(sum(prices)),
+    }
+
+
+@pytest.fixture
+def snapshot():
+    rows = [
+        ("available", "Milano", "apartment", "sale", [200000, 300000, 400000], 1),
+        ("available", "Milano", "villa", "sale", [900000], 0),
+        ("available", "Milano", "apartment", "rent", [1200, 1500], 0),
+        ("available", "Corbetta", "apartment", "sale", [150000], 0),
+        ("sold", "Milano", "apartment", "sale", [250000], 0),
+    ]
+    groups = [_group(*row) for row in rows]
+    prices = {row[:4]: np.sort(np.asarray(row[4], dtype=np.float64)) for row in rows}
+    return market_stats.PortfolioSnapshot(groups, prices)
+
+
+@pytest.mark.unit
+def test_select_matches_city_substring(snapshot):
+    groups = snapshot.select(status="available", city="mil", contract_type="sale")
+
+    assert len(groups) == 2
+    assert {group["propertyType"] for group in groups} == {"apartment", "villa"}
+
+
+@pytest.mark.unit
+def test_summary_counts_unpriced_listings(snapshot):
+    summary = snapshot.summarize(snapshot.select(status="available", city="Milano", contract_type="sale"))
+
+    assert summary["count"] == 5
+    assert summary["priced"] == 4
+    assert summary["avg_price"] == 450000
+    assert summary["percentiles"]["p50"] == 350000
+
+
+@pytest.mark.unit
+def test_empty_selection(snapshot):
+    summary = snapshot.summarize(snapshot.select(city="Roma"))
+
+    assert summary["count"] == 0
+    assert summary["avg_price"] == 0
+    assert summary["percentiles"] == {"p25": None, "p50": None, "p75": None}
+
+
+@pytest.mark.unit
+def test_counts_by(snapshot):
+    groups = snapshot.select(status="available")
+
+    assert snapshot.counts_by(groups, "city") == [("Milano", 7), ("Corbetta", 1)]
+    assert snapshot.counts_by(groups, "propertyType", top=1) == [("apartment", 7)]
+
+
+@pytest.mark.unit
+def test_normalize_city():
+    assert market_stats.normalize_city("  Corbetta ") == "corbetta"
+
+
+@pytest.mark.unit
+def test_normalize_city_matches_the_request_cities_triggers():
+    """Same keys as lower(trim(...)) in SQLite, non-ASCII names included"""
+    connection = sqlite3.connect(":memory:")
+    for city in ("Forlì", " CITTÀ di Castello ", "Reggio nell'Emilia", "\tMilano"):
+        expected = connection.execute("SELECT lower(trim(?))", (city,)).fetchone()[0]
+        assert market_stats.normalize_city(city) == expected
+
+
+@pytest.fixture
+def db(tmp_path):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import sessionmaker
+
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'market.db'}")
+    models.Base.metadata.create_all(engine, tables=[
+        models.Property.__table__,
+        models.Request.__table__,
+        models.RequestCity.__table__,
+    ])
+    session = sessionmaker(bind=engine)()
+
+    listings = [
+        ("p1", "sale", 200000.0, None),
+        ("p2", "sale", 400000.0, None),
+        # Not set: counted, left out of the prices
+        ("p3", "sale", 0.0, None),
+        ("p4", "sale", None, None),
+        ("p5", "rent", None, 1200.0),
+        ("p6", "rent", 300000.0, 0.0),
+    ]
+    session.add_all([
+        models.Property(
+            id=property_id, status="available", city="Milano", propertyType="apartment",
+            contractType=contract_type, priceSale=price_sale, priceRentMonthly=price_rent,
+        )
+        for property_id, contract_type, price_sale, price_rent in listings
+    ])
+    session.add_all([
+        models.Request(id="r1", status="active", searchCities=["Milano", "Roma"]),
+        models.Request(id="r2", status="active", searchCities=[" milano "]),
+        models.Request(id="r3", status="cancelled", searchCities=["Milano"]),
+        models.Request(id="r4", status="active", searchCities=["Milano Marittima"]),
+        models.Request(id="r5", status="active", searchCities=["Forlì", None]),
+    ])
+    session.commit()
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_load_leaves_zero_prices_out(db):
+    snapshot = market_stats.PortfolioSnapshot.load(db)
+
+    assert len(snapshot) == 6
+    sale = snapshot.summarize(snapshot.select(contract_type="sale"))
+    assert (sale["count"], sale["priced"]) == (4, 2)
+    assert sale["avg_price"] == 300000
+    assert sale["percentiles"]["p50"] == 300000
+
+    rent = snapshot.summarize(snapshot.select(contract_type="rent"))
+    assert (rent["count"], rent["priced"]) == (2, 1)
+    assert rent["avg_price"] == 1200
+    assert rent["percentiles"] == {"p25": 1200, "p50": 1200, "p75": 1200}
+
+
+@pytest.mark.unit
+def test_snapshot_is_revalidated_after_max_age(db, monkeypatch):
+    monkeypatch.setattr(market_stats, "_snapshot", None)
+    loads = []
+    load = market_stats.PortfolioSnapshot.load
+
+    def spy(session):
+        loads.append(session)
+        return load(session)
+
+    monkeypatch.setattr(market_stats.PortfolioSnapshot, "load", staticmethod(spy))
+
+    first = market_stats.get_portfolio_snapshot(db)
+    db.add(models.Property(id="p7", status="sold", city="Roma", contractType="sale", priceSale=1.0))
+    db.commit()
+
+    # Within max_age the cached snapshot is served as is
+    assert market_stats.get_portfolio_snapshot(db) is first
+    assert len(loads) == 1
+
+    rebuilt = market_stats.get_portfolio_snapshot(db, max_age=0)
+    assert len(rebuilt) == 7
+    # Expired but unchanged: validated, not rebuilt
+    assert market_stats.get_portfolio_snapshot(db, max_age=0) is rebuilt
+    assert len(loads) == 2
+
+
+@pytest.mark.unit
+def test_count_active_requests_uses_request_cities(db):
+    assert market_stats.rebuild_request_cities(db) == 6
+
+    assert market_stats.count_active_requests(db, "Milano") == 2
+    assert market_stats.count_active_requests(db, " ROMA ") == 1
+    assert market_stats.count_active_requests(db, "Torino") == 0
+    assert market_stats.count_active_requests(db, "forlì") == 1
+
+
+@pytest.mark.unit
+def test_count_active_requests_without_request_cities(db):
+    models.RequestCity.__table__.drop(db.get_bind())
+
+    # LIKE fallback: substring of the raw JSON, "Milano Marittima" included
+    assert market_stats.count_active_requests(db, "Milano") == 3
@@ -0,0 +1,250 @@
+# ==============================================
+# AI Tools Unit Test - Match Materializer
+# ==============================================
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from app.services import match_materializer  # noqa: E402
+from app import models  # noqa: E402
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+
+def _property(property_id, **fields):
+    values = {
+        "id": property_id,
+        "status": "available",
+        "contractType": "sale",
+        "city": "Milano",
+        "zone": "Brera",
+        "propertyType": "apartment",
+        "priceSale": 300000.0,
+        "sqmCommercial": 80.0,
+        "rooms": 3,
+        "condition": "ottimo",
+        "updatedAt": datetime(2026, 1, 1),
+    }
+    values.update(fields)
+    return models.Property(**values)
+
+
+def _request(request_id, **fields):
+    values = {
+        "id": request_id,
+        "contactId": f"contact_{request_id}",
+        "status": "active",
+        "contractType": "sale",
+        "searchCities": json.dumps(["Milano"]),
+        "searchZones": json.dumps(["Brera"]),
+        "propertyTypes": json.dumps(["apartment"]),
+        "priceMin": 200000.0,
+        "priceMax": 350000.0,
+        "sqmMin": 60.0,
+        "roomsMin": 2,
+        "updatedAt": datetime(2026, 1, 1),
+    }
+    values.update(fields)
+    return models.Request(**values)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'matches.db'}")
+    models.Base.metadata.create_all(engine, tables=[
+        models.Property.__table__,
+        models.Request.__table__,
+        models.Match.__table__,
+        models.AuditLog.__table__,
+    ])
+    factory = sessionmaker(bind=engine)
+
+    session = factory()
+    session.add_all([
+        _property("prop_a"),
+        _property("prop_b", zone="Centro"),
+        _property("prop_c", contractType="rent", priceRentMonthly=1200.0),
+        _request("req_1"),
+        _request("req_2", searchZones=None),
+    ])
+    session.commit()
+    session.close()
+
+    yield factory
+    engine.dispose()
+
+
+def _matches(factory):
+    session = factory()
+    try:
+        return {
+            (match.requestId, match.propertyId): match
+            for match in session.query(models.Match).all()
+        }
+    finally:
+        session.close()
+
+
+def _update(factory, model, entity_id, **fields):
+    session = factory()
+    try:
+        entity = session.get(model, entity_id)
+        for name, value in fields.items():
+            setattr(entity, name, value)
+        session.commit()
+    finally:
+        session.close()
+
+
+@pytest.mark.unit
+def test_full_run_inserts_updates_and_deletes(session_factory):
+    materializer = match_materializer.MatchMaterializer(
+        min_score=60, chunk_size=1, session_factory=session_factory
+    )
+
+    first = materializer.run()
+    matches = _matches(session_factory)
+
+    assert set(matches) == {
+        ("req_1", "prop_a"), ("req_1", "prop_b"),
+        ("req_2", "prop_a"), ("req_2", "prop_b"),
+    }
+    assert (first["inserted"], first["updated"], first["deleted"]) == (4, 0, 0)
+    assert all(match.status == "suggested" for match in matches.values())
+    assert matches[("req_1", "prop_a")].contactId == "contact_req_1"
+
+    # prop_a no longer fits (below min_score), prop_b is sold; req_2's
+    # match on prop_b was already sent to the client and is kept
+    _update(
+        session_factory, models.Property, "prop_a",
+        city="Torino", propertyType="villa", priceSale=900000.0
+    )
+    _update(session_factory, models.Property, "prop_b", status="sold")
+    _update(session_factory, models.Match, matches[("req_2", "prop_b")].id, status="sent")
+
+    second = materializer.run()
+
+    assert (second["inserted"], second["updated"], second["deleted"]) == (0, 0, 3)
+    assert set(_matches(session_factory)) == {("req_2", "prop_b")}
+
+    # prop_a fits again: inserted again, with fresh scores
+    _update(
+        session_factory, models.Property, "prop_a",
+        city="Milano", propertyType="apartment", priceSale=320000.0
+    )
+
+    third = materializer.run()
+
+    assert (third["inserted"], third["updated"], third["deleted"]) == (2, 0, 0)
+    assert set(_matches(session_factory)) == {
+        ("req_1", "prop_a"), ("req_2", "prop_a"), ("req_2", "prop_b"),
+    }
+
+
+@pytest.mark.unit
+def test_full_run_refreshes_scores_of_kept_matches(session_factory):
+    materializer = match_materializer.MatchMaterializer(min_score=60, session_factory=session_factory)
+    materializer.run()
+    before = _matches(session_factory)[("req_1", "prop_a")]
+
+    _update(session_factory, models.Property, "prop_a", priceSale=340000.0, condition="buono")
+    stats = materializer.run()
+    after = _matches(session_factory)[("req_1", "prop_a")]
+
+    assert stats["updated"] == 4
+    assert stats["deleted"] == 0
+    assert after.id == before.id
+    assert after.scoreCondition < before.scoreCondition
+
+
+@pytest.mark.unit
+def test_changed_entity_ids_reads_updated_at_and_audit_log(session_factory):
+    since = datetime(2026, 6, 1)
+    _update(session_factory, models.Property, "prop_a", updatedAt=datetime(2026, 6, 2))
+    _update(session_factory, models.Request, "req_2", updatedAt=datetime(2026, 6, 2))
+
+    session = session_factory()
+    session.add_all([
+        # Deleted rows only show up in the audit log
+        models.AuditLog(id="log_1", entityType="Property", entityId="prop_gone",
+                        action="delete", createdAt=datetime(2026, 6, 3)),
+        models.AuditLog(id="log_2", entityType="Request", entityId="req_gone",
+                        action="delete", createdAt=datetime(2026, 6, 3)),
+        models.AuditLog(id="log_3", entityType="Property", entityId="prop_old",
+                        action="update", createdAt=datetime(2026, 5, 1)),
+        models.AuditLog(id="log_4", entityType="Contact", entityId="contact_1",
+                        action="update", createdAt=datetime(2026, 6, 3)),
+    ])
+    session.commit()
+
+    materializer = match_materializer.MatchMaterializer(session_factory=session_factory)
+    try:
+        property_ids, request_ids = materializer.changed_entity_ids(session, since)
+    finally:
+        session.close()
+
+    assert property_ids == {"prop_a", "prop_gone"}
+    assert request_ids == {"req_2", "req_gone"}
+
+
+@pytest.mark.unit
+def test_incremental_run_syncs_changed_region(session_factory):
+    materializer = match_materializer.MatchMaterializer(min_score=60, session_factory=session_factory)
+    materializer.run()
+    since = datetime.utcnow()
+
+    # prop_a no longer fits; prop_b is deleted (audit log only)
+    _update(
+        session_factory, models.Property, "prop_a",
+        city="Torino", propertyType="villa", priceSale=900000.0, updatedAt=datetime.utcnow()
+    )
+    session = session_factory()
+    session.delete(session.get(models.Property, "prop_b"))
+    session.add(models.AuditLog(id="log_1", entityType="Property", entityId="prop_b",
+                                action="delete", createdAt=datetime.utcnow()))
+    session.commit()
+    session.close()
+
+    stats = materializer.run_incremental(since)
+
+    assert stats["changed_properties"] == 2
+    assert stats["changed_requests"] == 0
+    assert (stats["inserted"], stats["updated"], stats["deleted"]) == (0, 0, 4)
+    assert _matches(session_factory) == {}
+
+    # Nothing changed since the watermark: nothing is rescored or written
+    idle = materializer.run_incremental(datetime.fromisoformat(stats["watermark"]))
+    assert idle["pairs"] == 0
+    assert (idle["inserted"], idle["updated"], idle["deleted"]) == (0, 0, 0)
+
+
+@pytest.mark.unit
+def test_sync_matches_skips_unchanged_scores(session_factory):
+    materializer = match_materializer.MatchMaterializer(min_score=60, session_factory=session_factory)
+    materializer.run()
+    matches = _matches(session_factory)
+    row = {
+        "requestId": "req_1",
+        "propertyId": "prop_a",
+        "contactId": "contact_req_1",
+        "scoreTotal": matches[("req_1", "prop_a")].scoreTotal,
+        **{
+            column: getattr(matches[("req_1", "prop_a")], column)
+            for column in match_materializer.MATCH_SCORE_COLUMNS
+        },
+    }
+
+    # req_1 rescored: prop_a unchanged, prop_b dropped, req_2's rows untouched
+    counts = materializer.sync_matches([row], {"req_1"}, set())
+
+    assert counts == {"inserted": 0, "updated": 0, "deleted": 1, "unchanged": 1}
+    assert set(_matches(session_factory)) == {
+        ("req_1", "prop_a"), ("req_2", "prop_a"), ("req_2", "prop_b"),
+    }
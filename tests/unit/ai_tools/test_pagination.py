@@ -0,0 +1,164 @@
+# ==============================================
+# AI Tools Unit Test - Keyset Pagination
+# ==============================================
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from app.utils import pagination  # noqa: E402
+
+from sqlalchemy import Column, DateTime, String, select  # noqa: E402
+from sqlalchemy.orm import declarative_base  # noqa: E402
+
+Base = declarative_base()
+
+
+class Listing(Base):
+    __tablename__ = "listings"
+
+    id = Column(String, primary_key=True)
+    kind = Column(String)
+    createdAt = Column(DateTime)
+
+
+async def _with_listings(callback):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    start = datetime(2025, 1, 1)
+    async with async_sessionmaker(engine)() as db:
+        # Pairs of rows share a createdAt, so the id tiebreak matters
+        db.add_all([
+            Listing(id=f"l{i:02d}", kind="even" if i % 2 == 0 else "odd", createdAt=start + timedelta(hours=i // 2))
+            for i in range(25)
+        ])
+        await db.commit()
+        try:
+            return await callback(db)
+        finally:
+            await engine.dispose()
+
+
+@pytest.mark.unit
+def test_cursor_round_trip():
+    cursor = pagination.encode_cursor(datetime(2025, 3, 1, 12, 30), "prop_1")
+
+    assert "prop_1" not in cursor
+    assert pagination.decode_cursor(cursor) == (datetime(2025, 3, 1, 12, 30), "prop_1")
+
+
+@pytest.mark.unit
+def test_cursor_without_created_at():
+    cursor = pagination.encode_cursor(None, "prop_1")
+
+    assert pagination.decode_cursor(cursor) == (None, "prop_1")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cursor", ["garbage", "W10", pagination.encode_cursor(datetime(2025, 1, 1), "x")[:-3]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(cursor)
+
+
+@pytest.mark.unit
+def test_keyset_walk_matches_offset_pages():
+    """Following next_cursor visits every row once, in the order of the offset pages"""
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+
+    async def walk(db):
+        query = select(Listing)
+        offset_ids = []
+        for page in range(1, 5):
+            result = await pagination.paginate(db, query, Listing, 7, page=page, total="none")
+            offset_ids += [row.id for row in result.rows]
+
+        keyset_ids, cursor = [], None
+        while True:
+            result = await pagination.paginate(db, query, Listing, 7, cursor=cursor, cache_key="listings")
+            keyset_ids += [row.id for row in result.rows]
+            cursor = result.next_cursor
+            if cursor is None:
+                return offset_ids, keyset_ids, result
+
+    offset_ids, keyset_ids, last = asyncio.run(_with_listings(walk))
+
+    assert keyset_ids == offset_ids
+    assert len(set(keyset_ids)) == 25
+    assert keyset_ids[:2] == ["l24", "l23"]
+    assert len(last.rows) == 4
+    assert last.total == 25
+
+
+@pytest.mark.unit
+def test_keyset_walk_includes_rows_without_created_at():
+    """Undated rows come after the dated ones and are paged by id"""
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+
+    async def walk(db):
+        db.add_all([Listing(id=f"n{i:02d}", kind="odd", createdAt=None) for i in range(5)])
+        await db.flush()
+
+        ids, cursor = [], None
+        while True:
+            result = await pagination.paginate(db, select(Listing), Listing, 4, cursor=cursor, total="none")
+            ids += [row.id for row in result.rows]
+            cursor = result.next_cursor
+            if cursor is None:
+                return ids
+
+    ids = asyncio.run(_with_listings(walk))
+
+    assert len(ids) == len(set(ids)) == 30
+    assert ids[:2] == ["l24", "l23"]
+    assert ids[-5:] == ["n04", "n03", "n02", "n01", "n00"]
+
+
+@pytest.mark.unit
+def test_totals_modes():
+    """Exact counts refresh the cache, cached ones reuse it, none skips counting"""
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    pagination.totals_cache.clear()
+
+    async def count(db):
+        query = select(Listing).where(Listing.kind == "even")
+        exact = await pagination.count_total(db, query, "exact", ("listings", "even"))
+
+        db.add(Listing(id="l99", kind="even", createdAt=datetime(2026, 1, 1)))
+        await db.flush()
+        cached = await pagination.count_total(db, query, "cached", ("listings", "even"))
+        # No estimate on SQLite: approximate falls back to the cache
+        approximate = await pagination.count_total(db, query, "approximate", ("listings", "even"))
+        fresh = await pagination.count_total(db, query, "exact", ("listings", "even"))
+        none = await pagination.count_total(db, query, "none", ("listings", "even"))
+        return exact, cached, approximate, fresh, none
+
+    exact, cached, approximate, fresh, none = asyncio.run(_with_listings(count))
+
+    assert exact == (13, True)
+    assert cached == (13, False)
+    assert approximate == (13, False)
+    assert fresh == (14, True)
+    assert none == (None, False)
+
+
+@pytest.mark.unit
+def test_totals_cache_expires():
+    cache = pagination.TotalsCache(ttl_seconds=0)
+    cache.set("key", 10)
+
+    assert cache.get("key") is None
+    assert pagination.TotalsCache().get("missing") is None
@@ -0,0 +1,98 @@
+# ==============================================
+# AI Tools Unit Test - Property Vector
+# ==============================================
+
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app.services import property_vector  # noqa: E402
+from app.services import property_scorer  # noqa: E402
+
+
+def _property(**overrides):
+    fields = dict(
+        id="prop_1",
+        contractType="sale",
+        city="Milano",
+        zone="Brera",
+        propertyType="apartment",
+        priceSale=Decimal("320000.00"),
+        priceRentMonthly=None,
+        sqmCommercial=85.0,
+        rooms=3,
+        bedrooms=2,
+        condition="Ottimo",
+        energyClass="B",
+        latitude=45.472,
+        longitude=9.187,
+        hasElevator=True,
+        hasParking=False,
+        hasGarage=True,
+        hasGarden=None,
+        hasTerrace=False,
+        hasBalcony=True,
+        hasCellar=False,
+        hasAlarm=False,
+        furnished=True,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _request():
+    return SimpleNamespace(
+        id="req_1",
+        contractType="sale",
+        searchCities=json.dumps(["Milano"]),
+        searchZones=json.dumps(["Brera"]),
+        propertyTypes=json.dumps(["apartment"]),
+        priceMin=250000,
+        priceMax=350000,
+        sqmMin=70,
+        sqmMax=100,
+        roomsMin=3,
+        roomsMax=4,
+        bedroomsMin=2,
+        requiresElevator=True,
+        requiresParking=True,
+        requiresGarden=True,
+        requiresTerrace=False,
+        searchRadiusKm=3,
+        centerLatitude=45.46,
+        centerLongitude=9.19,
+    )
+
+
+@pytest.mark.unit
+def test_vector_exposes_property_fields():
+    """Feature bits and condition codes read back as the original values"""
+    prop = _property()
+    vector = property_vector.PropertyVector.from_property(prop)
+
+    for name in property_vector.FEATURE_FLAGS:
+        assert getattr(vector, name) == bool(getattr(prop, name))
+    assert vector.condition == "Ottimo"
+    assert vector.priceSale == 320000.0
+    assert not hasattr(vector, "__dict__")
+
+    assert property_vector.PropertyVector.from_property(_property(condition=None)).condition is None
+
+
+@pytest.mark.unit
+def test_vector_scores_like_property():
+    """Scoring a vector gives the same result as scoring the property"""
+    scorer = property_scorer.PropertyScorer()
+
+    for overrides in ({}, {"condition": "altro", "hasElevator": False}, {"latitude": None, "zone": None}):
+        prop = _property(**overrides)
+        vector = property_vector.PropertyVector.from_property(prop)
+
+        assert scorer.calculate_match_score(vector, _request()) == \
+            scorer.calculate_match_score(prop, _request())
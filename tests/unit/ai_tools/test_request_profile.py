@@ -0,0 +1,145 @@
+# ==============================================
+# AI Tools Unit Test - Request Profile
+# ==============================================
+
+import json
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+from app import models  # noqa: E402
+from app.services import request_profile  # noqa: E402
+
+
+def _request(**overrides):
+    fields = dict(
+        id="req_1",
+        contractType="sale",
+        searchCities=json.dumps(["Milano", "ROMA"]),
+        searchZones=json.dumps(["Brera"]),
+        propertyTypes=json.dumps(["apartment"]),
+        priceMin=None,
+        priceMax=350000,
+        sqmMin=0,
+        sqmMax=None,
+        roomsMin=3,
+        roomsMax=None,
+        bedroomsMin=None,
+        requiresElevator=None,
+        requiresParking=True,
+        requiresGarden=False,
+        requiresTerrace=False,
+        searchRadiusKm=5,
+        centerLatitude=45.46,
+        centerLongitude=9.19,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+@pytest.mark.unit
+def test_profile_parses_and_normalizes_fields():
+    """JSON arrays become frozensets, bounds become floats or None"""
+    profile = request_profile.RequestProfile(_request())
+
+    assert profile.search_cities == frozenset({"milano", "roma"})
+    assert profile.search_zones == frozenset({"brera"})
+    assert profile.property_types == frozenset({"apartment"})
+    assert profile.price_max == 350000.0 and profile.price_min is None
+    assert profile.sqm_min is None
+    assert profile.rooms_min == 3
+    assert profile.requires_features
+    assert profile.search_radius_km == 5.0
+
+
+@pytest.mark.unit
+def test_profile_handles_invalid_json_and_missing_center():
+    """Invalid JSON gives empty sets; a radius without a center is ignored"""
+    profile = request_profile.RequestProfile(
+        _request(searchCities="not json", searchZones=None, centerLatitude=None)
+    )
+
+    assert profile.search_cities == frozenset()
+    assert profile.search_zones == frozenset()
+    assert profile.search_radius_km is None
+
+
+@pytest.mark.unit
+def test_profile_is_immutable_and_picklable():
+    """Profiles cannot be modified and survive pickling (process pools)"""
+    profile = request_profile.RequestProfile(_request())
+
+    with pytest.raises(AttributeError):
+        profile.price_max = 1
+
+    restored = pickle.loads(pickle.dumps(profile))
+    assert restored.search_cities == profile.search_cities
+    assert restored.price_max == profile.price_max
+
+
+@pytest.mark.unit
+def test_profiles_cached_by_id_and_updated_at():
+    """The same request version compiles once; a new updatedAt recompiles"""
+    updated_at = datetime(2026, 1, 1)
+    request = _request(id="req_cache", updatedAt=updated_at)
+
+    first = request_profile.RequestProfile.of(request)
+    assert request_profile.RequestProfile.of(request) is first
+    assert request_profile.RequestProfile.of(first) is first
+
+    request.updatedAt = datetime(2026, 1, 2)
+    assert request_profile.RequestProfile.of(request) is not first
+
+
+@pytest.mark.unit
+def test_profile_cache_is_thread_safe(monkeypatch):
+    """Concurrent lookups and evictions keep the cache consistent and bounded"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(request_profile, "PROFILE_CACHE_SIZE", 50)
+    updated_at = datetime(2026, 1, 1)
+    requests = [_request(id=f"req_thread_{i}", updatedAt=updated_at) for i in range(200)]
+
+    def lookup(offset):
+        for i in range(2000):
+            profile = request_profile.RequestProfile.of(requests[(i * 7 + offset) % len(requests)])
+            assert profile.id.startswith("req_thread_")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lookup, range(8)))
+
+    assert len(request_profile.RequestProfile._cache) <= 50
+
+
+@pytest.mark.unit
+def test_profile_of_a_session_loaded_request(tmp_path):
+    """JSON columns come back decoded from the ORM, not as JSON text"""
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'requests.db'}")
+    models.Base.metadata.create_all(engine, tables=[models.Request.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add(models.Request(
+            id="req_1", status="active", contractType="sale",
+            searchCities=["Milano", "ROMA"], searchZones=["Brera"], propertyTypes=["apartment"],
+        ))
+        session.commit()
+        session.expunge_all()
+
+        request = session.get(models.Request, "req_1")
+        assert request.searchCities == ["Milano", "ROMA"]
+        profile = request_profile.RequestProfile(request)
+    finally:
+        session.close()
+        engine.dispose()
+
+    assert profile.search_cities == frozenset({"milano", "roma"})
+    assert profile.search_zones == frozenset({"brera"})
+    assert profile.property_types == frozenset({"apartment"})
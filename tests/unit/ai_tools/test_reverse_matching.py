@@ -0,0 +1,100 @@
+# ==============================================
+# AI Tools Unit Test - Reverse Matching
+# ==============================================
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai_tools"))
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from app.services import reverse_matching  # noqa: E402
+from app.services import market_stats  # noqa: E402
+from app import models  # noqa: E402
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+
+def _request(request_id, cities, **fields):
+    values = {
+        "id": request_id,
+        "status": "active",
+        "contractType": "sale",
+        "searchCities": cities,
+        "priceMax": 400000.0,
+    }
+    values.update(fields)
+    return models.Request(**values)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'reverse.db'}")
+    models.Base.metadata.create_all(engine, tables=[
+        models.Property.__table__,
+        models.Request.__table__,
+        models.RequestCity.__table__,
+    ])
+    session = sessionmaker(bind=engine)()
+
+    session.add(models.Property(
+        id="prop_1", status="available", contractType="sale", city="Milano",
+        propertyType="apartment", priceSale=300000.0, sqmCommercial=80.0, rooms=3,
+    ))
+    session.add_all([
+        _request("req_city", ["milano", "Roma"]),
+        _request("req_other_city", ["Roma"]),
+        # LIKE wildcards must not match: only request_cities decides
+        _request("req_wildcard", ["M_lano%"]),
+        # No city preference, stored as JSON null, SQL NULL and []
+        _request("req_any_city", None),
+        _request("req_null_cities", sqlalchemy.null()),
+        _request("req_no_cities", []),
+        _request("req_rent", ["Milano"], contractType="rent"),
+        _request("req_closed", ["Milano"], status="cancelled"),
+        _request("req_low_budget", ["Milano"], priceMax=200000.0),
+        _request("req_radius", ["Roma"], searchRadiusKm=5.0, centerLatitude=45.46, centerLongitude=9.19),
+    ])
+    session.commit()
+    market_stats.rebuild_request_cities(session)
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_candidates_use_request_cities(db):
+    prop = db.get(models.Property, "prop_1")
+    matcher = reverse_matching.ReverseMatcher()
+
+    ids = {request.id for request in matcher.candidate_requests_query(db, prop)}
+
+    assert ids == {"req_city", "req_any_city", "req_null_cities", "req_no_cities"}
+
+
+@pytest.mark.unit
+def test_radius_requests_are_candidates_for_located_properties(db):
+    prop = db.get(models.Property, "prop_1")
+    prop.latitude, prop.longitude = 45.47, 9.2
+    matcher = reverse_matching.ReverseMatcher()
+
+    ids = {request.id for request in matcher.candidate_requests_query(db, prop)}
+
+    assert "req_radius" in ids
+
+
+@pytest.mark.unit
+def test_matches_are_scored_like_get_sorted_requests(db):
+    prop = db.get(models.Property, "prop_1")
+    matcher = reverse_matching.ReverseMatcher()
+    candidates = matcher.candidate_requests_query(db, prop).all()
+
+    result = matcher.find_matching_requests(db, prop, min_score=0, limit=2)
+    expected = matcher.scorer.get_sorted_requests(prop, candidates)[:2]
+
+    assert result["candidates_evaluated"] == 4
+    assert [(m["request"].id, m["score_data"]) for m in result["matches"]] == \
+        [(m["request"].id, m["score_data"]) for m in expected]
@@ -0,0 +1,216 @@
+# ==============================================
+# Scraping Unit Test - Cache
+# ==============================================
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("pydantic_settings")
+from scraping.common import cache as cache_module  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    # Disk tier only: these tests edit the table behind the cache's back
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path), ttl=60,
+                               memory=cache_module.MemoryLRU(max_bytes=0))
+    yield cache
+    cache.close()
+
+
+@pytest.mark.unit
+def test_round_trip(cache):
+    html = "<html>" + "<div class='in-card'>Trilocale</div>" * 200 + "</html>"
+
+    cache.set("https://www.immobiliare.it/vendita-case/milano/", html)
+    cache.set("listing:1", {"price": 250000, "title": "Bilocale è luminoso"})
+
+    assert cache.get("https://www.immobiliare.it/vendita-case/milano/") == html
+    assert cache.get("listing:1") == {"price": 250000, "title": "Bilocale è luminoso"}
+    assert cache.exists("listing:1")
+    assert cache.get("missing") is None
+
+
+@pytest.mark.unit
+def test_large_values_are_compressed(cache):
+    html = "<div class='in-card'>Trilocale</div>" * 500
+
+    cache.set("page", html)
+    cache.set("small", "ok")
+
+    rows = dict(cache._conn.execute("SELECT key, compression FROM cache_entries"))
+    size = cache._conn.execute("SELECT size FROM cache_entries WHERE key = 'page'").fetchone()[0]
+    assert rows["page"] in ("zstd", "zlib")
+    assert rows["small"] == "none"
+    assert size < len(html) / 10
+
+
+@pytest.mark.unit
+def test_expiry(cache):
+    cache.set("old", "value", ttl=1)
+    cache.set("fresh", "value")
+    cache._conn.execute("UPDATE cache_entries SET expires_at = ? WHERE key = 'old'", (time.time() - 1,))
+
+    assert cache.get("old") is None
+    assert not cache.exists("old")
+
+    cache.clear_expired()
+    keys = [row[0] for row in cache._conn.execute("SELECT key FROM cache_entries")]
+    assert keys == ["fresh"]
+
+
+@pytest.mark.unit
+def test_portals_share_the_file_not_the_keys(cache, tmp_path):
+    other = cache_module.Cache(portal="casa_it", cache_dir=str(tmp_path), memory=cache_module.MemoryLRU(max_bytes=0))
+    try:
+        cache.set("page", "immobiliare")
+        other.set("page", "casa")
+
+        assert cache.get("page") == "immobiliare"
+        assert other.get("page") == "casa"
+
+        other.clear()
+        assert other.get("page") is None
+        assert cache.get("page") == "immobiliare"
+    finally:
+        other.close()
+
+
+@pytest.mark.unit
+def test_hot_tier_serves_repeated_reads(tmp_path):
+    memory = cache_module.MemoryLRU(max_bytes=1024 * 1024)
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path), memory=memory)
+    try:
+        cache.set("page", "<html>1</html>")
+        cold = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path),
+                                  memory=cache_module.MemoryLRU(max_bytes=1024 * 1024))
+
+        assert cold.get("page") == "<html>1</html>"
+        assert cold.get("page") == "<html>1</html>"
+        assert cold.get("missing") is None
+
+        stats = cold.stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=0.001)
+        cold.close()
+    finally:
+        cache.close()
+
+
+@pytest.mark.unit
+def test_memory_lru_is_bounded_by_size():
+    memory = cache_module.MemoryLRU(max_bytes=100)
+    expires = time.time() + 60
+
+    memory.set("a", "x" * 40, 40, expires)
+    memory.set("b", "y" * 40, 40, expires)
+    memory.get("a")
+    memory.set("c", "z" * 40, 40, expires)
+
+    assert memory.get("b") is None
+    assert memory.get("a") is not None
+    assert memory.bytes == 80
+    assert memory.evictions == 1
+
+
+@pytest.mark.unit
+def test_disk_cap_evicts_least_recently_read(tmp_path):
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path), max_bytes=1000,
+                               memory=cache_module.MemoryLRU(max_bytes=0))
+    try:
+        for n in range(4):
+            cache.set(f"page{n}", str(n) * 200)
+            time.sleep(0.01)
+        cache.get("page0")
+        time.sleep(0.01)
+
+        cache.set("page4", "4" * 300)
+
+        stats = cache.stats()
+        assert stats["disk_bytes"] <= 1000
+        assert stats["disk_evictions"] == 1
+        assert cache.get("page1") is None
+        assert cache.get("page0") == "0" * 200
+    finally:
+        cache.close()
+
+
+@pytest.mark.unit
+def test_memory_hits_keep_entries_from_eviction(tmp_path):
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path), max_bytes=1000,
+                               memory=cache_module.MemoryLRU(max_bytes=1024 * 1024))
+    try:
+        for n in range(4):
+            cache.set(f"page{n}", str(n) * 200)
+            time.sleep(0.01)
+        # Served by the hot tier: the disk read time is written before evicting
+        assert cache.get("page0") == "0" * 200
+        assert cache.counters["memory_hits"] == 1
+        time.sleep(0.01)
+
+        cache.set("page4", "4" * 300)
+
+        keys = {row[0] for row in cache._conn.execute("SELECT key FROM cache_entries")}
+        assert keys == {"page0", "page2", "page3", "page4"}
+    finally:
+        cache.close()
+
+
+@pytest.mark.unit
+def test_memory_hit_read_times_are_flushed_in_batches(tmp_path, monkeypatch):
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path),
+                               memory=cache_module.MemoryLRU(max_bytes=1024 * 1024))
+
+    def accessed_at():
+        return cache._conn.execute("SELECT accessed_at FROM cache_entries WHERE key = 'page'").fetchone()[0]
+
+    cache.set("page", "<html>1</html>")
+    written = accessed_at()
+
+    monkeypatch.setattr(cache_module, "TOUCH_FLUSH_SECONDS", 60)
+    cache._touched_flushed = time.monotonic()
+    cache.get("page")
+    assert accessed_at() == written
+
+    time.sleep(0.01)
+    monkeypatch.setattr(cache_module, "TOUCH_FLUSH_SECONDS", 0)
+    cache.get("page")
+    assert accessed_at() > written
+
+    # Pending read times are written on close
+    monkeypatch.setattr(cache_module, "TOUCH_FLUSH_SECONDS", 60)
+    flushed = accessed_at()
+    time.sleep(0.01)
+    cache.get("page")
+    cache.close()
+    reopened = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path),
+                                  memory=cache_module.MemoryLRU(max_bytes=0))
+    try:
+        row = reopened._conn.execute("SELECT accessed_at FROM cache_entries WHERE key = 'page'").fetchone()
+        assert row[0] > flushed
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_hot_tier_values_are_not_shared(tmp_path):
+    cache = cache_module.Cache(portal="immobiliare_it", cache_dir=str(tmp_path),
+                               memory=cache_module.MemoryLRU(max_bytes=1024 * 1024))
+    try:
+        listing = {"price": 250000, "features": ["ascensore"]}
+        cache.set("listing:1", listing)
+        listing["features"].append("box")
+
+        first = cache.get("listing:1")
+        first["price"] = 1
+        first["features"].clear()
+
+        assert cache.get("listing:1") == {"price": 250000, "features": ["ascensore"]}
+        assert cache.counters["memory_hits"] == 2
+    finally:
+        cache.close()
@@ -0,0 +1,43 @@
+# ==============================================
+# Scraping Unit Test - Dedup Index
+# ==============================================
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+DEDUP_MODULE = Path(__file__).parent.parent.parent.parent / "scraping" / "database" / "dedup_index.py"
+
+spec = importlib.util.spec_from_file_location("scraping_dedup_index", DEDUP_MODULE)
+dedup_index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(dedup_index)
+
+
+@pytest.mark.unit
+def test_preloaded_rows_are_duplicates():
+    """Hashes and URLs loaded at job start are recognized, either one is enough"""
+    index = dedup_index.DedupIndex.from_rows("immobiliare_it", [
+        ("0123456789abcdef", "https://www.immobiliare.it/annunci/1/"),
+        (None, "https://www.immobiliare.it/annunci/2/"),
+        ("fedcba9876543210", None),
+    ])
+
+    assert len(index) == 2
+    assert index.contains("0123456789abcdef")
+    assert index.contains("ffffffffffffffff", "https://www.immobiliare.it/annunci/2/")
+    assert index.contains("fedcba9876543210", "https://www.immobiliare.it/annunci/new/")
+    assert not index.contains("ffffffffffffffff", "https://www.immobiliare.it/annunci/3/")
+    assert not index.contains(None, None)
+
+
+@pytest.mark.unit
+def test_added_listings_are_duplicates():
+    """Listings saved during the job are rejected on their next occurrence"""
+    index = dedup_index.DedupIndex("casa_it")
+    assert not index.contains("00000000000000aa", "https://www.casa.it/a")
+
+    index.add("00000000000000aa", "https://www.casa.it/a")
+
+    assert index.contains("00000000000000aa")
+    assert index.contains(source_url="https://www.casa.it/a")
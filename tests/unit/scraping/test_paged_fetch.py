@@ -0,0 +1,79 @@
+# ==============================================
+# Scraping Unit Test - Paged Fetch
+# ==============================================
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+PAGED_FETCH_MODULE = Path(__file__).parent.parent.parent.parent / "scraping" / "common" / "paged_fetch.py"
+
+spec = importlib.util.spec_from_file_location("scraping_paged_fetch", PAGED_FETCH_MODULE)
+paged_fetch = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(paged_fetch)
+
+
+def _fake_portal(last_page, delays=None, failing=()):
+    """fetch_page over `last_page` full pages, recording concurrency"""
+    state = {"in_flight": 0, "max_in_flight": 0, "started": []}
+
+    async def fetch_page(page_num):
+        state["started"].append(page_num)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep((delays or {}).get(page_num, 0.01))
+            if page_num in failing:
+                raise RuntimeError("timeout")
+            if page_num > last_page:
+                return []
+            return [{"page": page_num, "card": card} for card in range(2)]
+        finally:
+            state["in_flight"] -= 1
+
+    return fetch_page, state
+
+
+@pytest.mark.unit
+def test_results_are_in_page_order():
+    """Later pages finishing first do not reorder the listings"""
+    fetch_page, state = _fake_portal(6, delays={1: 0.05, 2: 0.03})
+
+    listings = asyncio.run(paged_fetch.fetch_pages(fetch_page, max_pages=6, concurrency=3))
+
+    assert [listing["page"] for listing in listings] == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
+    assert state["max_in_flight"] == 3
+
+
+@pytest.mark.unit
+def test_stops_at_first_empty_page():
+    """No page after the first empty one is started or returned"""
+    fetch_page, state = _fake_portal(4)
+
+    listings = asyncio.run(paged_fetch.fetch_pages(fetch_page, max_pages=50, concurrency=3))
+
+    assert {listing["page"] for listing in listings} == {1, 2, 3, 4}
+    # Pages 6 and 7 may already be in flight when page 5 comes back empty
+    assert max(state["started"]) <= 7
+
+
+@pytest.mark.unit
+def test_failed_pages_are_skipped():
+    fetch_page, _ = _fake_portal(3, failing={2})
+
+    listings = asyncio.run(paged_fetch.fetch_pages(fetch_page, max_pages=3, concurrency=2))
+
+    assert [listing["page"] for listing in listings] == [1, 1, 3, 3]
+
+
+@pytest.mark.unit
+def test_sequential_mode():
+    fetch_page, state = _fake_portal(10)
+
+    listings = asyncio.run(paged_fetch.fetch_pages(fetch_page, max_pages=2, concurrency=1))
+
+    assert len(listings) == 4
+    assert state["started"] == [1, 2]
+    assert state["max_in_flight"] == 1
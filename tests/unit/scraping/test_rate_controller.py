@@ -0,0 +1,78 @@
+# ==============================================
+# Scraping Unit Test - Adaptive Rate Controller
+# ==============================================
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+RATE_CONTROLLER_MODULE = Path(__file__).parent.parent.parent.parent / "scraping" / "common" / "rate_controller.py"
+
+spec = importlib.util.spec_from_file_location("scraping_rate_controller", RATE_CONTROLLER_MODULE)
+rate_controller = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rate_controller)
+
+
+@pytest.mark.unit
+def test_additive_increase_up_to_max():
+    rates = []
+    controller = rate_controller.AdaptiveRateController(
+        rate=0.5, max_rate=0.7, increase=0.1, on_change=rates.append
+    )
+
+    for _ in range(5):
+        controller.record_success(800)
+
+    assert rates == [0.6, 0.7]
+    assert controller.rate == 0.7
+    assert controller.avg_response_ms == 800
+
+
+@pytest.mark.unit
+def test_multiplicative_decrease_once_per_cooldown():
+    """Several tabs hitting the same block halve the rate once"""
+    controller = rate_controller.AdaptiveRateController(rate=1.0, min_rate=0.2, cooldown=60)
+
+    controller.record_throttle("http_429")
+    controller.record_throttle("captcha")
+    assert controller.rate == 0.5
+    assert controller.throttles == 2
+
+    controller._last_decrease -= 60
+    controller.record_throttle("timeout")
+    controller._last_decrease -= 60
+    controller.record_throttle("timeout")
+    assert controller.rate == 0.2
+
+
+@pytest.mark.unit
+def test_slow_responses_hold_the_rate():
+    controller = rate_controller.AdaptiveRateController(rate=0.5, increase=0.1, avg_response_ms=1000)
+
+    controller.record_success(3000)
+
+    assert controller.rate == 0.5
+    assert controller.avg_response_ms == pytest.approx(1400)
+
+
+@pytest.mark.unit
+def test_restore_learned_rate():
+    rates = []
+    controller = rate_controller.AdaptiveRateController(rate=0.5, max_rate=2.0, on_change=rates.append)
+
+    controller.restore(1.25, 650)
+    controller.restore(9.0)
+
+    assert rates == [1.25, 2.0]
+    assert controller.avg_response_ms == 650
+
+
+@pytest.mark.unit
+def test_adaptive_ceiling_stays_within_the_global_budget():
+    assert rate_controller.adaptive_ceiling(1.0, 2.0) == 2.0
+    assert rate_controller.adaptive_ceiling(3.0, 2.0) == 3.0
+    # A configured global limit is never raised: the ceiling is clamped to it
+    assert rate_controller.adaptive_ceiling(1.0, 2.0, global_rps=1.5) == 1.5
+    assert rate_controller.adaptive_ceiling(3.0, 2.0, global_rps=1.0) == 1.0
+    assert rate_controller.adaptive_ceiling(0.5, 2.0, global_rps=4.0) == 2.0
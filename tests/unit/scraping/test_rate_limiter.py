@@ -0,0 +1,163 @@
+# ==============================================
+# Scraping Unit Test - Rate Limiter
+# ==============================================
+
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import pytest
+
+RATE_LIMITER_MODULE = Path(__file__).parent.parent.parent.parent / "scraping" / "common" / "rate_limiter.py"
+
+spec = importlib.util.spec_from_file_location("scraping_rate_limiter", RATE_LIMITER_MODULE)
+rate_limiter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rate_limiter)
+
+
+@pytest.fixture(autouse=True)
+def clear_buckets():
+    rate_limiter._buckets.clear()
+    yield
+    rate_limiter._buckets.clear()
+
+
+@pytest.mark.unit
+def test_bucket_refill_math():
+    bucket = rate_limiter.TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Empty bucket: the next two tokens arrive 0.1s apart
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    bucket.refund()
+    bucket.refund()
+    bucket.updated -= 1  # one second later: refilled, but only up to capacity
+    assert bucket.reserve() == 0
+    assert bucket.tokens == pytest.approx(1, abs=0.01)
+
+
+@pytest.mark.unit
+def test_acquire_does_not_block_the_loop():
+    """Waiting for tokens lets other coroutines run"""
+    limiter = rate_limiter.RateLimiter(requests_per_second=20, burst=1, portal="test")
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def requests():
+        for _ in range(4):
+            await limiter.acquire("https://www.example.com/page")
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(ticker(), requests())
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+
+    assert elapsed == pytest.approx(0.15, abs=0.06)
+    assert len(ticks) == 5
+
+
+@pytest.mark.unit
+def test_waiters_are_served_in_arrival_order():
+    limiter = rate_limiter.RateLimiter(requests_per_second=50, burst=1, portal="test")
+    served = []
+
+    async def request(n):
+        await limiter.acquire()
+        served.append(n)
+
+    async def run():
+        await asyncio.gather(*(request(n) for n in range(6)))
+
+    asyncio.run(run())
+
+    assert served == list(range(6))
+
+
+@pytest.mark.unit
+def test_portal_and_host_buckets():
+    """Scrapers of the same portal share its bucket; hosts have their own"""
+    first = rate_limiter.RateLimiter(requests_per_second=1, burst=2, portal="immobiliare_it", host_rps=100)
+    second = rate_limiter.RateLimiter(requests_per_second=1, burst=2, portal="immobiliare_it", host_rps=100)
+
+    assert first._reserve(first._limits("https://a.example.com/")) == 0
+    assert second._reserve(second._limits("https://b.example.com/")) == 0
+    assert second._reserve(second._limits("https://c.example.com/")) == pytest.approx(1, abs=0.01)
+
+    first.reset()
+    assert first._reserve(first._limits("https://a.example.com/")) == 0
+
+
+@pytest.mark.unit
+def test_global_budget_is_shared_between_processes(tmp_path):
+    """Limiters on the same state file draw from one global bucket"""
+    state = str(tmp_path / "buckets.db")
+    workers = [
+        rate_limiter.RateLimiter(requests_per_second=100, burst=1, portal=f"portal_{n}", global_rps=10, state_path=state)
+        for n in range(2)
+    ]
+
+    delays = [worker._reserve(worker._limits(None)) for worker in workers * 2]
+
+    assert delays[0] == 0
+    assert delays[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+
+
+@pytest.mark.unit
+def test_cancelled_waiter_gives_its_token_back():
+    limiter = rate_limiter.RateLimiter(requests_per_second=1, burst=1, portal="test")
+
+    async def run():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+
+    bucket = rate_limiter._buckets["portal:test"]
+    assert bucket.tokens == pytest.approx(0, abs=0.05)
+
+
+@pytest.mark.unit
+def test_set_rate_shortens_the_waits():
+    """A raised portal rate raises the default host rate too"""
+    limiter = rate_limiter.RateLimiter(requests_per_second=5, burst=1, portal="test", global_rps=20)
+
+    async def pace(n):
+        start = time.monotonic()
+        for _ in range(n):
+            await limiter.acquire("https://www.example.com/page")
+        return time.monotonic() - start
+
+    async def run():
+        slow = await pace(4)
+        limiter.set_rate(20)
+        await pace(1)  # drain the tokens reserved at the old rate
+        return slow, await pace(4)
+
+    slow, fast = asyncio.run(run())
+
+    assert limiter.host_rps == 20
+    assert slow == pytest.approx(0.6, abs=0.1)
+    assert fast == pytest.approx(0.2, abs=0.06)
+
+
+@pytest.mark.unit
+def test_set_rate_keeps_an_explicit_host_rate():
+    limiter = rate_limiter.RateLimiter(requests_per_second=1, portal="test", host_rps=0.5)
+
+    limiter.set_rate(2)
+
+    assert (limiter.rate, limiter.host_rps) == (2, 0.5)
@@ -0,0 +1,172 @@
+# ==============================================
+# Scraping Unit Test - Scraping Job Repository
+# ==============================================
+
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from scraping.database import scraping_job_repository as job_repository  # noqa: E402
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+ScrapingJob = job_repository.ScrapingJob
+ScrapingJobStats = job_repository.ScrapingJobStats
+
+MIGRATIONS_DIR = Path(__file__).parent.parent.parent.parent / "database" / "prisma" / "migrations"
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    # The schema of the Prisma migrations (NOT NULL counters, defaults)
+    path = tmp_path / "jobs.db"
+    connection = sqlite3.connect(path)
+    for migration in sorted(MIGRATIONS_DIR.glob("*/migration.sql")):
+        connection.executescript(migration.read_text(encoding="utf-8"))
+    connection.close()
+
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_db_context():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(job_repository, "get_db_context", get_db_context)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def repo(session_factory):
+    return job_repository.ScrapingJobRepository()
+
+
+def _counters(factory, repo):
+    """(materialized counters, GROUP BY counters) per portal"""
+    db = factory()
+    try:
+        materialized = {
+            row.portal: tuple(getattr(row, column) for column in job_repository.STATS_COLUMNS)
+            for row in db.query(ScrapingJobStats)
+        }
+        aggregated = {
+            row.portal: tuple(getattr(row, column) or 0 for column in job_repository.STATS_COLUMNS)
+            for row in repo._aggregate_stats(db)
+        }
+        return materialized, aggregated
+    finally:
+        db.close()
+
+
+def _stale(factory):
+    db = factory()
+    try:
+        return {portal for (portal,) in db.query(ScrapingJobStats.portal).filter(ScrapingJobStats.stale)}
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_counters_follow_job_changes(repo, session_factory):
+    repo.create_job("job_1", "immobiliare_it")
+    repo.create_job("job_2", "immobiliare_it")
+    repo.create_job("job_3", "casa_it")
+    materialized, aggregated = _counters(session_factory, repo)
+    assert materialized == aggregated
+    assert materialized["immobiliare_it"] == (2, 0, 0, 0, 0)
+
+    repo.update_job_status("job_1", "running")
+    repo.update_job_status("job_1", "completed", listings_found=40, listings_saved=35)
+    repo.update_job_status("job_2", "failed", listings_found=3)
+    repo.update_job_status("job_3", "completed", listings_found=10, listings_saved=10)
+    materialized, aggregated = _counters(session_factory, repo)
+    assert materialized == aggregated
+    assert materialized["immobiliare_it"] == (2, 1, 1, 43, 35)
+
+    assert repo.delete_job("job_2")
+    assert not repo.delete_job("job_2")
+    materialized, aggregated = _counters(session_factory, repo)
+    assert materialized == aggregated
+    assert materialized["immobiliare_it"] == (1, 1, 0, 40, 35)
+
+    stats = repo.get_stats()
+    assert stats["total_jobs"] == 2
+    assert stats["successful_jobs"] == 2
+    assert stats["total_properties_saved"] == 45
+    assert stats["portals"] == {"immobiliare_it": 1, "casa_it": 1}
+
+
+@pytest.mark.unit
+def test_failed_counter_update_marks_portal_stale(repo, session_factory, monkeypatch):
+    repo.create_job("job_1", "immobiliare_it")
+    repo.create_job("job_2", "casa_it")
+
+    def broken_insert(table):
+        raise RuntimeError("stats table locked")
+
+    with monkeypatch.context() as patch:
+        patch.setitem(job_repository.INSERT_DIALECTS, "sqlite", broken_insert)
+        repo.update_job_status("job_1", "completed", listings_found=20, listings_saved=18)
+
+    # The job write went through; the portal row is flagged, not silently wrong
+    assert repo.get_job("job_1").status == "completed"
+    assert _stale(session_factory) == {"immobiliare_it"}
+    materialized, _ = _counters(session_factory, repo)
+    assert materialized["casa_it"] == (1, 0, 0, 0, 0)
+
+    # Later deltas keep the flag; get_stats aggregates the flagged portal
+    repo.create_job("job_3", "immobiliare_it")
+    assert _stale(session_factory) == {"immobiliare_it"}
+
+    stats = repo.get_stats()
+    assert stats["total_jobs"] == 3
+    assert stats["successful_jobs"] == 1
+    assert stats["total_properties_saved"] == 18
+    assert stats["portals"] == {"immobiliare_it": 2, "casa_it": 1}
+
+    assert repo.rebuild_stats() == 2
+    assert _stale(session_factory) == set()
+    materialized, aggregated = _counters(session_factory, repo)
+    assert materialized == aggregated
+
+
+@pytest.mark.unit
+def test_failed_first_update_creates_a_stale_row(repo, session_factory, monkeypatch):
+    """A portal without a stats row yet gets one, flagged, with default counters"""
+    def broken_insert(table):
+        raise RuntimeError("stats table locked")
+
+    with monkeypatch.context() as patch:
+        patch.setitem(job_repository.INSERT_DIALECTS, "sqlite", broken_insert)
+        repo.create_job("job_1", "immobiliare_it")
+
+    assert _stale(session_factory) == {"immobiliare_it"}
+    assert repo.get_stats()["portals"] == {"immobiliare_it": 1}
+
+
+@pytest.mark.unit
+def test_counters_without_insert_on_conflict(repo, session_factory, monkeypatch):
+    """Dialects without ON CONFLICT update the counters through the ORM"""
+    monkeypatch.delitem(job_repository.INSERT_DIALECTS, "sqlite")
+
+    repo.create_job("job_1", "immobiliare_it")
+    repo.update_job_status("job_1", "completed", listings_found=5, listings_saved=4)
+
+    materialized, aggregated = _counters(session_factory, repo)
+    assert materialized == aggregated == {"immobiliare_it": (1, 1, 0, 5, 4)}
+    assert _stale(session_factory) == set()
@@ -0,0 +1,286 @@
+# ==============================================
+# Scraping Unit Test - Scraping Repository
+# ==============================================
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from scraping.database import scraping_repository  # noqa: E402
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+Property = scraping_repository.Property
+AuditLog = scraping_repository.AuditLog
+
+SOURCE = "immobiliare_it"
+
+
+def _listing(i, price=300000, **fields):
+    listing = {
+        "source_url": f"https://www.immobiliare.it/annunci/{i}/",
+        "title": f"Trilocale {i}",
+        "location": "Milano, Brera",
+        "price": price,
+        "sqm": 80 + i,
+        "rooms": 3,
+        "bathrooms": 1,
+        "contractType": "vendita",
+    }
+    listing.update(fields)
+    return listing
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'scraping.db'}")
+    Property.metadata.create_all(engine, tables=[Property.__table__, AuditLog.__table__])
+    factory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_db_context():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(scraping_repository, "get_db_context", get_db_context)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def repo(session_factory):
+    return scraping_repository.ScrapingRepository(chunk_size=3)
+
+
+def _count(factory, model, *filters):
+    db = factory()
+    try:
+        return db.query(model).filter(*filters).count()
+    finally:
+        db.close()
+
+
+def _urls(factory):
+    db = factory()
+    try:
+        return {url for (url,) in db.query(Property.sourceUrl)}
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_batch_inserts_in_chunks(repo, session_factory, monkeypatch):
+    chunks = []
+    upsert_chunk = repo._upsert_chunk
+
+    def spy(db, rows, source):
+        chunks.append(len(rows))
+        return upsert_chunk(db, rows, source)
+
+    monkeypatch.setattr(repo, "_upsert_chunk", spy)
+
+    counts = repo.save_properties_batch([_listing(i) for i in range(8)], SOURCE)
+
+    assert counts == {"saved": 8, "updated": 0, "skipped": 0, "errors": 0}
+    assert chunks == [3, 3, 2]
+    assert _count(session_factory, Property, Property.source == SOURCE) == 8
+
+
+@pytest.mark.unit
+def test_counts_duplicates_and_mapping_errors(repo, session_factory):
+    batch = [
+        _listing(1),
+        # Same URL and content, then same content under another URL
+        _listing(1),
+        _listing(1, source_url="https://www.immobiliare.it/annunci/1b/"),
+        _listing(2),
+        # Cannot be mapped
+        None,
+    ]
+
+    counts = repo.save_properties_batch(batch, SOURCE)
+
+    assert counts == {"saved": 2, "updated": 0, "skipped": 2, "errors": 1}
+    assert _count(session_factory, Property) == 2
+
+
+@pytest.mark.unit
+def test_insert_skips_conflicting_rows(repo, session_factory):
+    """ON CONFLICT DO NOTHING: a (source, contentHash) saved meanwhile is not inserted again"""
+    row = repo._map_to_property_model(_listing(1), SOURCE, "CODE-1", "00000000000000aa")
+    twin = repo._map_to_property_model(_listing(2), SOURCE, "CODE-2", "00000000000000aa")
+
+    db = session_factory()
+    try:
+        assert repo._insert_rows(db, [row]) == 1
+        assert repo._insert_rows(db, [twin]) == 0
+        db.commit()
+    finally:
+        db.close()
+
+    assert _count(session_factory, Property) == 1
+
+
+@pytest.mark.unit
+def test_insert_raises_on_other_conflicts(repo, session_factory):
+    """Only the content-hash index is a duplicate: a code collision still fails"""
+    row = repo._map_to_property_model(_listing(1), SOURCE, "CODE-1", "00000000000000aa")
+    clash = repo._map_to_property_model(_listing(2), SOURCE, "CODE-1", "00000000000000bb")
+
+    db = session_factory()
+    try:
+        assert repo._insert_rows(db, [row]) == 1
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            repo._insert_rows(db, [clash])
+    finally:
+        db.rollback()
+        db.close()
+
+
+@pytest.mark.unit
+def test_failed_chunk_is_rolled_back_alone(repo, session_factory, monkeypatch):
+    upsert_chunk = repo._upsert_chunk
+
+    def failing(db, rows, source):
+        saved, updated = upsert_chunk(db, rows, source)
+        if any(row["sourceUrl"].endswith("/4/") for row in rows):
+            raise RuntimeError("constraint violation")
+        return saved, updated
+
+    monkeypatch.setattr(repo, "_upsert_chunk", failing)
+
+    counts = repo.save_properties_batch([_listing(i) for i in range(8)], SOURCE)
+
+    # Chunk [3, 4, 5] was written, then rolled back to its savepoint
+    assert counts == {"saved": 5, "updated": 0, "skipped": 0, "errors": 3}
+    assert _urls(session_factory) == {
+        f"https://www.immobiliare.it/annunci/{i}/" for i in (0, 1, 2, 6, 7)
+    }
+
+    # Failed listings are not in the dedup index: the next batch saves them
+    monkeypatch.setattr(repo, "_upsert_chunk", upsert_chunk)
+    retry = repo.save_properties_batch([_listing(i) for i in range(8)], SOURCE)
+
+    assert retry == {"saved": 3, "updated": 0, "skipped": 5, "errors": 0}
+
+
+@pytest.mark.unit
+def test_dedup_index_is_loaded_once_per_repository(repo, session_factory, monkeypatch):
+    loads = []
+    load_dedup_index = repo.load_dedup_index
+
+    def spy(source):
+        loads.append(source)
+        return load_dedup_index(source)
+
+    monkeypatch.setattr(repo, "load_dedup_index", spy)
+
+    repo.save_properties_batch([_listing(i) for i in range(3)], SOURCE)
+    # Same content under new URLs: rejected by the index, no database lookup
+    counts = repo.save_properties_batch(
+        [_listing(i, source_url=f"https://www.immobiliare.it/annunci/{i}-copy/") for i in range(3)],
+        SOURCE
+    )
+
+    assert loads == [SOURCE]
+    assert counts == {"saved": 0, "updated": 0, "skipped": 3, "errors": 0}
+    assert len(repo.get_dedup_index(SOURCE)) == 3
+
+
+def _upsert(repo, factory, listings, writes=None):
+    """Run _upsert_chunk on mapped listings, recording the write statements"""
+    rows = [
+        repo._map_to_property_model(listing, SOURCE, f"CODE-{i}", repo._compute_content_hash(listing))
+        for i, listing in enumerate(listings)
+    ]
+    db = factory()
+    if writes is not None:
+        @sqlalchemy.event.listens_for(db.bind, "before_cursor_execute")
+        def record(conn, cursor, statement, *args):
+            if statement.split()[0] in ("INSERT", "UPDATE", "DELETE"):
+                writes.append(statement)
+
+    try:
+        result = repo._upsert_chunk(db, rows, SOURCE)
+        db.commit()
+        return result
+    finally:
+        db.close()
+        if writes is not None:
+            sqlalchemy.event.remove(db.bind, "before_cursor_execute", record)
+
+
+@pytest.mark.unit
+def test_unchanged_rescrape_writes_nothing(repo, session_factory):
+    listings = [_listing(i) for i in range(3)]
+    assert _upsert(repo, session_factory, listings) == (3, 0)
+
+    writes = []
+    assert _upsert(repo, session_factory, [_listing(i) for i in range(3)], writes) == (0, 0)
+
+    assert writes == []
+    assert _count(session_factory, AuditLog) == 0
+
+
+@pytest.mark.unit
+def test_changed_tracked_field_updates_only_that_row(repo, session_factory):
+    _upsert(repo, session_factory, [_listing(i) for i in range(3)])
+
+    writes = []
+    rescrape = [_listing(0), _listing(1, description="Ristrutturato"), _listing(2)]
+    assert _upsert(repo, session_factory, rescrape, writes) == (0, 1)
+
+    assert len(writes) == 1 and writes[0].startswith("UPDATE properties")
+    db = session_factory()
+    try:
+        descriptions = dict(db.query(Property.sourceUrl, Property.description))
+    finally:
+        db.close()
+    assert descriptions == {
+        "https://www.immobiliare.it/annunci/0/": None,
+        "https://www.immobiliare.it/annunci/1/": "Ristrutturato",
+        "https://www.immobiliare.it/annunci/2/": None,
+    }
+    # Not a price change: no audit record
+    assert _count(session_factory, AuditLog) == 0
+
+
+@pytest.mark.unit
+def test_price_change_appends_one_audit_record(repo, session_factory):
+    _upsert(repo, session_factory, [_listing(i) for i in range(3)])
+
+    rescrape = [_listing(0), _listing(1, price=280000), _listing(2)]
+    assert _upsert(repo, session_factory, rescrape) == (0, 1)
+
+    db = session_factory()
+    try:
+        logs = db.query(AuditLog).all()
+        updated = db.query(Property).filter(
+            Property.sourceUrl == "https://www.immobiliare.it/annunci/1/"
+        ).one()
+        assert len(logs) == 1
+        assert logs[0].action == "price_change"
+        assert logs[0].entityId == updated.id
+        assert logs[0].oldValues == {"priceSale": 300000.0}
+        assert logs[0].newValues == {"priceSale": 280000.0}
+        assert updated.priceSale == 280000.0
+        # The content hash follows the new price
+        assert updated.contentHash == repo._compute_content_hash(_listing(1, price=280000))
+    finally:
+        db.close()
+
+    # Same price again: no new record
+    assert _upsert(repo, session_factory, [_listing(1, price=280000)]) == (0, 0)
+    assert _count(session_factory, AuditLog) == 1